@@ -0,0 +1,75 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+DATABASE_FILE = os.path.join(tempfile.mkdtemp(), "bench_intake.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DATABASE_FILE}")
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+)
+
+from database import SessionLocal  # noqa: E402
+from models import Category, Problem  # noqa: E402
+from routers.request import (RequestModel, create_request,  # noqa: E402
+                             write_request_batch)
+
+ticket = RequestModel(
+    attendant_name="Fulano",
+    applicant_name="Ciclano",
+    applicant_phone="1111111111",
+    city_id=1,
+    workstation_id=1,
+    problems=[
+        {"category_id": 1, "problem_id": 1, "description": "Sem internet"}
+    ],
+)
+
+
+def seed():
+    with SessionLocal() as db:
+        if not db.query(Problem).count():
+            db.add(Category(id=1, name="Internet", description="Internet"))
+            db.add(
+                Problem(id=1, name="Rede", description="Rede", category_id=1)
+            )
+            db.commit()
+
+
+def per_request(total: int) -> float:
+    start = time.perf_counter()
+    for _ in range(total):
+        with SessionLocal() as db:
+            create_request(db, ticket)
+            db.commit()
+    return total / (time.perf_counter() - start)
+
+
+def batched(total: int, batch_size: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, total, batch_size):
+        write_request_batch([ticket] * min(batch_size, total - offset))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara commits por chamado com commits em lote"
+    )
+    parser.add_argument("--total", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+",
+                        default=[10, 50, 200])
+    args = parser.parse_args()
+
+    seed()
+    baseline = per_request(args.total)
+    print(f"per-request  tickets/s={baseline:9.1f}")
+    for batch_size in args.batch_sizes:
+        throughput = batched(args.total, batch_size)
+        print(f"batch={batch_size:<5} tickets/s={throughput:9.1f} "
+              f"speedup={throughput / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+DATABASE_FILE = os.path.join(tempfile.mkdtemp(), "bench_rows.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{DATABASE_FILE}")
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+)
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+from database import SessionLocal, engine  # noqa: E402
+from models import Base, Request  # noqa: E402
+from utils.row_utils import select_dicts, select_records  # noqa: E402
+
+
+def seed(total: int):
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(
+            insert(Request.__table__),
+            [
+                {
+                    "attendant_name": "Fulano",
+                    "applicant_name": f"Ciclano {number}",
+                    "applicant_phone": "1111111111",
+                    "city_id": number % 50,
+                    "workstation_id": number % 200,
+                    "created_at": datetime.now(),
+                }
+                for number in range(total)
+            ],
+        )
+        db.commit()
+
+
+def orm_entities(db) -> list:
+    return [jsonable_encoder(request) for request in db.query(Request)]
+
+
+def core_dicts(db) -> list:
+    return select_dicts(db, select(Request.__table__))
+
+
+def slot_records(db) -> list:
+    return select_records(db, select(Request.__table__))
+
+
+def measure(read, rounds: int) -> tuple:
+    elapsed = []
+    for _ in range(rounds):
+        with SessionLocal() as db:
+            start = time.perf_counter()
+            rows = read(db)
+            elapsed.append(time.perf_counter() - start)
+
+    with SessionLocal() as db:
+        tracemalloc.start()
+        rows = read(db)
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sum(
+            stat.count
+            for stat in tracemalloc.take_snapshot().statistics("filename")
+        )
+        tracemalloc.stop()
+    return len(rows), min(elapsed), current, peak, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara entidades ORM com linhas mapeadas pelo Core"
+    )
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    for name, read in (
+        ("orm+jsonable_encoder", orm_entities),
+        ("core dicts", core_dicts),
+        ("slots records", slot_records),
+    ):
+        rows, elapsed, current, peak, blocks = measure(read, args.rounds)
+        print(f"{name:<21} us/row={elapsed / rows * 1e6:7.2f} "
+              f"retained={current / 1024:8.0f}KiB "
+              f"peak={peak / 1024:8.0f}KiB blocks={blocks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+)
+
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from models import Base, Request  # noqa: E402
+from utils.sqlite_utils import create_database_engine  # noqa: E402
+
+ticket = {
+    "attendant_name": "Fulano",
+    "applicant_name": "Ciclano",
+    "applicant_phone": "1111111111",
+    "city_id": 1,
+    "workstation_id": 1,
+}
+
+
+def write(engine, deadline: float) -> tuple:
+    done = errors = 0
+    while time.monotonic() < deadline:
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    insert(Request.__table__).values(
+                        **ticket, created_at=datetime.now()
+                    )
+                )
+            done += 1
+        except OperationalError:
+            errors += 1
+    return done, errors
+
+
+def read(engine, deadline: float) -> tuple:
+    done = errors = 0
+    while time.monotonic() < deadline:
+        try:
+            with engine.connect() as connection:
+                connection.execute(
+                    select(Request.__table__)
+                    .order_by(Request.id.desc())
+                    .limit(20)
+                ).all()
+            done += 1
+        except OperationalError:
+            errors += 1
+    return done, errors
+
+
+def run(profile: bool, writers: int, readers: int, duration: float) -> dict:
+    database = os.path.join(tempfile.mkdtemp(), "bench_sqlite.db")
+    engine = create_database_engine(f"sqlite:///{database}", profile)
+    Base.metadata.create_all(bind=engine)
+
+    deadline = time.monotonic() + duration
+    with ThreadPoolExecutor(writers + readers) as executor:
+        writes = [
+            executor.submit(write, engine, deadline) for _ in range(writers)
+        ]
+        reads = [
+            executor.submit(read, engine, deadline) for _ in range(readers)
+        ]
+        writes = [future.result() for future in writes]
+        reads = [future.result() for future in reads]
+    engine.dispose()
+    return {
+        "writes/s": sum(done for done, _ in writes) / duration,
+        "reads/s": sum(done for done, _ in reads) / duration,
+        "errors": sum(errors for _, errors in writes + reads),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara o SQLite padrao com o perfil de producao"
+    )
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5)
+    args = parser.parse_args()
+
+    for profile in (False, True):
+        result = run(profile, args.writers, args.readers, args.duration)
+        print(f"profile={'on' if profile else 'off':<4} "
+              f"writes/s={result['writes/s']:8.1f} "
+              f"reads/s={result['reads/s']:8.1f} "
+              f"locked={result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests as r
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+
+
+def wait_until_ready(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if r.get(url, timeout=1).status_code == 200:
+                return
+        except r.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Servidor nao respondeu em {url}")
+
+
+def get_percentile(values: list, percentile: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+def run_load(url: str, concurrency: int, duration: float) -> tuple:
+    deadline = time.monotonic() + duration
+
+    def worker() -> list:
+        latencies = []
+        with r.Session() as session:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                session.get(url)
+                latencies.append(time.perf_counter() - start)
+        return latencies
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures = [executor.submit(worker) for _ in range(concurrency)]
+        latencies = sorted(
+            latency for future in futures for latency in future.result()
+        )
+    return (
+        len(latencies) / duration,
+        get_percentile(latencies, 50),
+        get_percentile(latencies, 99),
+    )
+
+
+def bench(workers: int, args) -> tuple:
+    env = {
+        **os.environ,
+        "WEB_CONCURRENCY": str(workers),
+        "APP_PORT_DETALHADOR": str(args.port),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app",
+         "--config", "gunicorn.conf.py"],
+        cwd=SRC_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        wait_until_ready(base_url + "/")
+        return run_load(base_url + args.path, args.concurrency, args.duration)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede a vazao do servidor para cada numero de workers"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"cpus={os.cpu_count()} path={args.path} "
+          f"concurrency={args.concurrency}")
+    baseline = None
+    for workers in args.workers:
+        throughput, p50, p99 = bench(workers, args)
+        baseline = baseline or throughput
+        print(f"workers={workers:<3} req/s={throughput:9.1f} "
+              f"speedup={throughput / baseline:5.2f}x "
+              f"p50={p50 * 1000:7.1f}ms p99={p99 * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -69,3 +69,185 @@ CREATE TABLE "public"."alert_date" (
         REFERENCES "public"."has" ("id")
         ON DELETE CASCADE
 );
+
+CREATE TABLE "public"."request_stats" (
+    request_status "public"."status" NOT NULL,
+    priority "public"."priority" NOT NULL,
+    category_id INTEGER NOT NULL,
+    city_id INTEGER NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT "PK_request_stats" PRIMARY KEY (
+        "request_status", "priority", "category_id", "city_id"
+    )
+);
+
+CREATE TABLE "public"."request_rollup" (
+    day DATE NOT NULL,
+    category_id INTEGER NOT NULL,
+    city_id INTEGER NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    CONSTRAINT "PK_request_rollup" PRIMARY KEY (
+        "day", "category_id", "city_id"
+    )
+);
+
+CREATE TABLE "public"."request_search" (
+    has_id INTEGER NOT NULL,
+    request_id INTEGER NOT NULL,
+    document TSVECTOR NOT NULL,
+    CONSTRAINT "PK_request_search" PRIMARY KEY ("has_id"),
+    CONSTRAINT "FK_has_id" FOREIGN KEY ("has_id")
+        REFERENCES "public"."has" ("id")
+        ON DELETE CASCADE
+);
+
+CREATE INDEX "request_search_document_idx"
+    ON "public"."request_search" USING GIN ("document");
+CREATE INDEX "request_search_request_id_idx"
+    ON "public"."request_search" ("request_id");
+
+CREATE INDEX "ix_has_request_id" ON "public"."has" ("request_id");
+CREATE INDEX "ix_has_problem_id" ON "public"."has" ("problem_id");
+CREATE INDEX "ix_has_category_id" ON "public"."has" ("category_id");
+CREATE INDEX "ix_has_request_status_priority"
+    ON "public"."has" ("request_status", "priority");
+CREATE INDEX "ix_has_is_event_event_date"
+    ON "public"."has" ("is_event", "event_date");
+CREATE INDEX "ix_request_city_workstation"
+    ON "public"."request" ("city_id", "workstation_id");
+CREATE INDEX "ix_request_workstation_id"
+    ON "public"."request" ("workstation_id");
+CREATE INDEX "ix_request_attendant_name"
+    ON "public"."request" ("attendant_name");
+CREATE INDEX "ix_request_created_at" ON "public"."request" ("created_at");
+
+CREATE TABLE "public"."status_history" (
+    id INTEGER NOT NULL GENERATED BY DEFAULT AS IDENTITY(start 1),
+    has_id INTEGER NOT NULL,
+    request_id INTEGER NOT NULL,
+    from_status "public"."status",
+    to_status "public"."status" NOT NULL,
+    priority "public"."priority" NOT NULL,
+    category_id INTEGER NOT NULL,
+    city_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    changed_at TIMESTAMP NOT NULL,
+    CONSTRAINT "PK_status_history" PRIMARY KEY ("id")
+);
+
+CREATE INDEX "ix_status_history_has_id_changed_at"
+    ON "public"."status_history" ("has_id", "changed_at");
+CREATE INDEX "ix_status_history_to_status_changed_at"
+    ON "public"."status_history" ("to_status", "changed_at");
+
+CREATE TABLE "public"."request_change" (
+    seq INTEGER NOT NULL GENERATED BY DEFAULT AS IDENTITY(start 1),
+    request_id INTEGER NOT NULL,
+    CONSTRAINT "PK_request_change" PRIMARY KEY ("seq")
+);
+
+CREATE INDEX "ix_request_change_request_id"
+    ON "public"."request_change" ("request_id");
+
+CREATE TABLE "public"."request_document" (
+    request_id INTEGER NOT NULL,
+    document JSON NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    CONSTRAINT "PK_request_document" PRIMARY KEY ("request_id")
+);
+
+CREATE TABLE "public"."city_mirror" (
+    id INTEGER NOT NULL,
+    name VARCHAR(250),
+    data JSON NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    CONSTRAINT "PK_city_mirror" PRIMARY KEY ("id")
+);
+
+CREATE INDEX "ix_city_mirror_name"
+    ON "public"."city_mirror" ("name");
+
+CREATE TABLE "public"."workstation_mirror" (
+    id INTEGER NOT NULL,
+    name VARCHAR(250),
+    city_id INTEGER,
+    data JSON NOT NULL,
+    updated_at TIMESTAMP NOT NULL,
+    CONSTRAINT "PK_workstation_mirror" PRIMARY KEY ("id")
+);
+
+CREATE INDEX "ix_workstation_mirror_name"
+    ON "public"."workstation_mirror" ("name");
+CREATE INDEX "ix_workstation_mirror_city_id"
+    ON "public"."workstation_mirror" ("city_id");
+
+CREATE TABLE "public"."locality_sync" (
+    catalog VARCHAR(50) NOT NULL,
+    total INTEGER NOT NULL,
+    synced_at TIMESTAMP,
+    attempted_at TIMESTAMP NOT NULL,
+    error TEXT,
+    CONSTRAINT "PK_locality_sync" PRIMARY KEY ("catalog")
+);
+
+CREATE TABLE "public"."idempotency_key" (
+    key VARCHAR(255) NOT NULL,
+    request_hash VARCHAR(64) NOT NULL,
+    status_code INTEGER NOT NULL,
+    response JSON NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT "PK_idempotency_key" PRIMARY KEY ("key")
+);
+
+CREATE INDEX "ix_idempotency_key_created_at"
+    ON "public"."idempotency_key" ("created_at");
+
+CREATE TABLE "public"."request_archive" (
+    id INTEGER NOT NULL,
+    attendant_name VARCHAR(250) NOT NULL,
+    applicant_name VARCHAR(250) NOT NULL,
+    applicant_phone VARCHAR(20) NOT NULL,
+    city_id INTEGER NOT NULL,
+    workstation_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT "PK_request_archive" PRIMARY KEY ("id", "created_at")
+) PARTITION BY RANGE ("created_at");
+
+CREATE TABLE "public"."request_archive_default"
+    PARTITION OF "public"."request_archive" DEFAULT;
+
+CREATE INDEX "ix_request_archive_city_workstation"
+    ON "public"."request_archive" ("city_id", "workstation_id");
+CREATE INDEX "ix_request_archive_created_at"
+    ON "public"."request_archive" ("created_at");
+
+CREATE TABLE "public"."has_archive" (
+    id INTEGER NOT NULL,
+    problem_id INTEGER NOT NULL,
+    request_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    is_event BOOLEAN,
+    event_date TIMESTAMP,
+    description TEXT,
+    request_status "public"."status" NOT NULL,
+    priority "public"."priority" NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    CONSTRAINT "PK_has_archive" PRIMARY KEY ("id", "created_at")
+) PARTITION BY RANGE ("created_at");
+
+CREATE TABLE "public"."has_archive_default"
+    PARTITION OF "public"."has_archive" DEFAULT;
+
+CREATE INDEX "ix_has_archive_request_id"
+    ON "public"."has_archive" ("request_id");
+CREATE INDEX "ix_has_archive_problem_id"
+    ON "public"."has_archive" ("problem_id");
+
+CREATE TABLE "public"."alert_date_archive" (
+    has_id INTEGER NOT NULL,
+    alert_date DATE NOT NULL
+);
+
+CREATE INDEX "ix_alert_date_archive_has_id"
+    ON "public"."alert_date_archive" ("has_id");
@@ -1,21 +1,129 @@
 import os
+import threading
+from math import ceil
+from time import monotonic, time
 
-from sqlalchemy import create_engine
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///test.db")
-if not DATABASE_URL.startswith("sqlite"):
-    DATABASE_URL += "/detalhador_de_chamados"
+from utils.sqlite_utils import create_database_engine
 
-engine = create_engine(DATABASE_URL)
+
+def get_database_url(url: str) -> str:
+    if not url.startswith("sqlite"):
+        url += "/detalhador_de_chamados"
+    return url
+
+
+DATABASE_URL = get_database_url(os.getenv("DATABASE_URL", "sqlite:///test.db"))
+DATABASE_REPLICA_URLS = [
+    get_database_url(url.strip())
+    for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+PRIMARY_COOKIE = "schedula_primary_until"
+
+engine = create_database_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary,
+        replicas: list,
+        health_interval: float = REPLICA_HEALTH_INTERVAL,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.health_interval = health_interval
+        self.lock = threading.Lock()
+        self.position = 0
+        self.checked_at = {}
+        self.healthy = {replica: True for replica in replicas}
+
+    def is_healthy(self, replica) -> bool:
+        with self.lock:
+            checked_at = self.checked_at.get(replica)
+            if (
+                checked_at is not None
+                and monotonic() - checked_at < self.health_interval
+            ):
+                return self.healthy[replica]
+            self.checked_at[replica] = monotonic()
+
+        try:
+            with replica.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            healthy = True
+        except SQLAlchemyError:
+            healthy = False
+        with self.lock:
+            self.healthy[replica] = healthy
+        return healthy
+
+    def get_engine(self):
+        for _ in range(len(self.replicas)):
+            with self.lock:
+                replica = self.replicas[self.position % len(self.replicas)]
+                self.position += 1
+            if self.is_healthy(replica):
+                return replica
+        return self.primary
+
+
+replica_router = ReplicaRouter(
+    engine, [create_database_engine(url) for url in DATABASE_REPLICA_URLS]
+)
+
+
+def reads_from_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time()
+    except ValueError:
+        return False
+
+
+def set_read_your_writes(request: Request, response: Response):
+    if (
+        replica_router.replicas
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            str(time() + READ_YOUR_WRITES_SECONDS),
+            max_age=ceil(READ_YOUR_WRITES_SECONDS),
+            httponly=True,
+        )
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def is_replica(db) -> bool:
+    return db.info.get("replica", False)
+
+
+def get_read_db(request: Request):
+    if reads_from_primary(request):
+        db = SessionLocal()
+    else:
+        bind = replica_router.get_engine()
+        db = SessionLocal(bind=bind, info={"replica": bind is not engine})
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,30 @@
+import os
+
+bind = f"0.0.0.0:{os.getenv('APP_PORT_DETALHADOR', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "1000"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "*")
+accesslog = os.getenv("ACCESS_LOG")
+
+
+def post_fork(server, worker):
+    from database import engine, replica_router
+
+    engine.dispose(close=False)
+    for replica in replica_router.replicas:
+        replica.dispose(close=False)
+
+
+def when_ready(server):
+    if workers > 1:
+        server.log.warning(
+            "WEB_CONCURRENCY=%s nao e suportado: stream, cache de chamados, "
+            "eventos e controle de admissao ficam separados por worker",
+            workers,
+        )
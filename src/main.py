@@ -1,17 +1,34 @@
+import asyncio
+import logging
 import os
 
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
-from routers import category, problem, request
+from database import SessionLocal, set_read_your_writes
+from routers import category, problem, request, search, statistics, stream
+from utils.admission_utils import (ADMISSION_EXEMPT_PATHS,
+                                   ADMISSION_RETRY_AFTER, admission)
 from utils.auth_utils import get_authorization
+from utils.event_utils import (event_calendar, rebuild_event_calendar,
+                               run_event_digest_scheduler)
+from utils.intake_utils import INTAKE_BATCH_SIZE, intake_queue
+from utils.mirror_utils import (LOCALITIES_SYNC_INTERVAL, get_mirror_status,
+                                run_locality_sync_scheduler)
+from utils.sqlite_utils import writer_locks
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
 app.include_router(request.router)
 app.include_router(problem.router)
 app.include_router(category.router)
+app.include_router(statistics.router)
+app.include_router(search.router)
+app.include_router(stream.router)
 
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 
@@ -51,18 +68,109 @@ async def process_request_headers(request: Request, call_next):
         if auth not in ["admin", "manager"]:
             return response_unauthorized
 
-    return await call_next(request)
+    if request.url.path in ADMISSION_EXEMPT_PATHS:
+        return await call_next(request)
+
+    limiter = admission.get_limiter(auth)
+    if not await limiter.acquire():
+        return get_overloaded_response()
+    try:
+        response = await call_next(request)
+    finally:
+        limiter.release()
+    set_read_your_writes(request, response)
+    return response
 
 
 app.include_router(problem.router)
 app.include_router(category.router)
 
 
+@app.on_event("startup")
+async def start_event_digest_scheduler():
+    app.state.event_digest_task = asyncio.create_task(
+        run_event_digest_scheduler()
+    )
+
+
+@app.on_event("shutdown")
+async def stop_event_digest_scheduler():
+    app.state.event_digest_task.cancel()
+
+
+@app.on_event("startup")
+async def build_event_calendar():
+    try:
+        await run_in_threadpool(rebuild_event_calendar)
+    except Exception:
+        logger.exception("Falha ao montar o calendario de eventos")
+
+
+@app.on_event("startup")
+async def start_locality_sync_scheduler():
+    if LOCALITIES_SYNC_INTERVAL > 0:
+        app.state.locality_sync_task = asyncio.create_task(
+            run_locality_sync_scheduler()
+        )
+
+
+@app.on_event("shutdown")
+async def stop_locality_sync_scheduler():
+    if LOCALITIES_SYNC_INTERVAL > 0:
+        app.state.locality_sync_task.cancel()
+
+
+@app.on_event("startup")
+async def start_intake_queue():
+    if INTAKE_BATCH_SIZE > 0:
+        app.state.intake_task = asyncio.create_task(
+            intake_queue.run(request.write_request_batch)
+        )
+
+
+@app.on_event("shutdown")
+async def stop_intake_queue():
+    if INTAKE_BATCH_SIZE > 0:
+        await intake_queue.close()
+        await app.state.intake_task
+
+
 @app.get("/")
 def root():
     return {"APP": "Detalhador de chamados is running"}
 
 
+@app.get("/metricas")
+def get_metrics():
+    with SessionLocal() as db:
+        localities = get_mirror_status(db)
+    return {
+        "message": "Dados buscados com sucesso",
+        "error": None,
+        "data": {
+            "admission": admission.stats(),
+            "intake": intake_queue.stats(),
+            "event_calendar": event_calendar.stats(),
+            "localities": localities,
+            "sqlite_writers": {
+                path: lock.stats() for path, lock in writer_locks.items()
+            },
+        },
+    }
+
+
+def get_overloaded_response():
+    return JSONResponse(
+        {
+            "message": "Servidor sobrecarregado, tente novamente",
+            "error": True,
+            "data": None,
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(ADMISSION_RETRY_AFTER)},
+    )
+
+
 response_unauthorized = JSONResponse(
     {
         "message": "Acesso negado",
@@ -0,0 +1,176 @@
+import argparse
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, engine
+from models import Base
+from utils.archive_utils import (ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE,
+                                 archive_requests)
+from utils.document_utils import rebuild_request_documents
+from utils.idempotency_utils import purge_idempotency_keys
+from utils.mirror_utils import sync_localities
+from utils.rollup_utils import backfill_request_rollup
+from utils.search_utils import rebuild_search_index
+from utils.stats_utils import rebuild_request_stats
+from utils.sync_utils import compact_request_changes
+
+
+def rebuild_stats(args):
+    with SessionLocal() as db:
+        rebuild_request_stats(db)
+    print("Estatisticas de chamados recalculadas")
+
+
+def backfill_rollups(args):
+    with SessionLocal() as db:
+        backfill_request_rollup(db, args.start, args.end)
+    print("Agregados diarios de chamados recalculados")
+
+
+def rebuild_search(args):
+    with SessionLocal() as db:
+        rebuild_search_index(db)
+    print("Indice de busca de chamados recriado")
+
+
+def compact_changes(args):
+    with SessionLocal() as db:
+        compact_request_changes(db)
+    print("Historico de alteracoes compactado")
+
+
+def archive(args):
+    total = 0
+    with SessionLocal() as db:
+        while True:
+            request_ids = archive_requests(db, args.dias, args.lote)
+            total += len(request_ids)
+            if len(request_ids) < args.lote:
+                break
+    print(f"{total} chamados resolvidos arquivados")
+
+
+def purge_idempotency(args):
+    with SessionLocal() as db:
+        purge_idempotency_keys(db)
+    print("Chaves de idempotencia expiradas removidas")
+
+
+def rebuild_documents(args):
+    with SessionLocal() as db:
+        rebuild_request_documents(db, args.lote)
+    print("Documentos de leitura de chamados recriados")
+
+
+def sync_mirror(args):
+    with SessionLocal() as db:
+        results = sync_localities(db)
+    for result in results:
+        if result.get("skipped"):
+            print(f"{result['catalog']}: sincronizacao em andamento")
+        elif result["error"]:
+            print(f"{result['catalog']}: falha ({result['error']})")
+        else:
+            print(
+                f"{result['catalog']}: {result['created']} novos, "
+                f"{result['updated']} alterados, "
+                f"{result['removed']} removidos"
+            )
+    if any(result["error"] for result in results):
+        raise SystemExit(1)
+
+
+def is_empty(db: Session, table: str) -> bool:
+    return db.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).first() is None
+
+
+DERIVED_DATA = {
+    "request_stats": rebuild_request_stats,
+    "request_rollup": backfill_request_rollup,
+    "request_search": rebuild_search_index,
+    "request_document": rebuild_request_documents,
+}
+
+
+def rebuild_missing_data(db: Session) -> list:
+    if is_empty(db, "has"):
+        return []
+    missing = [table for table in DERIVED_DATA if is_empty(db, table)]
+    for table in missing:
+        DERIVED_DATA[table](db)
+    return missing
+
+
+def rebuild_missing(args):
+    with SessionLocal() as db:
+        missing = rebuild_missing_data(db)
+    if missing:
+        print(f"Dados derivados recriados: {', '.join(missing)}")
+    else:
+        print("Dados derivados completos")
+
+
+COMMANDS = {
+    "rebuild-stats": rebuild_stats,
+    "backfill-rollups": backfill_rollups,
+    "rebuild-search-index": rebuild_search,
+    "compact-changes": compact_changes,
+    "archive-requests": archive,
+    "purge-idempotency-keys": purge_idempotency,
+    "rebuild-documents": rebuild_documents,
+    "sync-localities": sync_mirror,
+    "rebuild-missing": rebuild_missing,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detalhador de chamados")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser(
+        "rebuild-stats", help="Recalcula a tabela de estatisticas"
+    )
+    backfill = subparsers.add_parser(
+        "backfill-rollups", help="Recalcula os agregados diarios de chamados"
+    )
+    backfill.add_argument("--start", type=date.fromisoformat)
+    backfill.add_argument("--end", type=date.fromisoformat)
+    subparsers.add_parser(
+        "rebuild-search-index", help="Recria o indice de busca de chamados"
+    )
+    subparsers.add_parser(
+        "compact-changes",
+        help="Mantem apenas a alteracao mais recente de cada chamado",
+    )
+    archiver = subparsers.add_parser(
+        "archive-requests",
+        help="Move chamados resolvidos antigos para as tabelas de arquivo",
+    )
+    archiver.add_argument("--dias", type=int, default=ARCHIVE_AFTER_DAYS)
+    archiver.add_argument("--lote", type=int, default=ARCHIVE_BATCH_SIZE)
+    subparsers.add_parser(
+        "purge-idempotency-keys",
+        help="Remove as chaves de idempotencia expiradas",
+    )
+    documents = subparsers.add_parser(
+        "rebuild-documents",
+        help="Recria os documentos de leitura dos chamados",
+    )
+    documents.add_argument("--lote", type=int, default=500)
+    subparsers.add_parser(
+        "rebuild-missing",
+        help="Recria estatisticas, agregados, busca e documentos vazios",
+    )
+    subparsers.add_parser(
+        "sync-localities",
+        help="Sincroniza as copias locais de cidades e postos de trabalho",
+    )
+
+    args = parser.parse_args()
+    Base.metadata.create_all(bind=engine)
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
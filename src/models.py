@@ -1,7 +1,7 @@
 import enum
 
-from sqlalchemy import (DATE, TIMESTAMP, Boolean, Column, Enum, ForeignKey,
-                        Integer, String, Table, Text)
+from sqlalchemy import (DATE, DDL, JSON, TIMESTAMP, Boolean, Column, Enum,
+                        ForeignKey, Index, Integer, String, Table, Text, event)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -53,6 +53,120 @@ has = Table(
         default=EnumPriority.normal,
         nullable=False,
     ),
+    Index("ix_has_request_id", "request_id"),
+    Index("ix_has_problem_id", "problem_id"),
+    Index("ix_has_category_id", "category_id"),
+    Index("ix_has_request_status_priority", "request_status", "priority"),
+    Index("ix_has_is_event_event_date", "is_event", "event_date"),
+)
+
+
+request_stats = Table(
+    "request_stats",
+    Base.metadata,
+    Column("request_status", Enum(EnumStatus), primary_key=True),
+    Column("priority", Enum(EnumPriority), primary_key=True),
+    Column("category_id", Integer, primary_key=True),
+    Column("city_id", Integer, primary_key=True),
+    Column("total", Integer, nullable=False, default=0),
+)
+
+
+request_rollup = Table(
+    "request_rollup",
+    Base.metadata,
+    Column("day", DATE, primary_key=True),
+    Column("category_id", Integer, primary_key=True),
+    Column("city_id", Integer, primary_key=True),
+    Column("total", Integer, nullable=False, default=0),
+)
+
+
+status_history = Table(
+    "status_history",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("has_id", Integer, nullable=False),
+    Column("request_id", Integer, nullable=False),
+    Column("from_status", Enum(EnumStatus), nullable=True),
+    Column("to_status", Enum(EnumStatus), nullable=False),
+    Column("priority", Enum(EnumPriority), nullable=False),
+    Column("category_id", Integer, nullable=False),
+    Column("city_id", Integer, nullable=False),
+    Column("created_at", TIMESTAMP, nullable=False),
+    Column("changed_at", TIMESTAMP, nullable=False),
+    Index("ix_status_history_has_id_changed_at", "has_id", "changed_at"),
+    Index("ix_status_history_to_status_changed_at", "to_status", "changed_at"),
+)
+
+
+request_change = Table(
+    "request_change",
+    Base.metadata,
+    Column("seq", Integer, primary_key=True, autoincrement=True),
+    Column("request_id", Integer, nullable=False),
+    Index("ix_request_change_request_id", "request_id"),
+)
+
+
+city_mirror = Table(
+    "city_mirror",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(250), nullable=True),
+    Column("data", JSON, nullable=False),
+    Column("updated_at", TIMESTAMP, nullable=False),
+    Index("ix_city_mirror_name", "name"),
+)
+
+
+workstation_mirror = Table(
+    "workstation_mirror",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(250), nullable=True),
+    Column("city_id", Integer, nullable=True),
+    Column("data", JSON, nullable=False),
+    Column("updated_at", TIMESTAMP, nullable=False),
+    Index("ix_workstation_mirror_name", "name"),
+    Index("ix_workstation_mirror_city_id", "city_id"),
+)
+
+
+locality_sync = Table(
+    "locality_sync",
+    Base.metadata,
+    Column("catalog", String(50), primary_key=True),
+    Column("total", Integer, nullable=False),
+    Column("synced_at", TIMESTAMP, nullable=True),
+    Column("attempted_at", TIMESTAMP, nullable=False),
+    Column("error", Text, nullable=True),
+)
+
+
+request_document = Table(
+    "request_document",
+    Base.metadata,
+    Column("request_id", Integer, primary_key=True, autoincrement=False),
+    Column("document", JSON, nullable=False),
+    Column("updated_at", TIMESTAMP, nullable=False),
+)
+
+
+idempotency_key = Table(
+    "idempotency_key",
+    Base.metadata,
+    Column("key", String(255), primary_key=True),
+    Column("request_hash", String(64), nullable=False),
+    Column("status_code", Integer, nullable=False),
+    Column("response", JSON, nullable=False),
+    Column(
+        "created_at",
+        TIMESTAMP,
+        server_default=func.current_timestamp(),
+        nullable=False,
+    ),
+    Index("ix_idempotency_key_created_at", "created_at"),
 )
 
 
@@ -98,3 +212,121 @@ class Request(Base):
     problems = relationship(
         "Problem", secondary=has, back_populates="requests"
     )
+
+    __table_args__ = (
+        Index("ix_request_city_workstation", "city_id", "workstation_id"),
+        Index("ix_request_workstation_id", "workstation_id"),
+        Index("ix_request_attendant_name", "attendant_name"),
+        Index("ix_request_created_at", "created_at"),
+    )
+
+
+request_archive = Table(
+    "request_archive",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("attendant_name", String(250), nullable=False),
+    Column("applicant_name", String(250), nullable=False),
+    Column("applicant_phone", String(20), nullable=False),
+    Column("city_id", Integer, nullable=False),
+    Column("workstation_id", Integer, nullable=False),
+    Column("created_at", TIMESTAMP, primary_key=True),
+    Column(
+        "archived_at",
+        TIMESTAMP,
+        server_default=func.current_timestamp(),
+        nullable=False,
+    ),
+    Index("ix_request_archive_city_workstation", "city_id", "workstation_id"),
+    Index("ix_request_archive_created_at", "created_at"),
+    postgresql_partition_by="RANGE (created_at)",
+)
+
+
+has_archive = Table(
+    "has_archive",
+    Base.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("problem_id", Integer, nullable=False),
+    Column("request_id", Integer, nullable=False),
+    Column("category_id", Integer, nullable=False),
+    Column("is_event", Boolean, nullable=True),
+    Column("event_date", TIMESTAMP, nullable=True),
+    Column("description", Text, nullable=True),
+    Column("request_status", Enum(EnumStatus), nullable=False),
+    Column("priority", Enum(EnumPriority), nullable=False),
+    Column("created_at", TIMESTAMP, primary_key=True),
+    Index("ix_has_archive_request_id", "request_id"),
+    Index("ix_has_archive_problem_id", "problem_id"),
+    postgresql_partition_by="RANGE (created_at)",
+)
+
+
+alert_date_archive = Table(
+    "alert_date_archive",
+    Base.metadata,
+    Column("has_id", Integer, nullable=False),
+    Column("alert_date", DATE, nullable=False),
+    Index("ix_alert_date_archive_has_id", "has_id"),
+)
+
+
+ARCHIVE_TABLES = {
+    "request": request_archive,
+    "has": has_archive,
+    "alert_date": alert_date_archive,
+}
+
+
+def create_missing_indexes(target, connection, **kw):
+    for table in target.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+event.listen(Base.metadata, "after_create", create_missing_indexes)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS request_search USING fts5("
+        "applicant_name, attendant_name, description, "
+        "request_id UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS request_search ("
+        "has_id INTEGER PRIMARY KEY REFERENCES has (id) ON DELETE CASCADE, "
+        "request_id INTEGER NOT NULL, "
+        "document TSVECTOR NOT NULL)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS request_search_document_idx "
+        "ON request_search USING GIN (document)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS request_search_request_id_idx "
+        "ON request_search (request_id)"
+    ).execute_if(dialect="postgresql"),
+)
+for table in (request_archive, has_archive):
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            "CREATE TABLE IF NOT EXISTS %(table)s_default "
+            "PARTITION OF %(table)s DEFAULT"
+        ).execute_if(dialect="postgresql"),
+    )
@@ -1,13 +1,18 @@
-from typing import Union
+from typing import List, Union
 
 from fastapi import APIRouter, Depends, Path, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from database import engine, get_db
-from models import Base, Category
+from database import engine, get_db, get_read_db
+from models import Base, Category, has
+from utils.bulk_utils import find_missing, save_rows
+from utils.cache_utils import ticket_cache
+from utils.document_utils import refresh_catalog_documents
+from utils.row_utils import select_dict, select_dicts
 
 router = APIRouter()
 
@@ -26,6 +31,31 @@ class CategoryModel(BaseModel):
         }
 
 
+class BulkCategoryItemModel(CategoryModel):
+    id: int | None = None
+
+
+class BulkCategoryModel(BaseModel):
+    items: List[BulkCategoryItemModel] = Field(min_items=1, max_items=1000)
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "items": [
+                    {
+                        "name": "Internet",
+                        "description": "Problemas relacionados à internet.",
+                    },
+                    {
+                        "id": 1,
+                        "name": "Telefonia",
+                        "description": "Problemas com telefones.",
+                    },
+                ]
+            }
+        }
+
+
 Base.metadata.create_all(bind=engine)
 
 
@@ -38,7 +68,7 @@ def get_error_response(e: Exception):
 
 
 @router.post("/categoria", tags=["Categoria"], response_model=CategoryModel)
-async def post_category(data: CategoryModel, db: Session = Depends(get_db)):
+def post_category(data: CategoryModel, db: Session = Depends(get_db)):
     try:
         new_object = Category(**data.dict())
         db.add(new_object)
@@ -63,18 +93,58 @@ async def post_category(data: CategoryModel, db: Session = Depends(get_db)):
         )
 
 
+@router.post("/categoria/lote", tags=["Categoria"])
+def post_categories(
+    data: BulkCategoryModel, db: Session = Depends(get_db)
+):
+    try:
+        rows = [item.dict() for item in data.items]
+        missing = find_missing(
+            db, Category.id, {row["id"] for row in rows if row["id"]}
+        )
+        if missing:
+            response_data = {
+                "message": "Categoria não encontrada",
+                "error": True,
+                "data": missing,
+            }
+            return JSONResponse(
+                content=response_data, status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        created, updated = save_rows(db, Category.__table__, rows)
+        refresh_catalog_documents(db, has.c.category_id, *updated)
+        db.commit()
+        for category_id in updated:
+            ticket_cache.invalidate_category(category_id)
+
+        response_data = {
+            "message": "Dados cadastrados com sucesso",
+            "error": None,
+            "data": {"created": created, "updated": updated},
+        }
+        return JSONResponse(
+            content=response_data, status_code=status.HTTP_201_CREATED
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @router.get("/categoria", tags=["Categoria"])
 async def get_categories(
-    category_id: Union[int, None] = None, db: Session = Depends(get_db)
+    category_id: Union[int, None] = None, db: Session = Depends(get_read_db)
 ):
     try:
         if category_id:
-            category = (
-                db.query(Category).filter_by(id=category_id).one_or_none()
+            category = select_dict(
+                db,
+                select(Category.__table__).where(Category.id == category_id),
             )
 
             if category is not None:
-                category = jsonable_encoder(category)
                 message = "Dados buscados com sucesso"
                 status_code = status.HTTP_200_OK
             else:
@@ -92,8 +162,9 @@ async def get_categories(
                 status_code=status_code,
             )
         else:
-            all_data = db.query(Category).filter_by(active=True).all()
-            all_data = [jsonable_encoder(c) for c in all_data]
+            all_data = select_dicts(
+                db, select(Category.__table__).where(Category.active)
+            )
             response_data = {
                 "message": "Dados buscados com sucesso",
                 "error": None,
@@ -111,12 +182,14 @@ async def get_categories(
 
 
 @router.delete("/categoria/{category_id}", tags=["Categoria"])
-async def delete_category(category_id: int, db: Session = Depends(get_db)):
+def delete_category(category_id: int, db: Session = Depends(get_db)):
     try:
         category = db.query(Category).filter_by(id=category_id).one_or_none()
         if category:
             category.active = False
+            refresh_catalog_documents(db, has.c.category_id, category_id)
             db.commit()
+            ticket_cache.invalidate_category(category_id)
             message = f"Categoria de id = {category_id} deletada com sucesso"
 
         else:
@@ -136,7 +209,7 @@ async def delete_category(category_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/categoria/{category_id}", tags=["Categoria"])
-async def update_category(
+def update_category(
     data: CategoryModel,
     category_id: int = Path(title="The ID of the item to update"),
     db: Session = Depends(get_db),
@@ -146,7 +219,9 @@ async def update_category(
             db.query(Category).filter_by(id=category_id).update(data.dict())
         )
         if category:
+            refresh_catalog_documents(db, has.c.category_id, category_id)
             db.commit()
+            ticket_cache.invalidate_category(category_id)
             category_data = db.query(Category).filter_by(id=category_id).one()
             category_data = jsonable_encoder(category_data)
             # data = jsonable_encoder(category)
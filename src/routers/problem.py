@@ -1,13 +1,18 @@
-from typing import Union
+from typing import List, Union
 
 from fastapi import APIRouter, Depends, Path, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from database import engine, get_db
-from models import Base, Category, Problem
+from database import engine, get_db, get_read_db
+from models import Base, Category, Problem, has
+from utils.bulk_utils import find_missing, save_rows
+from utils.cache_utils import ticket_cache
+from utils.document_utils import refresh_catalog_documents
+from utils.row_utils import select_dict, select_dicts
 
 router = APIRouter()
 
@@ -28,6 +33,33 @@ class ProblemModel(BaseModel):
         }
 
 
+class BulkProblemItemModel(ProblemModel):
+    id: int | None = None
+
+
+class BulkProblemModel(BaseModel):
+    items: List[BulkProblemItemModel] = Field(min_items=1, max_items=1000)
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "items": [
+                    {
+                        "name": "Internet",
+                        "description": "Falha ao conectar na internet.",
+                        "category_id": 1,
+                    },
+                    {
+                        "id": 2,
+                        "name": "Impressora",
+                        "description": "Impressora nao imprime.",
+                        "category_id": 1,
+                    },
+                ]
+            }
+        }
+
+
 Base.metadata.create_all(bind=engine)
 
 
@@ -42,14 +74,15 @@ def get_error_response(e: Exception):
 @router.get("/problema", tags=["Problema"])
 async def get_problems(
     problem_id: Union[int, None] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     category_id: Union[int, None] = None,
 ):
     try:
         if problem_id:
-            problem = db.query(Problem).filter_by(id=problem_id).one_or_none()
+            problem = select_dict(
+                db, select(Problem.__table__).where(Problem.id == problem_id)
+            )
             if problem:
-                problem = jsonable_encoder(problem)
                 message = "Dados buscados com exito"
                 status_code = status.HTTP_200_OK
             else:
@@ -67,15 +100,10 @@ async def get_problems(
             )
 
         else:
+            query = select(Problem.__table__).where(Problem.active)
             if category_id:
-                all_data = (
-                    db.query(Problem)
-                    .filter_by(category_id=category_id, active=True)
-                    .all()
-                )
-            else:
-                all_data = db.query(Problem).filter_by(active=True).all()
-            all_data = [jsonable_encoder(c) for c in all_data]
+                query = query.where(Problem.category_id == category_id)
+            all_data = select_dicts(db, query)
 
             response_data = {
                 "message": "Dados buscados com sucesso",
@@ -98,7 +126,7 @@ async def get_problems(
 
 
 @router.post("/problema", tags=["Problema"], response_model=ProblemModel)
-async def post_problem(data: ProblemModel, db: Session = Depends(get_db)):
+def post_problem(data: ProblemModel, db: Session = Depends(get_db)):
     try:
         problem = Problem(**data.dict())
 
@@ -145,13 +173,66 @@ async def post_problem(data: ProblemModel, db: Session = Depends(get_db)):
         )
 
 
+@router.post("/problema/lote", tags=["Problema"])
+def post_problems(data: BulkProblemModel, db: Session = Depends(get_db)):
+    try:
+        rows = [item.dict() for item in data.items]
+        invalid = find_missing(
+            db, Category.id, {row["category_id"] for row in rows}
+        )
+        if invalid:
+            response_data = {
+                "message": "Categoria de problema invalida.",
+                "error": True,
+                "data": invalid,
+            }
+            return JSONResponse(
+                content=response_data, status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        missing = find_missing(
+            db, Problem.id, {row["id"] for row in rows if row["id"]}
+        )
+        if missing:
+            response_data = {
+                "message": "Problema não encontrado",
+                "error": True,
+                "data": missing,
+            }
+            return JSONResponse(
+                content=response_data, status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        created, updated = save_rows(db, Problem.__table__, rows)
+        refresh_catalog_documents(db, has.c.problem_id, *updated)
+        db.commit()
+        for problem_id in updated:
+            ticket_cache.invalidate_problem(problem_id)
+
+        response_data = {
+            "message": "Dados cadastrados com sucesso",
+            "error": None,
+            "data": {"created": created, "updated": updated},
+        }
+        return JSONResponse(
+            content=response_data, status_code=status.HTTP_201_CREATED
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @router.delete("/problema/{problem_id}", tags=["Problema"])
-async def delete_problem(problem_id: int, db: Session = Depends(get_db)):
+def delete_problem(problem_id: int, db: Session = Depends(get_db)):
     try:
         problem = db.query(Problem).filter_by(id=problem_id).one_or_none()
         if problem:
             problem.active = False
+            refresh_catalog_documents(db, has.c.problem_id, problem_id)
             db.commit()
+            ticket_cache.invalidate_problem(problem_id)
             msg = f"Problema de id: {problem_id} deletado com sucesso"
 
         else:
@@ -171,7 +252,7 @@ async def delete_problem(problem_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/problema/{problem_id}", tags=["Problema"])
-async def put_problem(
+def put_problem(
     data: ProblemModel,
     problem_id: int = Path(title="The ID of the item to update"),
     db: Session = Depends(get_db),
@@ -196,7 +277,9 @@ async def put_problem(
                     status_code=status.HTTP_400_BAD_REQUEST
                 )
 
+            refresh_catalog_documents(db, has.c.problem_id, problem_id)
             db.commit()
+            ticket_cache.invalidate_problem(problem_id)
             problem_data = (
                 db.query(Problem).filter_by(id=problem_id).one_or_none()
             )
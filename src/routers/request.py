@@ -1,17 +1,47 @@
-import os
-from datetime import datetime, timedelta
+import logging
+from datetime import date, datetime, time, timedelta
 from typing import List, Union
 
-import requests as r
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from sqlalchemy import insert
+from pydantic import BaseModel, Field, root_validator
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-
-from database import engine, get_db
-from models import Base, Category, Problem, Request, alert_date, has
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal, engine, get_db, get_read_db, is_replica
+from models import Base, EnumPriority, EnumStatus, Request, alert_date, has
+from utils.archive_utils import get_adapter, to_archive
+from utils.bulk_utils import insert_rows, transition_status
+from utils.cache_utils import ticket_cache
+from utils.document_utils import (expand_problems, get_has_data,
+                                  get_request_documents,
+                                  refresh_request_documents)
+from utils.event_utils import (event_calendar, event_digest, get_event_list,
+                               get_event_rows)
+from utils.filter_utils import (EXPANDABLE, InvalidFilterError,
+                                compile_combined_request_query,
+                                compile_request_query, get_expand, get_fields,
+                                get_problem_columns, get_request_columns,
+                                project_document)
+from utils.history_utils import record_status_changes
+from utils.idempotency_utils import (IdempotencyConflictError,
+                                     get_request_hash, get_stored_response,
+                                     replay_response, store_response)
+from utils.intake_utils import intake_queue
+from utils.mirror_utils import add_locality_data
+from utils.rollup_utils import update_request_rollup
+from utils.row_utils import select_dicts
+from utils.search_utils import index_new_requests, update_search_index
+from utils.stats_utils import (get_request_snapshot, get_snapshot,
+                               update_request_stats)
+from utils.stream_utils import (change_hub, publish_request_changes,
+                                publish_status_changes)
+from utils.sync_utils import get_request_changes, record_request_change
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -28,9 +58,6 @@ class UpdateHasModel(BaseModel):
     description: str | None = None
 
 
-GERENCIADOR_DE_LOCALIDADES_URL = os.getenv("GERENCIADOR_DE_LOCALIDADES_URL")
-
-
 class UpdateRequestModel(BaseModel):
     attendant_name: str | None = None
     applicant_name: str | None = None
@@ -136,6 +163,38 @@ class RequestModel(BaseModel):
         }
 
 
+class BulkStatusItemModel(BaseModel):
+    id: int | None = None
+    request_id: int | None = None
+    problem_id: int | None = None
+
+    @root_validator
+    def check_item(cls, values):
+        if values.get("id") is None and (
+            values.get("request_id") is None
+            or values.get("problem_id") is None
+        ):
+            raise ValueError("Informe id ou request_id e problem_id")
+        return values
+
+
+class BulkStatusModel(BaseModel):
+    request_status: EnumStatus
+    items: List[BulkStatusItemModel] = Field(min_items=1, max_items=1000)
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "request_status": "solved",
+                "items": [
+                    {"request_id": 1, "problem_id": 1},
+                    {"request_id": 1, "problem_id": 2},
+                    {"id": 3},
+                ],
+            }
+        }
+
+
 Base.metadata.create_all(bind=engine)
 
 
@@ -147,145 +206,241 @@ def get_error_response(e: Exception):
     }
 
 
-@router.post("/chamado", tags=["Chamado"], response_model=RequestModel)
-async def post_request(data: RequestModel, db: Session = Depends(get_db)):
-    try:
-        data_dict = data.dict()
-        problems = data_dict.pop("problems")
+def update_request_summaries(db: Session, before: list, after: list):
+    update_request_stats(db, before, after)
+    update_request_rollup(db, before, after)
+    record_status_changes(db, before, after)
 
-        new_object = Request(**data_dict)
-        db.add(new_object)
-        db.commit()
-        db.refresh(new_object)
-        new_object = jsonable_encoder(new_object)
-        for problem in problems:
-            problem["request_id"] = new_object["id"]
-
-            alerts = problem.pop("alert_dates")
-
-            result = db.execute(insert(has).values(**problem))
-
-            if alerts:
-                for alert in alerts:
-                    db.execute(
-                        insert(alert_date).values(
-                            **{
-                                "alert_date": alert,
-                                "has_id": result.inserted_primary_key[0],
-                            }
-                        )
-                    )
 
-        db.commit()
+def create_request(db: Session, data: RequestModel) -> tuple:
+    data_dict = data.dict()
+    problems = data_dict.pop("problems")
 
-        response_data = jsonable_encoder(
-            {
-                "message": "Dado cadastrado com sucesso",
-                "error": None,
-                "data": new_object,
-            }
-        )
+    new_object = Request(**data_dict)
+    db.add(new_object)
+    db.flush()
+    db.refresh(new_object)
+    new_object = jsonable_encoder(new_object)
+    new_alerts = []
+    for problem in problems:
+        problem["request_id"] = new_object["id"]
 
-        return JSONResponse(
-            content=response_data, status_code=status.HTTP_201_CREATED
+        alerts = problem.pop("alert_dates")
+        new_alerts.extend(alerts or [])
+
+        result = db.execute(insert(has).values(**problem))
+
+        if alerts:
+            for alert in alerts:
+                db.execute(
+                    insert(alert_date).values(
+                        **{
+                            "alert_date": alert,
+                            "has_id": result.inserted_primary_key[0],
+                        }
+                    )
+                )
+
+    after = get_request_snapshot(db, new_object["id"])
+    update_request_summaries(db, [], after)
+    update_search_index(db, new_object["id"])
+    refresh_request_documents(db, [new_object["id"]])
+    return new_object, after, new_alerts
+
+
+def create_requests(db: Session, batch: list) -> list:
+    requests = [data.dict() for data in batch]
+    problems = [request.pop("problems") for request in requests]
+    request_ids = insert_rows(db, Request.__table__, requests)
+
+    rows = [
+        {**problem, "request_id": request_id}
+        for request_id, request_problems in zip(request_ids, problems)
+        for problem in request_problems
+    ]
+    alerts = [row.pop("alert_dates") or [] for row in rows]
+    has_ids = insert_rows(db, has, rows)
+    alert_rows = [
+        {"has_id": has_id, "alert_date": alert}
+        for has_id, has_alerts in zip(has_ids, alerts)
+        for alert in has_alerts
+    ]
+    if alert_rows:
+        db.execute(insert(alert_date), alert_rows)
+
+    after = get_snapshot(db, has.c.request_id.in_(request_ids))
+    update_request_summaries(db, [], after)
+    index_new_requests(db, request_ids)
+    refresh_request_documents(db, request_ids)
+
+    new_objects = {
+        request["id"]: request
+        for request in select_dicts(
+            db, select(Request.__table__).where(Request.id.in_(request_ids))
         )
-    except Exception as e:
-        return JSONResponse(
-            content=get_error_response(e),
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+    }
+    return [
+        (
+            new_objects[request_id],
+            [row for row in after if row.request_id == request_id],
+            [
+                alert
+                for problem in request_problems
+                for alert in problem["alert_dates"] or []
+            ],
         )
+        for request_id, request_problems in zip(request_ids, problems)
+    ]
 
 
-def get_has_data(query, db: Session):
-    final_list = []
-    for request in query:
-        request_dict = jsonable_encoder(request)
-        requests = (
-            db.query(has).filter(has.c.request_id == request_dict["id"]).all()
-        )
-        lista = []
-        for problem in requests:
-            problem_data = (
-                db.query(Problem).filter_by(id=problem.problem_id).first()
-            )
-            category_data = (
-                db.query(Category).filter_by(id=problem.category_id).first()
-            )
-            alert_dates = (
-                db.query(alert_date)
-                .filter(alert_date.c.has_id == problem.id)
-                .all()
+def write_request_batch(batch: list) -> list:
+    with SessionLocal() as db:
+        try:
+            results = create_requests(db, batch)
+            record_request_change(
+                db, *(new_object["id"] for new_object, _, _ in results)
             )
+            db.commit()
+            return results
+        except Exception:
+            db.rollback()
+            logger.exception("Falha ao gravar o lote de chamados")
+
+    results = []
+    for data in batch:
+        with SessionLocal() as db:
+            try:
+                result = create_request(db, data)
+                record_request_change(db, result[0]["id"])
+                db.commit()
+                results.append(result)
+            except Exception as e:
+                results.append(e)
+    return results
 
-            alerts_dict = jsonable_encoder(alert_dates)
-            problem_dict = jsonable_encoder(problem_data)
-            category_dict = jsonable_encoder(category_data)
 
-            tmp_dict = jsonable_encoder(problem)
-            tmp_dict["problem"] = problem_dict
-            tmp_dict["category"] = category_dict
-            tmp_dict["alert_dates"] = [
-                date["alert_date"] for date in alerts_dict
-            ]
-            lista.append(tmp_dict)
+def publish_created_request(new_object: dict, after: list, new_alerts: list):
+    event_digest.invalidate_if_affected(after, new_alerts)
+    event_calendar.apply_changes([], after)
+    change_hub.publish("created", request_id=new_object["id"])
 
-        request_dict["problems"] = lista
 
-        response = r.get(
-            GERENCIADOR_DE_LOCALIDADES_URL
-            + f"/city?city_id={request_dict['city_id']}"
-        )
+def get_created_response(new_object: dict) -> dict:
+    return jsonable_encoder(
+        {
+            "message": "Dado cadastrado com sucesso",
+            "error": None,
+            "data": new_object,
+        }
+    )
+
+
+def save_request(
+    data: RequestModel, db: Session, idempotency_key: str | None
+) -> JSONResponse:
+    if idempotency_key:
+        request_hash = get_request_hash(data.dict())
+        stored = get_stored_response(db, idempotency_key, request_hash)
+        if stored is not None:
+            return replay_response(stored)
+
+    new_object, after, new_alerts = create_request(db, data)
+    response_data = get_created_response(new_object)
+    if idempotency_key:
+        try:
+            store_response(
+                db,
+                idempotency_key,
+                request_hash,
+                status.HTTP_201_CREATED,
+                response_data,
+            )
+        except IntegrityError:
+            db.rollback()
+            return replay_response(
+                get_stored_response(db, idempotency_key, request_hash)
+            )
+    record_request_change(db, new_object["id"])
+    db.commit()
+    publish_created_request(new_object, after, new_alerts)
+    return JSONResponse(
+        content=response_data, status_code=status.HTTP_201_CREATED
+    )
 
-        if response.status_code == 200:
-            request_dict["city"] = response.json()["data"]
 
-        response = r.get(GERENCIADOR_DE_LOCALIDADES_URL
-                         + f"/workstation?id={request_dict['workstation_id']}"
-                         )
+@router.post("/chamado", tags=["Chamado"], response_model=RequestModel)
+async def post_request(
+    data: RequestModel,
+    db: Session = Depends(get_db),
+    idempotency_key: Union[str, None] = Header(default=None, max_length=255),
+):
+    try:
+        if not idempotency_key and intake_queue.is_running():
+            new_object, after, new_alerts = await intake_queue.submit(data)
+            publish_created_request(new_object, after, new_alerts)
+            return JSONResponse(
+                content=get_created_response(new_object),
+                status_code=status.HTTP_201_CREATED,
+            )
+        return await run_in_threadpool(
+            save_request, data, db, idempotency_key
+        )
+    except IdempotencyConflictError as e:
+        response_data = {"message": str(e), "error": True, "data": None}
+        return JSONResponse(
+            content=response_data,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
 
-        if response.status_code == 200:
-            request_dict["workstation"] = response.json()["data"]
 
-        final_list.append(request_dict)
-    return final_list
+def expand_events(db: Session, events: list, expand: set) -> list:
+    final_list = [
+        {**event, "problems": dict(event["problems"])} for event in events
+    ]
+    expand_problems(db, [event["problems"] for event in final_list], expand)
+    return add_locality_data(db, final_list, expand)
 
 
 @router.get("/evento", tags=["Evento"])
 async def get_event(
-    days_to_event: Union[int, None] = None, db: Session = Depends(get_db)
+    days_to_event: Union[int, None] = None,
+    start_date: Union[date, None] = None,
+    end_date: Union[date, None] = None,
+    next_events: Union[int, None] = Query(default=None, ge=1, le=1000),
+    expand: Union[List[str], None] = Query(default=None),
+    db: Session = Depends(get_read_db),
 ):
     try:
-        if days_to_event:
-            query = (
-                db.query(has)
-                .filter(
-                    has.c.is_event,
-                    has.c.event_date >= datetime.now(),
-                    has.c.event_date
-                    <= datetime.today() + timedelta(days=days_to_event),
-                )
-                .all()
+        expand = get_expand(expand, frozenset())
+        if start_date or end_date:
+            start_date = start_date or date.today()
+            has_ids = event_calendar.get_window(
+                db,
+                datetime.combine(start_date, time.min),
+                datetime.combine(end_date or start_date, time.max),
             )
+            final_list = get_event_list(db, get_event_rows(db, has_ids))
+        elif next_events:
+            has_ids = event_calendar.get_next(db, datetime.now(), next_events)
+            final_list = get_event_list(db, get_event_rows(db, has_ids))
+        elif days_to_event:
+            final_list = event_digest.get_events(db, days_to_event)
+            if final_list is None:
+                now = datetime.now()
+                has_ids = event_calendar.get_window(
+                    db, now, now + timedelta(days=days_to_event)
+                )
+                final_list = get_event_list(db, get_event_rows(db, has_ids))
         else:
-            query = (
-                db.query(has)
-                .join(alert_date)
-                .filter(alert_date.c.alert_date == datetime.today().date())
-                .all()
-            )
-            print(f"QUERY = {query}")
+            final_list = event_digest.get_alerts(db)
 
-        final_list = []
-        for event in query:
-            event_dict = jsonable_encoder(event)
-            request = (
-                db.query(Request)
-                .filter(Request.id == event_dict["request_id"])
-                .first()
-            )
-            request_dict = jsonable_encoder(request)
-            request_dict["problems"] = event_dict
-            final_list.append(request_dict)
+        if expand:
+            final_list = expand_events(db, final_list, expand)
 
         response_data = jsonable_encoder(
             {
@@ -298,6 +453,11 @@ async def get_event(
         return JSONResponse(
             content=response_data, status_code=status.HTTP_200_OK
         )
+    except InvalidFilterError as e:
+        response_data = {"message": str(e), "error": True, "data": None}
+        return JSONResponse(
+            content=response_data, status_code=status.HTTP_400_BAD_REQUEST
+        )
     except Exception as e:
         return JSONResponse(
             content=get_error_response(e),
@@ -305,57 +465,93 @@ async def get_event(
         )
 
 
-def get_request_data(db: Session, data: dict):
-    query = db.query(has).filter_by(**data).all()
-
-    final_list = []
-    for event in query:
-        tmp = []
-        event_dict = jsonable_encoder(event)
-        request = (
-            db.query(Request)
-            .filter(Request.id == event_dict["request_id"])
-            .first()
+@router.get("/evento/calendario", tags=["Evento"])
+async def get_event_calendar(
+    year: Union[int, None] = Query(default=None, ge=1, le=9998),
+    month: Union[int, None] = Query(default=None, ge=1, le=12),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        today = date.today()
+        days = event_calendar.count_by_day(
+            db, year or today.year, month or today.month
         )
-        problem_data = db.query(Problem).filter_by(id=event.problem_id).first()
-        category_data = (
-            db.query(Category).filter_by(id=event.category_id).first()
+        response_data = {
+            "message": "Dados recuperados com sucesso",
+            "error": None,
+            "data": jsonable_encoder(days),
+        }
+        return JSONResponse(
+            content=response_data, status_code=status.HTTP_200_OK
         )
-        alert_dates = (
-            db.query(alert_date).filter(alert_date.c.has_id == event.id).all()
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
-        alerts_dict = jsonable_encoder(alert_dates)
-        problem_dict = jsonable_encoder(problem_data)
-        category_dict = jsonable_encoder(category_data)
-
-        request_dict = jsonable_encoder(request)
-        event_dict["problem"] = problem_dict
-        event_dict["category"] = category_dict
-        event_dict["alert_dates"] = [
-            date["alert_date"] for date in alerts_dict
-        ]
-
-        tmp.append(event_dict)
 
-        request_dict["problems"] = tmp
 
-        response = r.get(
-            GERENCIADOR_DE_LOCALIDADES_URL
-            + f"/city?city_id={request_dict['city_id']}"
+def get_request_data(
+    db: Session,
+    data: dict,
+    sort: list | None = None,
+    limit: int | None = None,
+    offset: int | None = None,
+    expand: set = EXPANDABLE,
+    fields: tuple | None = None,
+    include_archived: bool = False,
+):
+    problem_columns = get_problem_columns(fields, expand)
+    if include_archived:
+        query = compile_combined_request_query(
+            db, data, sort, limit, offset, problem_columns
         )
-
-        if response.status_code == 200:
-            request_dict["city"] = response.json()["data"]
-
-        response = r.get(
-            GERENCIADOR_DE_LOCALIDADES_URL
-            + f"/workstation?id={request_dict['workstation_id']}"
+    else:
+        query = compile_request_query(
+            db, data, sort, limit, offset, problem_columns
+        ).statement
+    names = [column.name for column in problem_columns]
+    events = []
+    for row in select_dicts(db, query):
+        events.append(
+            ({name: row[name] for name in names}, bool(row.get("archived")))
         )
 
-        if response.status_code == 200:
-            request_dict["workstation"] = response.json()["data"]
+    requests = {}
+    for archived in {archived for _, archived in events}:
+        adapt = get_adapter(archived)
+        source_events = [
+            event_dict
+            for event_dict, event_archived in events
+            if event_archived == archived
+        ]
+        requests[archived] = {
+            request["id"]: request
+            for request in select_dicts(
+                db,
+                select(*map(adapt, get_request_columns(fields, expand))).where(
+                    adapt(
+                        Request.id.in_(
+                            {event["request_id"] for event in source_events}
+                        )
+                    )
+                ),
+            )
+        }
+        expand_problems(db, source_events, expand, archived)
 
-        final_list.append(request_dict)
+    request_list = []
+    for event_dict, archived in events:
+        request_dict = dict(requests[archived][event_dict["request_id"]])
+        request_dict["problems"] = [event_dict]
+
+        if archived:
+            request_dict["archived"] = True
+        request_list.append(request_dict)
+    final_list = [
+        project_document(request_dict, fields)
+        for request_dict in add_locality_data(db, request_list, expand)
+    ]
 
     if data.get("is_event"):
         tmp_list = final_list
@@ -378,15 +574,60 @@ async def get_chamado(
     id: Union[int, None] = None,
     problem_id: Union[int, None] = None,
     is_event: Union[bool, None] = None,
-    request_status: Union[str, None] = None,
-    db: Session = Depends(get_db),
+    request_status: Union[EnumStatus, None] = None,
+    priority: Union[EnumPriority, None] = None,
+    category_id: Union[int, None] = None,
+    city_id: Union[int, None] = None,
+    workstation_id: Union[int, None] = None,
+    city_name: Union[str, None] = None,
+    workstation_name: Union[str, None] = None,
+    workstation_city_id: Union[int, None] = None,
+    attendant_name: Union[str, None] = None,
+    created_after: Union[datetime, None] = None,
+    created_before: Union[datetime, None] = None,
+    sort: Union[List[str], None] = Query(default=None),
+    limit: Union[int, None] = Query(default=None, ge=1),
+    offset: Union[int, None] = Query(default=None, ge=0),
+    expand: Union[List[str], None] = Query(default=None),
+    fields: Union[List[str], None] = Query(default=None),
+    incluir_arquivados: bool = False,
+    db: Session = Depends(get_read_db),
 ):
     try:
+        expand = get_expand(expand)
+        fields = get_fields(fields)
+        cacheable = expand == EXPANDABLE and fields is None
+        request_columns = get_request_columns(fields, expand)
         if id:
-            query = db.query(Request).filter(Request.id == id).all()
+            generation = ticket_cache.generation
+            cached = ticket_cache.get(id) if cacheable else None
+            if cached is not None:
+                query = [cached]
+            else:
+                query = jsonable_encoder(
+                    get_request_documents(db, [id], expand, fields)
+                )
+                if (
+                    query
+                    and cacheable
+                    and not query[0].get("partial")
+                    and not is_replica(db)
+                ):
+                    ticket_cache.put(id, query[0], generation)
+            if not query and incluir_arquivados:
+                query = get_has_data(
+                    select_dicts(
+                        db,
+                        select(*map(to_archive, request_columns)).where(
+                            to_archive(Request.id == id)
+                        ),
+                    ),
+                    db,
+                    expand,
+                    fields,
+                    archived=True,
+                )
             if query:
-                final_list = get_has_data(query, db)
-                query = jsonable_encoder(final_list)
                 message = "Dados buscados com sucesso"
                 status_code = status.HTTP_200_OK
             else:
@@ -400,35 +641,58 @@ async def get_chamado(
                 status_code=status_code,
             )
 
-        if is_event or request_status or problem_id:
-            data_dict = {
-                "is_event": is_event,
-                "request_status": request_status,
-                "problem_id": problem_id,
-            }
-
-            filtered_dict = {
-                key: value
-                for key, value in data_dict.items()
-                if value is not None
-            }
+        data_dict = {
+            "is_event": is_event,
+            "request_status": request_status,
+            "problem_id": problem_id,
+            "priority": priority,
+            "category_id": category_id,
+            "city_id": city_id,
+            "workstation_id": workstation_id,
+            "city_name": city_name,
+            "workstation_name": workstation_name,
+            "workstation_city_id": workstation_city_id,
+            "attendant_name": attendant_name,
+            "created_after": created_after,
+            "created_before": created_before,
+        }
 
-            final_list = get_request_data(db, filtered_dict)
-            query = jsonable_encoder(final_list)
-            message = "Dados buscados com sucesso"
-            status_code = status.HTTP_200_OK
+        filtered_dict = {
+            key: value
+            for key, value in data_dict.items()
+            if value is not None
+        }
 
-            response_data = {"message": message, "error": None, "data": query}
+        if filtered_dict or sort or limit or offset:
+            final_list = get_request_data(
+                db,
+                filtered_dict,
+                sort,
+                limit,
+                offset,
+                expand,
+                fields,
+                include_archived=incluir_arquivados,
+            )
+            response_data = {
+                "message": "Dados buscados com sucesso",
+                "error": None,
+                "data": final_list,
+            }
 
             return JSONResponse(
-                content=jsonable_encoder(response_data),
-                status_code=status_code,
+                content=response_data, status_code=status.HTTP_200_OK
             )
 
         else:
-            query = db.query(Request).all()
-            all_data = get_has_data(query, db)
-            all_data = jsonable_encoder(all_data)
+            all_data = get_request_documents(db, None, expand, fields)
+            if incluir_arquivados:
+                query = select(*map(to_archive, request_columns)).order_by(
+                    to_archive(Request.__table__.c.id)
+                )
+                all_data += get_has_data(
+                    select_dicts(db, query), db, expand, fields, archived=True
+                )
             response_data = {
                 "message": "Dados buscados com sucesso",
                 "error": None,
@@ -438,6 +702,11 @@ async def get_chamado(
                 content=dict(response_data), status_code=status.HTTP_200_OK
             )
 
+    except InvalidFilterError as e:
+        response_data = {"message": str(e), "error": True, "data": None}
+        return JSONResponse(
+            content=response_data, status_code=status.HTTP_400_BAD_REQUEST
+        )
     except Exception as e:
         return JSONResponse(
             content=get_error_response(e),
@@ -445,11 +714,53 @@ async def get_chamado(
         )
 
 
+@router.get("/chamado/alteracoes", tags=["Chamado"])
+async def get_chamado_changes(
+    desde: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        changed, deleted, cursor, has_more = get_request_changes(
+            db, desde, limit
+        )
+        response_data = {
+            "message": "Dados buscados com sucesso",
+            "error": None,
+            "data": {
+                "cursor": cursor,
+                "has_more": has_more,
+                "changed": get_has_data(changed, db),
+                "deleted": deleted,
+            },
+        }
+        return JSONResponse(
+            content=jsonable_encoder(response_data),
+            status_code=status.HTTP_200_OK,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@router.get("/chamado/cache", tags=["Chamado"])
+async def get_chamado_cache():
+    response_data = {
+        "message": "Dados buscados com sucesso",
+        "error": None,
+        "data": ticket_cache.stats(),
+    }
+    return JSONResponse(content=response_data, status_code=status.HTTP_200_OK)
+
+
 @router.delete("/chamado", tags=["Chamado"])
-async def delete_chamado(
+def delete_chamado(
     request_id: int, problem_id: int, db: Session = Depends(get_db)
 ):
     try:
+        before = get_request_snapshot(db, request_id)
         query = (
             db.query(has)
             .filter(has.c.request_id == request_id)
@@ -458,7 +769,17 @@ async def delete_chamado(
         )
 
         if query:
+            update_request_summaries(
+                db, before, get_request_snapshot(db, request_id)
+            )
+            refresh_request_documents(db, [request_id])
+            record_request_change(db, request_id)
             db.commit()
+            ticket_cache.invalidate(request_id)
+            event_digest.invalidate_if_affected(before, [])
+            change_hub.publish(
+                "solved", request_id=request_id, problem_id=problem_id
+            )
             query_data = (
                 db.query(has)
                 .filter(has.c.request_id == request_id)
@@ -484,8 +805,48 @@ async def delete_chamado(
         )
 
 
+@router.put("/chamado/lote/status", tags=["Chamado"])
+def update_chamado_status(
+    data: BulkStatusModel, db: Session = Depends(get_db)
+):
+    try:
+        items = [item.dict(exclude_none=True) for item in data.items]
+        before, after, outcomes = transition_status(
+            db, items, data.request_status
+        )
+        request_ids = sorted({row.request_id for row in after})
+        if request_ids:
+            update_request_summaries(db, before, after)
+            refresh_request_documents(db, request_ids)
+            record_request_change(db, *request_ids)
+        db.commit()
+        if request_ids:
+            ticket_cache.invalidate(*request_ids)
+            event_digest.invalidate_if_affected(before, [])
+            publish_status_changes(before, after)
+
+        response_data = {
+            "message": "Status dos chamados atualizado com sucesso",
+            "error": None,
+            "data": {
+                "request_status": data.request_status,
+                "updated": len(after),
+                "items": outcomes,
+            },
+        }
+        return JSONResponse(
+            content=jsonable_encoder(response_data),
+            status_code=status.HTTP_200_OK,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @router.put("/chamado/{request_id}", tags=["Chamado"])
-async def update_chamado(
+def update_chamado(
     data: UpdateRequestModel, request_id: int, db: Session = Depends(get_db)
 ):
     try:
@@ -493,15 +854,16 @@ async def update_chamado(
             db.query(Request).filter(Request.id == request_id).one_or_none()
         )
         if query:
-            data_dict = data.dict()
-            problems = data_dict.pop("problems")
+            data_dict = data.dict(exclude={"problems"}, exclude_none=True)
+            problems = [problem.dict() for problem in data.problems or []]
+            has_ids = [problem["id"] for problem in problems]
+            before = get_request_snapshot(db, request_id, has_ids)
             to_update = (
                 db.query(Request)
                 .filter(Request.id == request_id)
                 .update(data_dict)
             )
             if to_update:
-                db.commit()
                 for problem in problems:
                     problem = jsonable_encoder(problem)
                     problem_id = problem.pop("id")
@@ -516,11 +878,9 @@ async def update_chamado(
                     )
 
                     if has_updated:
-                        db.commit()
                         db.query(alert_date).filter_by(
                             has_id=problem_id
                         ).delete()
-                        db.commit()
                         for alert in alerts:
                             alert = jsonable_encoder(alert)
                             db.execute(
@@ -531,10 +891,34 @@ async def update_chamado(
                                     }
                                 )
                             )
-                            db.commit()
-            query = db.query(Request).filter(Request.id == request_id).all()
-            final_list = get_has_data(query, db)
-            query = jsonable_encoder(final_list)
+                after = get_request_snapshot(db, request_id, has_ids)
+                update_request_summaries(db, before, after)
+                update_search_index(db, request_id, has_ids)
+                refresh_request_documents(
+                    db, {request_id, *(row.request_id for row in before)}
+                )
+                record_request_change(db, request_id)
+                db.commit()
+                ticket_cache.invalidate(
+                    request_id, *{row.request_id for row in before}
+                )
+                event_digest.invalidate_if_affected(
+                    before + after,
+                    [
+                        alert
+                        for problem in problems
+                        for alert in problem["alert_dates"] or []
+                    ],
+                )
+                event_calendar.apply_changes(before, after)
+                publish_request_changes(request_id, before, after, "updated")
+            generation = ticket_cache.generation
+            request_row = select(Request.__table__).where(
+                Request.id == request_id
+            )
+            query = get_has_data(select_dicts(db, request_row), db)
+            if query and not query[0].get("partial"):
+                ticket_cache.put(request_id, query[0], generation)
             message = "Dados atualizados com sucesso"
             status_code = status.HTTP_200_OK
             response_data = {"message": message, "error": None, "data": query}
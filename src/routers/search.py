@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import engine, get_read_db
+from models import Base, Request, has
+from utils.row_utils import select_dicts
+from utils.search_utils import search_requests
+
+router = APIRouter()
+
+
+Base.metadata.create_all(bind=engine)
+
+
+def get_error_response(e: Exception):
+    return {
+        "message": "Erro ao processar dados",
+        "error": str(e),
+        "data": None,
+    }
+
+
+def get_search_results(db: Session, hits: list) -> list:
+    has_ids = [hit.has_id for hit in hits]
+    request_ids = {hit.request_id for hit in hits}
+    problems = {
+        problem["id"]: problem
+        for problem in select_dicts(
+            db, select(has).where(has.c.id.in_(has_ids))
+        )
+    }
+    requests = {
+        request["id"]: request
+        for request in select_dicts(
+            db, select(Request.__table__).where(Request.id.in_(request_ids))
+        )
+    }
+
+    final_list = []
+    for hit in hits:
+        if hit.has_id not in problems or hit.request_id not in requests:
+            continue
+        request_dict = dict(requests[hit.request_id])
+        request_dict["problems"] = [problems[hit.has_id]]
+        request_dict["rank"] = hit.rank
+        final_list.append(request_dict)
+    return final_list
+
+
+@router.get("/chamado/busca", tags=["Chamado"])
+async def search_chamado(
+    q: str = Query(min_length=1),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        hits, total = search_requests(
+            db, q, page_size, (page - 1) * page_size
+        )
+        response_data = {
+            "message": "Dados buscados com sucesso",
+            "error": None,
+            "data": {
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "results": get_search_results(db, hits),
+            },
+        }
+        return JSONResponse(
+            content=jsonable_encoder(response_data),
+            status_code=status.HTTP_200_OK,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
@@ -0,0 +1,169 @@
+from datetime import date
+from typing import List, Union
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from database import engine, get_read_db
+from models import Base, EnumPriority, EnumStatus
+from utils.history_utils import (DEFAULT_PERCENTILES, HISTORY_KEYS,
+                                 get_status_percentiles)
+from utils.rollup_utils import EnumGranularity, get_request_rollup
+from utils.stats_utils import STATS_KEYS, get_request_stats
+
+router = APIRouter()
+
+
+Base.metadata.create_all(bind=engine)
+
+
+def get_error_response(e: Exception):
+    return {
+        "message": "Erro ao processar dados",
+        "error": str(e),
+        "data": None,
+    }
+
+
+@router.get("/chamado/estatisticas", tags=["Estatisticas"])
+async def get_statistics(
+    group_by: Union[List[str], None] = Query(default=None),
+    request_status: Union[EnumStatus, None] = None,
+    priority: Union[EnumPriority, None] = None,
+    category_id: Union[int, None] = None,
+    city_id: Union[int, None] = None,
+    db: Session = Depends(get_read_db),
+):
+    try:
+        group_by = group_by or list(STATS_KEYS)
+        invalid = [key for key in group_by if key not in STATS_KEYS]
+        if invalid:
+            response_data = {
+                "message": f"Agrupamento invalido: {', '.join(invalid)}",
+                "error": True,
+                "data": None,
+            }
+            return JSONResponse(
+                content=response_data, status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        data_dict = {
+            "request_status": request_status,
+            "priority": priority,
+            "category_id": category_id,
+            "city_id": city_id,
+        }
+        filtered_dict = {
+            key: value for key, value in data_dict.items() if value is not None
+        }
+
+        stats = get_request_stats(db, group_by, filtered_dict)
+        response_data = {
+            "message": "Dados buscados com sucesso",
+            "error": None,
+            "data": stats,
+        }
+        return JSONResponse(
+            content=jsonable_encoder(response_data),
+            status_code=status.HTTP_200_OK,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@router.get("/chamado/tendencias", tags=["Estatisticas"])
+async def get_trends(
+    granularity: EnumGranularity = EnumGranularity.day,
+    start_date: Union[date, None] = None,
+    end_date: Union[date, None] = None,
+    group_by: Union[List[str], None] = Query(default=None),
+    category_id: Union[int, None] = None,
+    city_id: Union[int, None] = None,
+    db: Session = Depends(get_read_db),
+):
+    try:
+        group_by = group_by or ["category_id", "city_id"]
+        invalid = [
+            key for key in group_by if key not in ("category_id", "city_id")
+        ]
+        if invalid:
+            response_data = {
+                "message": f"Agrupamento invalido: {', '.join(invalid)}",
+                "error": True,
+                "data": None,
+            }
+            return JSONResponse(
+                content=response_data, status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        data_dict = {"category_id": category_id, "city_id": city_id}
+        filtered_dict = {
+            key: value for key, value in data_dict.items() if value is not None
+        }
+
+        trends = get_request_rollup(
+            db, granularity, group_by, filtered_dict, start_date, end_date
+        )
+        response_data = {
+            "message": "Dados buscados com sucesso",
+            "error": None,
+            "data": trends,
+        }
+        return JSONResponse(
+            content=jsonable_encoder(response_data),
+            status_code=status.HTTP_200_OK,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
+@router.get("/chamado/resolucao", tags=["Estatisticas"])
+async def get_resolution_times(
+    group_by: Union[List[str], None] = Query(default=None),
+    percentiles: Union[List[float], None] = Query(default=None),
+    request_status: Union[EnumStatus, None] = None,
+    start_date: Union[date, None] = None,
+    end_date: Union[date, None] = None,
+    db: Session = Depends(get_read_db),
+):
+    try:
+        group_by = group_by or list(HISTORY_KEYS)
+        percentiles = percentiles or list(DEFAULT_PERCENTILES)
+        invalid = [key for key in group_by if key not in HISTORY_KEYS]
+        if invalid:
+            message = f"Agrupamento invalido: {', '.join(invalid)}"
+        elif any(not 0 <= percentile <= 100 for percentile in percentiles):
+            message = "Percentis devem estar entre 0 e 100"
+        else:
+            message = None
+        if message:
+            response_data = {"message": message, "error": True, "data": None}
+            return JSONResponse(
+                content=response_data, status_code=status.HTTP_400_BAD_REQUEST
+            )
+
+        resolution = get_status_percentiles(
+            db, group_by, percentiles, request_status, start_date, end_date
+        )
+        response_data = {
+            "message": "Dados buscados com sucesso",
+            "error": None,
+            "data": resolution,
+        }
+        return JSONResponse(
+            content=jsonable_encoder(response_data),
+            status_code=status.HTTP_200_OK,
+        )
+    except Exception as e:
+        return JSONResponse(
+            content=get_error_response(e),
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from fastapi import Request as HTTPRequest
+from fastapi import status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from utils.stream_utils import change_hub, stream_events
+
+router = APIRouter()
+
+
+@router.get("/chamado/stream", tags=["Chamado"])
+async def stream_chamado(request: HTTPRequest):
+    subscriber = change_hub.subscribe()
+    if subscriber is None:
+        response_data = {
+            "message": "Limite de conexoes atingido",
+            "error": True,
+            "data": None,
+        }
+        return JSONResponse(
+            content=response_data,
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    return StreamingResponse(
+        stream_events(request, subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,101 @@
+import asyncio
+import os
+from collections import deque
+
+ADMISSION_LIMITS = os.getenv(
+    "ADMISSION_LIMITS",
+    "admin=64:128,manager=64:128,basic=32:64,public=16:32",
+)
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+ADMISSION_EXEMPT_PATHS = frozenset(("/", "/metricas", "/chamado/stream"))
+
+
+class RoleLimiter:
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiters = deque()
+        self.admitted = 0
+        self.shed = 0
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.max_in_flight and not self.waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self.waiters) >= self.max_queue:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter), timeout=self.queue_timeout
+            )
+        except asyncio.TimeoutError:
+            if waiter.done():
+                self.release()
+            else:
+                waiter.cancel()
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+        self.admitted += 1
+        return True
+
+    def release(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self.waiters),
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+class AdmissionController:
+    def __init__(self, limits: str = ADMISSION_LIMITS):
+        self.limiters = {}
+        for limit in limits.split(","):
+            role, sizes = limit.strip().split("=")
+            max_in_flight, max_queue = sizes.split(":")
+            self.limiters[role] = RoleLimiter(
+                int(max_in_flight), int(max_queue)
+            )
+
+    def get_limiter(self, role: str) -> RoleLimiter:
+        return self.limiters.get(role, self.limiters["public"])
+
+    def stats(self) -> dict:
+        return {
+            role: limiter.stats() for role, limiter in self.limiters.items()
+        }
+
+
+admission = AdmissionController()
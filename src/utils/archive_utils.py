@@ -0,0 +1,132 @@
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, Table, insert, select, text, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.visitors import replacement_traverse
+
+from models import (ARCHIVE_TABLES, EnumStatus, Request, alert_date,
+                    alert_date_archive, has, has_archive, request_archive,
+                    request_document)
+from utils.search_utils import is_postgres, remove_from_search_index
+from utils.sync_utils import record_request_change
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+
+POSTGRES_PARTITION = (
+    "CREATE TABLE IF NOT EXISTS {table}_{year} PARTITION OF {table} "
+    "FOR VALUES FROM ('{year}-01-01') TO ('{next_year}-01-01')"
+)
+
+
+def replace_archived(element):
+    if isinstance(element, Table):
+        return ARCHIVE_TABLES.get(element.name)
+    if isinstance(element, Column):
+        table = getattr(element, "table", None)
+        if table is not None and table.name in ARCHIVE_TABLES:
+            return ARCHIVE_TABLES[table.name].c[element.name]
+    return None
+
+
+def to_archive(clause):
+    return replacement_traverse(clause, {}, replace_archived)
+
+
+def get_adapter(archived: bool):
+    if archived:
+        return to_archive
+    return lambda clause: clause
+
+
+def get_ticket_rows(*columns, conditions: list | None = None):
+    query = (
+        select(*columns)
+        .select_from(has)
+        .join(Request, Request.id == has.c.request_id)
+        .where(*(conditions or []))
+    )
+    return union_all(query, to_archive(query)).subquery()
+
+
+def ensure_archive_partitions(db: Session, years: set):
+    for year in sorted(years):
+        for table in (request_archive, has_archive):
+            db.execute(
+                text(
+                    POSTGRES_PARTITION.format(
+                        table=table.name, year=year, next_year=year + 1
+                    )
+                )
+            )
+
+
+def get_archivable_requests(db: Session, cutoff: datetime, limit: int):
+    problems = select(has.c.id).where(has.c.request_id == Request.id)
+    open_problems = problems.where(has.c.request_status != EnumStatus.solved)
+    return db.execute(
+        select(Request.id, Request.created_at)
+        .where(
+            Request.created_at < cutoff,
+            problems.exists(),
+            ~open_problems.exists(),
+        )
+        .order_by(Request.id)
+        .limit(limit)
+    ).all()
+
+
+def archive_requests(
+    db: Session,
+    days: int = ARCHIVE_AFTER_DAYS,
+    limit: int = ARCHIVE_BATCH_SIZE,
+) -> list:
+    rows = get_archivable_requests(
+        db, datetime.now() - timedelta(days=days), limit
+    )
+    if not rows:
+        return []
+    request_ids = [row.id for row in rows]
+    if is_postgres(db):
+        ensure_archive_partitions(db, {row.created_at.year for row in rows})
+
+    has_ids = select(has.c.id).where(has.c.request_id.in_(request_ids))
+    archived_has_ids = db.execute(has_ids).scalars().all()
+    db.execute(
+        insert(request_archive).from_select(
+            [column.name for column in Request.__table__.columns],
+            select(Request.__table__).where(Request.id.in_(request_ids)),
+        )
+    )
+    db.execute(
+        insert(has_archive).from_select(
+            [*(column.name for column in has.columns), "created_at"],
+            select(*has.columns, Request.created_at)
+            .join(Request, Request.id == has.c.request_id)
+            .where(has.c.request_id.in_(request_ids)),
+        )
+    )
+    db.execute(
+        insert(alert_date_archive).from_select(
+            ["has_id", "alert_date"],
+            select(alert_date.c.has_id, alert_date.c.alert_date).where(
+                alert_date.c.has_id.in_(has_ids)
+            ),
+        )
+    )
+
+    db.execute(alert_date.delete().where(alert_date.c.has_id.in_(has_ids)))
+    db.execute(has.delete().where(has.c.request_id.in_(request_ids)))
+    db.execute(
+        Request.__table__.delete().where(Request.id.in_(request_ids))
+    )
+    db.execute(
+        request_document.delete().where(
+            request_document.c.request_id.in_(request_ids)
+        )
+    )
+    remove_from_search_index(db, archived_has_ids)
+    record_request_change(db, *request_ids)
+    db.commit()
+    return request_ids
@@ -0,0 +1,151 @@
+from sqlalchemy import (Column, Table, bindparam, func, insert, or_, select,
+                        tuple_, update)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
+
+from models import has
+from utils.stats_utils import get_snapshot
+
+
+def get_item_condition(items: list):
+    has_ids = [item["id"] for item in items if item.get("id") is not None]
+    pairs = [
+        (item["request_id"], item["problem_id"])
+        for item in items
+        if item.get("id") is None
+    ]
+    conditions = []
+    if has_ids:
+        conditions.append(has.c.id.in_(has_ids))
+    if pairs:
+        conditions.append(
+            tuple_(has.c.request_id, has.c.problem_id).in_(pairs)
+        )
+    return or_(*conditions)
+
+
+def match_item(item: dict, row) -> bool:
+    if item.get("id") is not None:
+        return row.id == item["id"]
+    return (row.request_id, row.problem_id) == (
+        item["request_id"],
+        item["problem_id"],
+    )
+
+
+def update_status(db: Session, has_ids: list, request_status: str) -> set:
+    if not has_ids:
+        return set()
+    stmt = (
+        update(has)
+        .where(has.c.id.in_(has_ids), has.c.request_status != request_status)
+        .values(request_status=request_status)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.full_returning:
+        return {row.id for row in db.execute(stmt.returning(has.c.id))}
+    db.execute(stmt)
+    return set(has_ids)
+
+
+def transition_status(
+    db: Session, items: list, request_status: str
+) -> tuple[list, list, list]:
+    before = get_snapshot(db, get_item_condition(items))
+    updated_ids = update_status(
+        db,
+        [row.id for row in before if row.request_status != request_status],
+        request_status,
+    )
+    after = get_snapshot(db, has.c.id.in_(updated_ids)) if updated_ids else []
+
+    outcomes = []
+    for item in items:
+        matched = [row.id for row in before if match_item(item, row)]
+        if not matched:
+            outcome = "not_found"
+        elif updated_ids.intersection(matched):
+            outcome = "updated"
+        else:
+            outcome = "unchanged"
+        outcomes.append(
+            {**item, "has_ids": sorted(matched), "outcome": outcome}
+        )
+
+    changed = [row for row in before if row.id in updated_ids]
+    return changed, after, outcomes
+
+
+def find_missing(db: Session, column: Column, ids: set) -> list:
+    if not ids:
+        return []
+    existing = db.execute(select(column).where(column.in_(ids))).scalars()
+    return sorted(ids - set(existing))
+
+
+class insert_with_ids(Insert):
+    inherit_cache = True
+
+
+@compiles(insert_with_ids, "postgresql")
+def compile_insert_with_ids_postgresql(element, compiler, **kw):
+    return compiler.visit_insert(element, **kw).replace(
+        ") VALUES (", ") OVERRIDING SYSTEM VALUE VALUES (", 1
+    )
+
+
+def allocate_ids(db: Session, table: Table, total: int) -> list:
+    return sorted(
+        db.execute(
+            select(
+                func.nextval(func.pg_get_serial_sequence(table.name, "id"))
+            ).select_from(func.generate_series(1, total))
+        ).scalars()
+    )
+
+
+def insert_rows(db: Session, table: Table, rows: list) -> list:
+    if not rows:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        ids = allocate_ids(db, table, len(rows))
+        db.execute(
+            insert_with_ids(table),
+            [{**row, "id": row_id} for row, row_id in zip(rows, ids)],
+        )
+        return ids
+    return [
+        db.execute(insert(table).values(**row)).inserted_primary_key[0]
+        for row in rows
+    ]
+
+
+def update_rows(db: Session, table: Table, rows: list) -> list:
+    if not rows:
+        return []
+    columns = [key for key in rows[0] if key != "id"]
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values({key: bindparam(f"b_{key}") for key in columns})
+        .execution_options(synchronize_session=False),
+        [{f"b_{key}": value for key, value in row.items()} for row in rows],
+    )
+    return [row["id"] for row in rows]
+
+
+def save_rows(db: Session, table: Table, rows: list) -> tuple[list, list]:
+    created = insert_rows(
+        db,
+        table,
+        [
+            {key: value for key, value in row.items() if key != "id"}
+            for row in rows
+            if row.get("id") is None
+        ],
+    )
+    updated = update_rows(
+        db, table, [row for row in rows if row.get("id") is not None]
+    )
+    return created, updated
@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from time import monotonic
+
+TICKET_CACHE_SIZE = int(os.getenv("TICKET_CACHE_SIZE", "1000"))
+TICKET_CACHE_TTL = int(os.getenv("TICKET_CACHE_TTL", "60"))
+
+
+class CacheEntry:
+    __slots__ = ("document", "size", "expires_at", "problems", "categories")
+
+    def __init__(self, document: dict, ttl: int):
+        problems = document.get("problems") or []
+        self.document = document
+        self.size = len(json.dumps(document, default=str))
+        self.expires_at = monotonic() + ttl
+        self.problems = {problem.get("problem_id") for problem in problems}
+        self.categories = {problem.get("category_id") for problem in problems}
+
+
+class TicketCache:
+    def __init__(
+        self, max_entries: int = TICKET_CACHE_SIZE, ttl: int = TICKET_CACHE_TTL
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.by_problem = defaultdict(set)
+        self.by_category = defaultdict(set)
+        self.size = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, request_id: int) -> dict | None:
+        with self.lock:
+            entry = self.entries.get(request_id)
+            if entry is None or entry.expires_at < monotonic():
+                if entry is not None:
+                    self._remove(request_id)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(request_id)
+            self.hits += 1
+            return entry.document
+
+    def put(
+        self, request_id: int, document: dict, generation: int | None = None
+    ):
+        if self.max_entries <= 0:
+            return
+        entry = CacheEntry(document, self.ttl)
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._remove(request_id)
+            self.entries[request_id] = entry
+            self.size += entry.size
+            for problem_id in entry.problems:
+                self.by_problem[problem_id].add(request_id)
+            for category_id in entry.categories:
+                self.by_category[category_id].add(request_id)
+            while len(self.entries) > self.max_entries:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate(self, *request_ids: int):
+        with self.lock:
+            self.generation += 1
+            for request_id in request_ids:
+                self._remove(request_id)
+
+    def invalidate_problem(self, problem_id: int):
+        with self.lock:
+            self.generation += 1
+            for request_id in list(self.by_problem.get(problem_id, ())):
+                self._remove(request_id)
+
+    def invalidate_category(self, category_id: int):
+        with self.lock:
+            self.generation += 1
+            for request_id in list(self.by_category.get(category_id, ())):
+                self._remove(request_id)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            for request_id in list(self.entries):
+                self._remove(request_id)
+
+    def _remove(self, request_id: int):
+        entry = self.entries.pop(request_id, None)
+        if entry is None:
+            return
+        self.size -= entry.size
+        for problem_id in entry.problems:
+            self._discard(self.by_problem, problem_id, request_id)
+        for category_id in entry.categories:
+            self._discard(self.by_category, category_id, request_id)
+
+    @staticmethod
+    def _discard(index: dict, key: int, request_id: int):
+        request_ids = index.get(key)
+        if request_ids is not None:
+            request_ids.discard(request_id)
+            if not request_ids:
+                del index[key]
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+ticket_cache = TicketCache()
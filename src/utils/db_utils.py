@@ -0,0 +1,44 @@
+from collections import Counter
+
+from sqlalchemy import Table, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert_counter(
+    db: Session, table: Table, keys: dict, delta: int, column: str = "total"
+):
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = (
+            postgresql.insert if dialect == "postgresql" else sqlite.insert
+        )
+        stmt = insert(table).values(**keys, **{column: delta})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + stmt.excluded[column]},
+        )
+        db.execute(stmt)
+        return
+
+    conditions = [table.c[key] == value for key, value in keys.items()]
+    result = db.execute(
+        update(table)
+        .where(*conditions)
+        .values(**{column: table.c[column] + delta})
+    )
+    if not result.rowcount:
+        db.execute(table.insert().values(**keys, **{column: delta}))
+
+
+def apply_counter_diff(
+    db: Session,
+    table: Table,
+    key_names: tuple,
+    old_counts: Counter,
+    new_counts: Counter,
+):
+    for key in old_counts.keys() | new_counts.keys():
+        delta = new_counts[key] - old_counts[key]
+        if delta:
+            upsert_counter(db, table, dict(zip(key_names, key)), delta)
@@ -0,0 +1,205 @@
+from datetime import datetime
+
+from sqlalchemy import distinct, insert, select
+from sqlalchemy.orm import Session
+
+from models import (Category, Problem, Request, alert_date, has,
+                    request_document)
+from utils.archive_utils import get_adapter
+from utils.filter_utils import (EXPANDABLE, get_problem_columns,
+                                get_request_columns, project_document)
+from utils.mirror_utils import add_locality_data
+from utils.row_utils import select_dicts
+
+DOCUMENT_EXPAND = frozenset(("problem", "category", "alert_dates"))
+
+
+def expand_problems(
+    db: Session, problems: list, expand: set, archived: bool = False
+):
+    if "problem" in expand:
+        problem_ids = {problem["problem_id"] for problem in problems}
+        problem_data = {
+            problem["id"]: problem
+            for problem in select_dicts(
+                db,
+                select(Problem.__table__).where(Problem.id.in_(problem_ids)),
+            )
+        }
+    if "category" in expand:
+        category_ids = {problem["category_id"] for problem in problems}
+        category_data = {
+            category["id"]: category
+            for category in select_dicts(
+                db,
+                select(Category.__table__).where(
+                    Category.id.in_(category_ids)
+                ),
+            )
+        }
+    if "alert_dates" in expand:
+        adapt = get_adapter(archived)
+        alerts = {problem["id"]: [] for problem in problems}
+        for alert in select_dicts(
+            db,
+            select(adapt(alert_date)).where(
+                adapt(alert_date.c.has_id.in_(alerts))
+            ),
+        ):
+            alerts[alert["has_id"]].append(alert["alert_date"])
+
+    for problem in problems:
+        if "problem" in expand:
+            problem["problem"] = problem_data.get(problem["problem_id"])
+        if "category" in expand:
+            problem["category"] = category_data.get(problem["category_id"])
+        if "alert_dates" in expand:
+            problem["alert_dates"] = alerts[problem["id"]]
+    return problems
+
+
+def get_has_data(
+    final_list: list,
+    db: Session,
+    expand: set = EXPANDABLE,
+    fields: tuple | None = None,
+    archived: bool = False,
+):
+    adapt = get_adapter(archived)
+    problems = {request_dict["id"]: [] for request_dict in final_list}
+    for problem in select_dicts(
+        db,
+        select(*map(adapt, get_problem_columns(fields, expand)))
+        .where(adapt(has.c.request_id.in_(problems)))
+        .order_by(adapt(has.c.id)),
+    ):
+        problems[problem["request_id"]].append(problem)
+    expand_problems(
+        db,
+        [problem for lista in problems.values() for problem in lista],
+        expand,
+        archived,
+    )
+
+    for request_dict in final_list:
+        request_dict["problems"] = problems[request_dict["id"]]
+        if archived:
+            request_dict["archived"] = True
+    add_locality_data(db, final_list, expand)
+    return [
+        project_document(request_dict, fields) for request_dict in final_list
+    ]
+
+
+def refresh_request_documents(db: Session, request_ids):
+    request_ids = set(request_ids)
+    if not request_ids:
+        return
+    db.execute(
+        request_document.delete().where(
+            request_document.c.request_id.in_(request_ids)
+        )
+    )
+    query = select(Request.__table__).where(Request.id.in_(request_ids))
+    documents = get_has_data(select_dicts(db, query), db, DOCUMENT_EXPAND)
+    if documents:
+        updated_at = datetime.now()
+        db.execute(
+            insert(request_document),
+            [
+                {
+                    "request_id": document["id"],
+                    "document": document,
+                    "updated_at": updated_at,
+                }
+                for document in documents
+            ],
+        )
+
+
+def refresh_catalog_documents(db: Session, column, *values: int):
+    if not values:
+        return
+    db.flush()
+    refresh_request_documents(
+        db,
+        db.execute(
+            select(distinct(has.c.request_id)).where(column.in_(values))
+        )
+        .scalars()
+        .all(),
+    )
+
+
+def rebuild_request_documents(db: Session, batch_size: int = 500):
+    db.execute(request_document.delete())
+    request_ids = db.execute(select(Request.id).order_by(Request.id)).scalars()
+    batch = []
+    for request_id in request_ids.all():
+        batch.append(request_id)
+        if len(batch) == batch_size:
+            refresh_request_documents(db, batch)
+            batch = []
+    refresh_request_documents(db, batch)
+    db.commit()
+
+
+def prune_document(document: dict, expand: set) -> dict:
+    hidden = DOCUMENT_EXPAND - expand
+    return {
+        **document,
+        "problems": [
+            {key: value for key, value in problem.items() if key not in hidden}
+            for problem in document["problems"]
+        ],
+    }
+
+
+def get_request_documents(
+    db: Session,
+    request_ids: list | None = None,
+    expand: set = EXPANDABLE,
+    fields: tuple | None = None,
+) -> list:
+    if fields is not None:
+        query = select(*get_request_columns(fields, expand)).order_by(
+            Request.id
+        )
+        if request_ids is not None:
+            query = query.where(Request.id.in_(request_ids))
+        return get_has_data(select_dicts(db, query), db, expand, fields)
+
+    query = (
+        select(Request.id, request_document.c.document)
+        .outerjoin(
+            request_document, request_document.c.request_id == Request.id
+        )
+        .order_by(Request.id)
+    )
+    if request_ids is not None:
+        query = query.where(Request.id.in_(request_ids))
+    rows = db.execute(query).all()
+
+    missing = [row.id for row in rows if row.document is None]
+    assembled = {}
+    if missing:
+        assembled = {
+            document["id"]: document
+            for document in get_has_data(
+                select_dicts(
+                    db,
+                    select(Request.__table__).where(Request.id.in_(missing)),
+                ),
+                db,
+                DOCUMENT_EXPAND,
+            )
+        }
+
+    documents = [
+        prune_document(
+            row.document if row.document is not None else assembled[row.id],
+            expand,
+        )
+        for row in rows
+    ]
+    return add_locality_data(db, documents, expand)
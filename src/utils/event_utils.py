@@ -0,0 +1,252 @@
+import asyncio
+import calendar
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, time, timedelta
+from math import inf
+from time import monotonic
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal, is_replica
+from models import Request, alert_date, has
+from utils.row_utils import select_dicts, select_records
+
+EVENT_DIGEST_DAYS = int(os.getenv("EVENT_DIGEST_DAYS", "30"))
+EVENT_DIGEST_TTL = int(os.getenv("EVENT_DIGEST_TTL", "300"))
+EVENT_CALENDAR_TTL = int(os.getenv("EVENT_CALENDAR_TTL", "300"))
+
+
+def get_event_list(db: Session, query: list) -> list:
+    requests = {
+        request["id"]: request
+        for request in select_dicts(
+            db,
+            select(Request.__table__).where(
+                Request.id.in_({event.request_id for event in query})
+            ),
+        )
+    }
+
+    final_list = []
+    for event in query:
+        request_dict = dict(requests[event.request_id])
+        request_dict["problems"] = event.as_dict()
+        final_list.append(request_dict)
+    return final_list
+
+
+def get_event_rows(db: Session, has_ids: list) -> list:
+    rows = {
+        row.id: row
+        for row in select_records(db, select(has).where(has.c.id.in_(has_ids)))
+    }
+    return [rows[has_id] for has_id in has_ids if has_id in rows]
+
+
+def build_from_primary(index, db: Session):
+    if not is_replica(db):
+        index.build(db)
+        return
+    with SessionLocal() as primary:
+        index.build(primary)
+
+
+class EventDigest:
+    def __init__(
+        self, days: int = EVENT_DIGEST_DAYS, ttl: int = EVENT_DIGEST_TTL
+    ):
+        self.days = days
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.day = None
+        self.built_at = 0.0
+        self.alerts = []
+        self.events = []
+        self.event_dates = []
+        self.has_ids = set()
+
+    def is_stale(self) -> bool:
+        return (
+            self.day != date.today()
+            or monotonic() - self.built_at > self.ttl
+        )
+
+    def build(self, db: Session):
+        today = date.today()
+        start = datetime.combine(today, time.min)
+        end = start + timedelta(days=self.days + 1)
+
+        alerts = select_records(
+            db,
+            select(has)
+            .join(alert_date)
+            .where(alert_date.c.alert_date == today)
+            .order_by(has.c.id),
+        )
+        events = select_records(
+            db,
+            select(has)
+            .where(
+                has.c.is_event,
+                has.c.event_date >= start,
+                has.c.event_date < end,
+            )
+            .order_by(has.c.event_date, has.c.id),
+        )
+
+        with self.lock:
+            self.day = today
+            self.built_at = monotonic()
+            self.alerts = get_event_list(db, alerts)
+            self.events = get_event_list(db, events)
+            self.event_dates = [event.event_date for event in events]
+            self.has_ids = {event.id for event in alerts + events}
+
+    def invalidate(self):
+        with self.lock:
+            self.built_at = 0.0
+
+    def invalidate_if_affected(self, snapshot: list, alert_dates: list):
+        today = date.today()
+        end = datetime.combine(today, time.min) + timedelta(
+            days=self.days + 1
+        )
+        for row in snapshot:
+            if row.id in self.has_ids or (
+                row.is_event
+                and row.event_date
+                and today <= row.event_date.date()
+                and row.event_date < end
+            ):
+                self.invalidate()
+                return
+        if today.isoformat() in {str(alert)[:10] for alert in alert_dates}:
+            self.invalidate()
+
+    def get_alerts(self, db: Session) -> list:
+        if self.is_stale():
+            build_from_primary(self, db)
+        return self.alerts
+
+    def get_events(self, db: Session, days_to_event: int) -> list | None:
+        if days_to_event > self.days:
+            return None
+        if self.is_stale():
+            build_from_primary(self, db)
+
+        now = datetime.now()
+        with self.lock:
+            first = bisect_left(self.event_dates, now)
+            last = bisect_right(
+                self.event_dates, now + timedelta(days=days_to_event)
+            )
+            return self.events[first:last]
+
+
+event_digest = EventDigest()
+
+
+class EventCalendar:
+    def __init__(self, ttl: int = EVENT_CALENDAR_TTL):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.built_at = None
+        self.keys = []
+        self.event_dates = {}
+
+    def is_stale(self) -> bool:
+        return self.built_at is None or monotonic() - self.built_at > self.ttl
+
+    def build(self, db: Session):
+        keys = [
+            tuple(row)
+            for row in db.execute(
+                select(has.c.event_date, has.c.id)
+                .where(has.c.is_event, has.c.event_date.is_not(None))
+                .order_by(has.c.event_date, has.c.id)
+            )
+        ]
+        with self.lock:
+            self.keys = keys
+            self.event_dates = {
+                has_id: event_date for event_date, has_id in keys
+            }
+            self.built_at = monotonic()
+
+    def remove(self, has_id: int):
+        event_date = self.event_dates.pop(has_id, None)
+        if event_date is not None:
+            del self.keys[bisect_left(self.keys, (event_date, has_id))]
+
+    def apply_changes(self, before: list, after: list):
+        with self.lock:
+            if self.built_at is None:
+                return
+            for row in before + after:
+                self.remove(row.id)
+            for row in after:
+                if row.is_event and row.event_date:
+                    insort(self.keys, (row.event_date, row.id))
+                    self.event_dates[row.id] = row.event_date
+
+    def get_window(self, db: Session, start: datetime, end: datetime) -> list:
+        if self.is_stale():
+            build_from_primary(self, db)
+        with self.lock:
+            first = bisect_left(self.keys, (start,))
+            last = bisect_right(self.keys, (end, inf))
+            return [has_id for _, has_id in self.keys[first:last]]
+
+    def get_next(self, db: Session, start: datetime, limit: int) -> list:
+        if self.is_stale():
+            build_from_primary(self, db)
+        with self.lock:
+            first = bisect_left(self.keys, (start,))
+            return [has_id for _, has_id in self.keys[first:first + limit]]
+
+    def count_by_day(self, db: Session, year: int, month: int) -> list:
+        if self.is_stale():
+            build_from_primary(self, db)
+        days = calendar.monthrange(year, month)[1]
+        first_day = date(year, month, 1)
+        bounds = [
+            datetime.combine(first_day + timedelta(days=day), time.min)
+            for day in range(days + 1)
+        ]
+        with self.lock:
+            positions = [bisect_left(self.keys, (bound,)) for bound in bounds]
+        return [
+            {"day": bound.date(), "total": end - start}
+            for bound, start, end in zip(bounds, positions, positions[1:])
+        ]
+
+    def stats(self) -> dict:
+        return {"events": len(self.keys), "built": self.built_at is not None}
+
+
+event_calendar = EventCalendar()
+
+
+def rebuild_event_digest():
+    with SessionLocal() as db:
+        event_digest.build(db)
+
+
+def rebuild_event_calendar():
+    with SessionLocal() as db:
+        event_calendar.build(db)
+
+
+async def run_event_digest_scheduler():
+    while True:
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        await asyncio.sleep((midnight - now).total_seconds())
+        try:
+            await run_in_threadpool(rebuild_event_digest)
+        except Exception:
+            event_digest.invalidate()
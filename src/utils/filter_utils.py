@@ -0,0 +1,247 @@
+import operator
+
+from sqlalchemy import case, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from models import EnumPriority, Request, city_mirror, has, workstation_mirror
+from utils.archive_utils import get_adapter
+
+
+def match_mirror(table, key: str):
+    def compare(column, value):
+        return column.in_(select(table.c.id).where(table.c[key] == value))
+
+    return compare
+
+
+def get_mirror_name(table, column):
+    return select(table.c.name).where(table.c.id == column).scalar_subquery()
+
+
+REQUEST_FILTERS = {
+    "id": (Request.id, operator.eq),
+    "problem_id": (has.c.problem_id, operator.eq),
+    "category_id": (has.c.category_id, operator.eq),
+    "is_event": (has.c.is_event, operator.eq),
+    "request_status": (has.c.request_status, operator.eq),
+    "priority": (has.c.priority, operator.eq),
+    "city_id": (Request.city_id, operator.eq),
+    "workstation_id": (Request.workstation_id, operator.eq),
+    "city_name": (Request.city_id, match_mirror(city_mirror, "name")),
+    "workstation_name": (
+        Request.workstation_id,
+        match_mirror(workstation_mirror, "name"),
+    ),
+    "workstation_city_id": (
+        Request.workstation_id,
+        match_mirror(workstation_mirror, "city_id"),
+    ),
+    "attendant_name": (Request.attendant_name, operator.eq),
+    "created_after": (Request.created_at, operator.ge),
+    "created_before": (Request.created_at, operator.le),
+}
+
+REQUEST_SORTS = {
+    "id": Request.id,
+    "created_at": Request.created_at,
+    "event_date": has.c.event_date,
+    "city_name": get_mirror_name(city_mirror, Request.city_id),
+    "workstation_name": get_mirror_name(
+        workstation_mirror, Request.workstation_id
+    ),
+    "priority": case(
+        {priority: order for order, priority in enumerate(EnumPriority)},
+        value=has.c.priority,
+    ),
+}
+
+EXPANDABLE = frozenset(
+    ("problem", "category", "alert_dates", "city", "workstation")
+)
+
+REQUEST_FIELDS = {column.name: column for column in Request.__table__.columns}
+PROBLEM_FIELDS = {column.name: column for column in has.columns}
+DOCUMENT_KEYS = EXPANDABLE | {"problems", "partial", "archived"}
+
+
+class InvalidFilterError(ValueError):
+    pass
+
+
+def get_expand(expand: list | None, default: frozenset = EXPANDABLE) -> set:
+    if expand is None:
+        return default
+    keys = {key.strip() for value in expand for key in value.split(",")}
+    keys.discard("")
+    invalid = keys - EXPANDABLE
+    if invalid:
+        raise InvalidFilterError(
+            f"Expansao invalida: {', '.join(sorted(invalid))}"
+        )
+    return keys
+
+
+def get_fields(fields: list | None) -> tuple | None:
+    if fields is None:
+        return None
+    keys = {key.strip() for value in fields for key in value.split(",")}
+    keys.discard("")
+    request_fields = {key for key in keys if not key.startswith("problems.")}
+    problem_fields = {
+        key.removeprefix("problems.")
+        for key in keys
+        if key.startswith("problems.")
+    }
+    invalid = sorted(
+        [key for key in request_fields if key not in REQUEST_FIELDS]
+        + [
+            f"problems.{key}"
+            for key in problem_fields
+            if key not in PROBLEM_FIELDS
+        ]
+    )
+    if invalid:
+        raise InvalidFilterError(f"Campo invalido: {', '.join(invalid)}")
+    return request_fields | {"id"}, problem_fields | {"id"}
+
+
+def get_request_columns(fields: tuple | None, expand: set) -> list:
+    if fields is None:
+        return list(REQUEST_FIELDS.values())
+    names = set(fields[0])
+    if "city" in expand:
+        names.add("city_id")
+    if "workstation" in expand:
+        names.add("workstation_id")
+    return [
+        column for name, column in REQUEST_FIELDS.items() if name in names
+    ]
+
+
+def get_problem_columns(fields: tuple | None, expand: set) -> list:
+    if fields is None:
+        return list(PROBLEM_FIELDS.values())
+    names = fields[1] | {"request_id"}
+    if "problem" in expand:
+        names.add("problem_id")
+    if "category" in expand:
+        names.add("category_id")
+    return [
+        column for name, column in PROBLEM_FIELDS.items() if name in names
+    ]
+
+
+def project_document(document: dict, fields: tuple | None) -> dict:
+    if fields is None:
+        return document
+    request_fields, problem_fields = fields
+    document = {
+        key: value
+        for key, value in document.items()
+        if key in request_fields or key in DOCUMENT_KEYS
+    }
+    if "problems" in document:
+        document["problems"] = [
+            {
+                key: value
+                for key, value in problem.items()
+                if key in problem_fields or key in DOCUMENT_KEYS
+            }
+            for problem in document["problems"]
+        ]
+    return document
+
+
+def get_sort_keys(sort: list) -> list:
+    keys = []
+    for key in sort:
+        column = REQUEST_SORTS.get(key.lstrip("-"))
+        if column is None:
+            raise InvalidFilterError(f"Ordenacao invalida: {key}")
+        keys.append((column, key.startswith("-")))
+    return keys
+
+
+def get_sort_clauses(sort: list) -> list:
+    return [
+        column.desc() if descending else column.asc()
+        for column, descending in get_sort_keys(sort)
+    ]
+
+
+def filter_request_query(
+    db: Session,
+    filters: dict,
+    columns: list | None = None,
+    archived: bool = False,
+):
+    adapt = get_adapter(archived)
+    query = db.query(*map(adapt, columns or has.columns)).join(
+        adapt(Request.__table__), adapt(Request.id == has.c.request_id)
+    )
+    for key, value in filters.items():
+        if key not in REQUEST_FILTERS:
+            raise InvalidFilterError(f"Filtro invalido: {key}")
+        column, compare = REQUEST_FILTERS[key]
+        query = query.filter(adapt(compare(column, value)))
+    return query
+
+
+def compile_request_query(
+    db: Session,
+    filters: dict,
+    sort: list | None = None,
+    limit: int | None = None,
+    offset: int | None = None,
+    columns: list | None = None,
+    archived: bool = False,
+):
+    adapt = get_adapter(archived)
+    query = filter_request_query(db, filters, columns, archived).order_by(
+        *map(adapt, get_sort_clauses(sort or [])), adapt(has.c.id)
+    )
+    if offset:
+        query = query.offset(offset)
+    if limit:
+        query = query.limit(limit)
+    return query
+
+
+def compile_combined_request_query(
+    db: Session,
+    filters: dict,
+    sort: list | None = None,
+    limit: int | None = None,
+    offset: int | None = None,
+    columns: list | None = None,
+):
+    sort_keys = get_sort_keys(sort or [])
+    sources = []
+    for archived in (False, True):
+        adapt = get_adapter(archived)
+        sources.append(
+            filter_request_query(db, filters, columns, archived)
+            .add_columns(
+                *(
+                    adapt(column.label(f"sort_{index}"))
+                    for index, (column, _) in enumerate(sort_keys)
+                ),
+                literal(archived).label("archived"),
+            )
+            .statement
+        )
+    rows = union_all(*sources).subquery()
+    query = select(rows).order_by(
+        *(
+            rows.c[f"sort_{index}"].desc()
+            if descending
+            else rows.c[f"sort_{index}"].asc()
+            for index, (_, descending) in enumerate(sort_keys)
+        ),
+        rows.c.id,
+    )
+    if offset:
+        query = query.offset(offset)
+    if limit:
+        query = query.limit(limit)
+    return query
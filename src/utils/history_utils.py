@@ -0,0 +1,217 @@
+from datetime import date, datetime, time, timedelta
+from itertools import groupby
+
+from sqlalchemy import Float, func, insert, or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import FunctionElement
+
+from models import EnumStatus, status_history
+
+HISTORY_KEYS = ("priority", "category_id", "city_id")
+DEFAULT_PERCENTILES = (50, 90, 99)
+PERCENTILE_SCALE = 1000
+
+
+class seconds_between(FunctionElement):
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(seconds_between)
+def compile_seconds_between(element, compiler, **kw):
+    start, end = element.clauses
+    return "(julianday(%s) - julianday(%s)) * 86400.0" % (
+        compiler.process(end, **kw),
+        compiler.process(start, **kw),
+    )
+
+
+@compiles(seconds_between, "postgresql")
+def compile_seconds_between_postgresql(element, compiler, **kw):
+    start, end = element.clauses
+    return "EXTRACT(EPOCH FROM %s - %s)" % (
+        compiler.process(end, **kw),
+        compiler.process(start, **kw),
+    )
+
+
+def get_opened_at(db: Session, rows: list) -> dict:
+    opened_at = {row.id: row.created_at for row in rows if row.created_at}
+    missing = [row.id for row in rows if not row.created_at]
+    if missing:
+        opened_at.update(
+            db.execute(
+                select(
+                    status_history.c.has_id,
+                    func.min(status_history.c.created_at),
+                )
+                .where(status_history.c.has_id.in_(missing))
+                .group_by(status_history.c.has_id)
+            ).all()
+        )
+    return opened_at
+
+
+def record_status_changes(db: Session, before: list, after: list):
+    previous = {row.id: row.request_status for row in before}
+    changed = [
+        row for row in after if previous.get(row.id) != row.request_status
+    ]
+    opened_at = get_opened_at(db, changed)
+    opened, moved = [], []
+    for row in changed:
+        if row.id not in opened_at:
+            continue
+        history_row = {
+            "has_id": row.id,
+            "request_id": row.request_id,
+            "from_status": previous.get(row.id),
+            "to_status": row.request_status,
+            "priority": row.priority,
+            "category_id": row.category_id,
+            "city_id": row.city_id,
+            "created_at": opened_at[row.id],
+        }
+        if row.id in previous:
+            moved.append(history_row)
+        else:
+            opened.append({**history_row, "changed_at": opened_at[row.id]})
+    if opened:
+        db.execute(insert(status_history), opened)
+    if moved:
+        db.execute(
+            insert(status_history).values(
+                changed_at=func.current_timestamp()
+            ),
+            moved,
+        )
+
+
+def get_ranked_durations(
+    group_by: list,
+    request_status: EnumStatus | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+):
+    history = status_history.c
+    log = select(
+        *(history[key] for key in group_by),
+        history.to_status,
+        history.created_at,
+        history.changed_at,
+        func.lead(history.changed_at)
+        .over(
+            partition_by=history.has_id,
+            order_by=(history.changed_at, history.id),
+        )
+        .label("left_at"),
+        func.row_number()
+        .over(
+            partition_by=(history.has_id, history.to_status),
+            order_by=(history.changed_at, history.id),
+        )
+        .label("visit"),
+    ).subquery()
+
+    if request_status is None:
+        duration = seconds_between(log.c.created_at, log.c.changed_at)
+        conditions = [
+            log.c.to_status == EnumStatus.solved,
+            log.c.visit == 1,
+        ]
+        event_at = log.c.changed_at
+    else:
+        duration = seconds_between(log.c.changed_at, log.c.left_at)
+        conditions = [
+            log.c.to_status == request_status,
+            log.c.left_at.is_not(None),
+        ]
+        event_at = log.c.left_at
+    if start_date:
+        conditions.append(event_at >= datetime.combine(start_date, time.min))
+    if end_date:
+        conditions.append(
+            event_at < datetime.combine(end_date + timedelta(days=1), time.min)
+        )
+
+    keys = [log.c[key] for key in group_by]
+    partition = keys or None
+    position = func.row_number().over(
+        partition_by=partition, order_by=duration
+    )
+    return (
+        select(
+            *keys,
+            duration.label("duration"),
+            (position - 1).label("position"),
+            func.count().over(partition_by=partition).label("total"),
+            func.avg(duration).over(partition_by=partition).label("mean"),
+        )
+        .where(*conditions)
+        .subquery()
+    )
+
+
+def get_lower_position(total, percentile: float):
+    return (total - 1) * round(percentile * PERCENTILE_SCALE) / (
+        100 * PERCENTILE_SCALE
+    )
+
+
+def get_percentile(values: dict, total: int, percentile: float) -> float:
+    scaled = (total - 1) * round(percentile * PERCENTILE_SCALE)
+    lower, remainder = divmod(scaled, 100 * PERCENTILE_SCALE)
+    upper = values.get(lower + 1, values[lower])
+    return values[lower] + (upper - values[lower]) * remainder / (
+        100 * PERCENTILE_SCALE
+    )
+
+
+def get_status_percentiles(
+    db: Session,
+    group_by: list,
+    percentiles: list,
+    request_status: EnumStatus | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> list:
+    ranked = get_ranked_durations(
+        group_by, request_status, start_date, end_date
+    )
+    keys = [ranked.c[key] for key in group_by]
+    rows = db.execute(
+        select(ranked)
+        .where(
+            or_(
+                *(
+                    ranked.c.position.between(
+                        get_lower_position(ranked.c.total, percentile),
+                        get_lower_position(ranked.c.total, percentile) + 1,
+                    )
+                    for percentile in percentiles
+                )
+            )
+        )
+        .order_by(*keys, ranked.c.position)
+    ).all()
+
+    result = []
+    for key, group in groupby(rows, lambda row: tuple(row[: len(keys)])):
+        group = list(group)
+        total = group[0].total
+        values = {row.position: row.duration for row in group}
+        result.append(
+            {
+                **dict(zip(group_by, key)),
+                "total": total,
+                "mean": round(group[0].mean, 3),
+                "percentiles": {
+                    f"p{percentile:g}": round(
+                        get_percentile(values, total, percentile), 3
+                    )
+                    for percentile in percentiles
+                },
+            }
+        )
+    return result
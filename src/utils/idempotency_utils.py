@@ -0,0 +1,79 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from models import idempotency_key
+
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+
+
+class IdempotencyConflictError(ValueError):
+    pass
+
+
+def get_request_hash(payload: dict) -> str:
+    document = json.dumps(jsonable_encoder(payload), sort_keys=True)
+    return hashlib.sha256(document.encode()).hexdigest()
+
+
+def get_expiration() -> datetime:
+    return datetime.now() - timedelta(seconds=IDEMPOTENCY_TTL)
+
+
+def get_stored_response(db: Session, key: str, request_hash: str):
+    stored = db.execute(
+        select(idempotency_key).where(idempotency_key.c.key == key)
+    ).first()
+    if stored is None:
+        return None
+    if stored.created_at < get_expiration():
+        db.execute(
+            idempotency_key.delete().where(idempotency_key.c.key == key)
+        )
+        return None
+    if stored.request_hash != request_hash:
+        raise IdempotencyConflictError(
+            "Idempotency-Key reutilizada com outra requisicao"
+        )
+    return stored
+
+
+def store_response(
+    db: Session,
+    key: str,
+    request_hash: str,
+    status_code: int,
+    response: dict,
+):
+    db.execute(
+        insert(idempotency_key).values(
+            key=key,
+            request_hash=request_hash,
+            status_code=status_code,
+            response=response,
+            created_at=datetime.now(),
+        )
+    )
+
+
+def replay_response(stored) -> JSONResponse:
+    return JSONResponse(
+        content=stored.response,
+        status_code=stored.status_code,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def purge_idempotency_keys(db: Session):
+    db.execute(
+        idempotency_key.delete().where(
+            idempotency_key.c.created_at < get_expiration()
+        )
+    )
+    db.commit()
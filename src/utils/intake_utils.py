@@ -0,0 +1,91 @@
+import asyncio
+import os
+
+from starlette.concurrency import run_in_threadpool
+
+INTAKE_BATCH_SIZE = int(os.getenv("INTAKE_BATCH_SIZE", "0"))
+INTAKE_BATCH_WAIT = float(os.getenv("INTAKE_BATCH_WAIT", "0.005"))
+INTAKE_QUEUE_SIZE = int(os.getenv("INTAKE_QUEUE_SIZE", "1000"))
+
+
+class IntakeQueue:
+    def __init__(
+        self,
+        batch_size: int = INTAKE_BATCH_SIZE,
+        batch_wait: float = INTAKE_BATCH_WAIT,
+        queue_size: int = INTAKE_QUEUE_SIZE,
+    ):
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.queue_size = queue_size
+        self.queue = None
+        self.batches = 0
+        self.items = 0
+
+    def is_running(self) -> bool:
+        return self.queue is not None
+
+    async def submit(self, item):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def next_batch(self, queue: asyncio.Queue) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await queue.get()]
+        deadline = loop.time() + self.batch_wait
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(queue.get(), timeout)
+                )
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def run(self, write_batch):
+        queue = self.queue = asyncio.Queue(self.queue_size)
+        running = True
+        while running:
+            batch = await self.next_batch(queue)
+            if batch[-1] is None:
+                batch.pop()
+                running = False
+            if not batch:
+                continue
+
+            try:
+                results = await run_in_threadpool(
+                    write_batch, [item for item, _ in batch]
+                )
+            except Exception as e:
+                results = [e] * len(batch)
+            self.batches += 1
+            self.items += len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def close(self):
+        queue, self.queue = self.queue, None
+        if queue is not None:
+            await queue.put(None)
+
+    def stats(self) -> dict:
+        return {
+            "running": self.is_running(),
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "batches": self.batches,
+            "items": self.items,
+        }
+
+
+intake_queue = IntakeQueue()
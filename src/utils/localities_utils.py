@@ -0,0 +1,126 @@
+import os
+import threading
+from time import monotonic
+
+import requests as r
+
+GERENCIADOR_DE_LOCALIDADES_URL = os.getenv("GERENCIADOR_DE_LOCALIDADES_URL")
+LOCALITIES_CONNECT_TIMEOUT = float(
+    os.getenv("LOCALITIES_CONNECT_TIMEOUT", "0.5")
+)
+LOCALITIES_TIMEOUT = float(os.getenv("LOCALITIES_TIMEOUT", "2"))
+LOCALITIES_BUDGET = float(os.getenv("LOCALITIES_BUDGET", "5"))
+LOCALITIES_FAILURE_THRESHOLD = int(
+    os.getenv("LOCALITIES_FAILURE_THRESHOLD", "5")
+)
+LOCALITIES_RESET_TIMEOUT = float(os.getenv("LOCALITIES_RESET_TIMEOUT", "30"))
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = LOCALITIES_FAILURE_THRESHOLD,
+        reset_timeout: float = LOCALITIES_RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if (
+                self.opened_at is not None
+                or self.failures >= self.failure_threshold
+            ):
+                self.opened_at = monotonic()
+
+
+class LatencyBudget:
+    def __init__(self, seconds: float = LOCALITIES_BUDGET):
+        self.deadline = monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.deadline - monotonic()
+
+
+localities_breaker = CircuitBreaker()
+
+
+def get_locality(path: str, budget: LatencyBudget) -> tuple[bool, dict | None]:
+    if not GERENCIADOR_DE_LOCALIDADES_URL:
+        return False, None
+    remaining = budget.remaining()
+    if remaining <= 0 or not localities_breaker.allow():
+        return False, None
+
+    try:
+        response = r.get(
+            GERENCIADOR_DE_LOCALIDADES_URL + path,
+            timeout=(
+                min(LOCALITIES_CONNECT_TIMEOUT, remaining),
+                min(LOCALITIES_TIMEOUT, remaining),
+            ),
+        )
+    except r.RequestException:
+        localities_breaker.record_failure()
+        return False, None
+
+    if response.status_code >= 500:
+        localities_breaker.record_failure()
+        return False, None
+
+    localities_breaker.record_success()
+    if response.status_code == 200:
+        return True, response.json()["data"]
+    return True, None
+
+
+def add_localities(
+    request_dict: dict,
+    budget: LatencyBudget,
+    expand: set = frozenset(("city", "workstation")),
+) -> dict:
+    complete = True
+    for key, path in (
+        ("city", "/city?city_id={city_id}"),
+        ("workstation", "/workstation?id={workstation_id}"),
+    ):
+        if key not in expand:
+            continue
+        ok, data = get_locality(path.format(**request_dict), budget)
+        if ok and data is not None:
+            request_dict[key] = data
+        complete = complete and ok
+
+    if not complete:
+        request_dict["partial"] = True
+    return request_dict
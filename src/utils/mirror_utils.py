@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+import requests as r
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from database import SessionLocal
+from models import city_mirror, locality_sync, workstation_mirror
+from utils.bulk_utils import update_rows
+from utils.localities_utils import (GERENCIADOR_DE_LOCALIDADES_URL,
+                                    LOCALITIES_CONNECT_TIMEOUT, LatencyBudget,
+                                    add_localities)
+
+LOCALITIES_MIRROR = os.getenv("LOCALITIES_MIRROR", "false").lower() == "true"
+LOCALITIES_SYNC_INTERVAL = float(os.getenv("LOCALITIES_SYNC_INTERVAL", "0"))
+LOCALITIES_SYNC_TIMEOUT = float(os.getenv("LOCALITIES_SYNC_TIMEOUT", "30"))
+LOCALITIES_MAX_AGE = float(os.getenv("LOCALITIES_MAX_AGE", "86400"))
+
+NEVER_SYNCED = datetime(1970, 1, 1)
+
+logger = logging.getLogger(__name__)
+
+MIRROR_CATALOGS = {
+    "city": (city_mirror, "/city", "city_id", ("name",)),
+    "workstation": (
+        workstation_mirror,
+        "/workstation",
+        "workstation_id",
+        ("name", "city_id"),
+    ),
+}
+
+
+class SyncError(Exception):
+    pass
+
+
+def fetch_catalog(path: str) -> list:
+    if not GERENCIADOR_DE_LOCALIDADES_URL:
+        raise SyncError("GERENCIADOR_DE_LOCALIDADES_URL nao configurada")
+    try:
+        response = r.get(
+            GERENCIADOR_DE_LOCALIDADES_URL + path,
+            timeout=(LOCALITIES_CONNECT_TIMEOUT, LOCALITIES_SYNC_TIMEOUT),
+        )
+    except r.RequestException as e:
+        raise SyncError(str(e)) from e
+    if response.status_code != 200:
+        raise SyncError(f"Resposta inesperada: {response.status_code}")
+    try:
+        items = response.json()["data"]
+    except (KeyError, ValueError) as e:
+        raise SyncError("Catalogo invalido") from e
+    if not isinstance(items, list):
+        raise SyncError("Catalogo invalido")
+    return items
+
+
+def ensure_sync_rows(db: Session):
+    existing = set(db.execute(select(locality_sync.c.catalog)).scalars())
+    for catalog in MIRROR_CATALOGS.keys() - existing:
+        try:
+            db.execute(
+                insert(locality_sync).values(
+                    catalog=catalog, total=0, attempted_at=NEVER_SYNCED
+                )
+            )
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+
+
+def claim_catalog(db: Session, catalog: str, min_interval: float) -> bool:
+    attempted_at = datetime.now()
+    result = db.execute(
+        update(locality_sync)
+        .where(
+            locality_sync.c.catalog == catalog,
+            locality_sync.c.attempted_at
+            <= attempted_at - timedelta(seconds=min_interval),
+        )
+        .values(attempted_at=attempted_at)
+    )
+    db.commit()
+    return bool(result.rowcount)
+
+
+def record_sync(
+    db: Session,
+    catalog: str,
+    attempted_at: datetime,
+    total: int | None = None,
+    error: str | None = None,
+):
+    values = {"attempted_at": attempted_at, "error": error}
+    if error is None:
+        values.update(total=total, synced_at=attempted_at)
+    db.execute(
+        update(locality_sync)
+        .where(locality_sync.c.catalog == catalog)
+        .values(values)
+    )
+
+
+def sync_catalog(db: Session, catalog: str) -> dict:
+    table, path, _, keys = MIRROR_CATALOGS[catalog]
+    attempted_at = datetime.now()
+    try:
+        items = fetch_catalog(path)
+    except SyncError as e:
+        record_sync(db, catalog, attempted_at, error=str(e))
+        db.commit()
+        return {"catalog": catalog, "error": str(e)}
+
+    rows = {
+        item["id"]: {
+            "id": item["id"],
+            **{key: item.get(key) for key in keys},
+            "data": item,
+            "updated_at": attempted_at,
+        }
+        for item in items
+    }
+    record_sync(db, catalog, attempted_at, total=len(rows))
+    current = dict(db.execute(select(table.c.id, table.c.data)).all())
+    created = [row for key, row in rows.items() if key not in current]
+    changed = [
+        row
+        for key, row in rows.items()
+        if key in current and current[key] != row["data"]
+    ]
+    removed = current.keys() - rows.keys()
+
+    if created:
+        db.execute(insert(table), created)
+    update_rows(db, table, changed)
+    if removed:
+        db.execute(delete(table).where(table.c.id.in_(removed)))
+    db.commit()
+    return {
+        "catalog": catalog,
+        "error": None,
+        "created": len(created),
+        "updated": len(changed),
+        "removed": len(removed),
+    }
+
+
+def sync_localities(db: Session, min_interval: float = 0) -> list:
+    ensure_sync_rows(db)
+    return [
+        sync_catalog(db, catalog)
+        if claim_catalog(db, catalog, min_interval)
+        else {"catalog": catalog, "error": None, "skipped": True}
+        for catalog in MIRROR_CATALOGS
+    ]
+
+
+def get_mirror_status(db: Session) -> dict:
+    now = datetime.now()
+    rows = {row.catalog: row for row in db.execute(select(locality_sync))}
+    status = {}
+    for catalog in MIRROR_CATALOGS:
+        row = rows.get(catalog)
+        synced_at = row.synced_at if row else None
+        attempted_at = row.attempted_at if row else None
+        age = (now - synced_at).total_seconds() if synced_at else None
+        status[catalog] = {
+            "total": row.total if row else 0,
+            "synced_at": synced_at,
+            "attempted_at": (
+                attempted_at if attempted_at != NEVER_SYNCED else None
+            ),
+            "error": row.error if row else None,
+            "age": age,
+            "stale": age is None or age > LOCALITIES_MAX_AGE,
+        }
+    return status
+
+
+def add_mirrored_localities(db: Session, documents: list, expand: set):
+    for key, (table, _, id_key, _) in MIRROR_CATALOGS.items():
+        if key not in expand or not documents:
+            continue
+        data = dict(
+            db.execute(
+                select(table.c.id, table.c.data).where(
+                    table.c.id.in_(
+                        {document[id_key] for document in documents}
+                    )
+                )
+            ).all()
+        )
+        for document in documents:
+            if document[id_key] in data:
+                document[key] = data[document[id_key]]
+            else:
+                document["partial"] = True
+
+
+def add_locality_data(
+    db: Session,
+    documents: list,
+    expand: set = frozenset(("city", "workstation")),
+) -> list:
+    if LOCALITIES_MIRROR:
+        add_mirrored_localities(db, documents, expand)
+        return documents
+    budget = LatencyBudget()
+    for document in documents:
+        add_localities(document, budget, expand)
+    return documents
+
+
+def sync_mirror() -> list:
+    with SessionLocal() as db:
+        return sync_localities(db, LOCALITIES_SYNC_INTERVAL)
+
+
+async def run_locality_sync_scheduler():
+    while True:
+        try:
+            for result in await run_in_threadpool(sync_mirror):
+                if result["error"]:
+                    logger.warning(
+                        "Falha ao sincronizar %s: %s",
+                        result["catalog"],
+                        result["error"],
+                    )
+        except Exception:
+            logger.exception("Falha ao sincronizar as localidades")
+        await asyncio.sleep(LOCALITIES_SYNC_INTERVAL)
@@ -0,0 +1,112 @@
+import enum
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from models import Request, has, request_rollup
+from utils.archive_utils import get_ticket_rows
+from utils.db_utils import apply_counter_diff
+
+ROLLUP_KEYS = ("day", "category_id", "city_id")
+
+
+class EnumGranularity(str, enum.Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+def count_rollup_keys(snapshot: list) -> Counter:
+    return Counter(
+        (row.created_at.date(), row.category_id, row.city_id)
+        for row in snapshot
+        if row.created_at is not None
+    )
+
+
+def update_request_rollup(db: Session, before: list, after: list):
+    apply_counter_diff(
+        db,
+        request_rollup,
+        ROLLUP_KEYS,
+        count_rollup_keys(before),
+        count_rollup_keys(after),
+    )
+
+
+def backfill_request_rollup(
+    db: Session, start: date | None = None, end: date | None = None
+):
+    to_delete = request_rollup.delete()
+    conditions = [Request.created_at.is_not(None)]
+    if start:
+        to_delete = to_delete.where(request_rollup.c.day >= start)
+        conditions.append(
+            Request.created_at >= datetime.combine(start, time.min)
+        )
+    if end:
+        to_delete = to_delete.where(request_rollup.c.day <= end)
+        conditions.append(
+            Request.created_at
+            < datetime.combine(end + timedelta(days=1), time.min)
+        )
+    tickets = get_ticket_rows(
+        func.date(Request.created_at).label("day"),
+        has.c.category_id,
+        Request.city_id,
+        conditions=conditions,
+    )
+    columns = [tickets.c[key] for key in ROLLUP_KEYS]
+
+    db.execute(to_delete)
+    db.execute(
+        insert(request_rollup).from_select(
+            [*ROLLUP_KEYS, "total"],
+            select(*columns, func.count()).group_by(*columns),
+        )
+    )
+    db.commit()
+
+
+def get_period(day: date, granularity: EnumGranularity) -> date:
+    if granularity == EnumGranularity.week:
+        return day - timedelta(days=day.weekday())
+    if granularity == EnumGranularity.month:
+        return day.replace(day=1)
+    return day
+
+
+def get_request_rollup(
+    db: Session,
+    granularity: EnumGranularity,
+    group_by: list,
+    filters: dict,
+    start: date | None = None,
+    end: date | None = None,
+) -> list:
+    columns = [request_rollup.c[key] for key in group_by]
+    query = select(
+        request_rollup.c.day,
+        *columns,
+        func.sum(request_rollup.c.total).label("total"),
+    )
+    for key, value in filters.items():
+        query = query.where(request_rollup.c[key] == value)
+    if start:
+        query = query.where(request_rollup.c.day >= start)
+    if end:
+        query = query.where(request_rollup.c.day <= end)
+    query = query.group_by(request_rollup.c.day, *columns)
+
+    buckets = defaultdict(int)
+    for row in db.execute(query):
+        period = get_period(row.day, granularity)
+        buckets[(period, *row[1:-1])] += row.total
+
+    return [
+        {"period": key[0], **dict(zip(group_by, key[1:])), "total": total}
+        for key, total in sorted(buckets.items())
+        if total > 0
+    ]
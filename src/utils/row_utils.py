@@ -0,0 +1,58 @@
+from datetime import date, datetime, time
+from enum import Enum
+
+from sqlalchemy.orm import Session
+
+PLAIN_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def encode_value(value):
+    if type(value) in PLAIN_TYPES:
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+class RowRecord:
+    __slots__ = ()
+
+    def __init__(self, values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def as_dict(self) -> dict:
+        return {
+            name: encode_value(getattr(self, name)) for name in self.__slots__
+        }
+
+
+record_classes = {}
+
+
+def get_record_class(names: tuple) -> type:
+    record_class = record_classes.get(names)
+    if record_class is None:
+        record_class = record_classes[names] = type(
+            "Record", (RowRecord,), {"__slots__": names}
+        )
+    return record_class
+
+
+def select_records(db: Session, statement) -> list:
+    result = db.execute(statement)
+    record_class = get_record_class(tuple(result.keys()))
+    return [record_class(row) for row in result]
+
+
+def select_dicts(db: Session, statement) -> list:
+    result = db.execute(statement)
+    names = tuple(result.keys())
+    return [dict(zip(names, map(encode_value, row))) for row in result]
+
+
+def select_dict(db: Session, statement) -> dict | None:
+    rows = select_dicts(db, statement.limit(1))
+    return rows[0] if rows else None
@@ -0,0 +1,139 @@
+import re
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+SQLITE_INDEX = text(
+    "INSERT INTO request_search "
+    "(rowid, applicant_name, attendant_name, description, request_id) "
+    "SELECT has.id, request.applicant_name, request.attendant_name, "
+    "has.description, has.request_id "
+    "FROM has JOIN request ON request.id = has.request_id "
+    "WHERE has.request_id = :request_id"
+)
+SQLITE_REBUILD = text(
+    "INSERT INTO request_search "
+    "(rowid, applicant_name, attendant_name, description, request_id) "
+    "SELECT has.id, request.applicant_name, request.attendant_name, "
+    "has.description, has.request_id "
+    "FROM has JOIN request ON request.id = has.request_id"
+)
+SQLITE_DELETE = text(
+    "DELETE FROM request_search "
+    "WHERE rowid IN (SELECT id FROM has WHERE request_id = :request_id) "
+    "OR rowid IN :has_ids"
+).bindparams(bindparam("has_ids", expanding=True))
+SQLITE_DELETE_ROWS = text(
+    "DELETE FROM request_search WHERE rowid IN :has_ids"
+).bindparams(bindparam("has_ids", expanding=True))
+SQLITE_SEARCH = text(
+    "SELECT rowid AS has_id, request_id, "
+    "-bm25(request_search, 2.0, 2.0, 1.0) AS rank "
+    "FROM request_search WHERE request_search MATCH :query "
+    "ORDER BY rank DESC LIMIT :limit OFFSET :offset"
+)
+SQLITE_COUNT = text(
+    "SELECT count(*) FROM request_search WHERE request_search MATCH :query"
+)
+
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('portuguese', "
+    "coalesce(request.applicant_name, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', "
+    "coalesce(request.attendant_name, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', "
+    "coalesce(has.description, '')), 'B')"
+)
+POSTGRES_INDEX = text(
+    "INSERT INTO request_search (has_id, request_id, document) "
+    f"SELECT has.id, has.request_id, {POSTGRES_DOCUMENT} "
+    "FROM has JOIN request ON request.id = has.request_id "
+    "WHERE has.request_id = :request_id"
+)
+POSTGRES_REBUILD = text(
+    "INSERT INTO request_search (has_id, request_id, document) "
+    f"SELECT has.id, has.request_id, {POSTGRES_DOCUMENT} "
+    "FROM has JOIN request ON request.id = has.request_id"
+)
+POSTGRES_DELETE = text(
+    "DELETE FROM request_search "
+    "WHERE has_id IN (SELECT id FROM has WHERE request_id = :request_id) "
+    "OR has_id IN :has_ids"
+).bindparams(bindparam("has_ids", expanding=True))
+POSTGRES_DELETE_ROWS = text(
+    "DELETE FROM request_search WHERE has_id IN :has_ids"
+).bindparams(bindparam("has_ids", expanding=True))
+POSTGRES_SEARCH = text(
+    "SELECT has_id, request_id, ts_rank(document, query) AS rank "
+    "FROM request_search, plainto_tsquery('portuguese', :query) query "
+    "WHERE document @@ query "
+    "ORDER BY rank DESC LIMIT :limit OFFSET :offset"
+)
+POSTGRES_COUNT = text(
+    "SELECT count(*) "
+    "FROM request_search, plainto_tsquery('portuguese', :query) query "
+    "WHERE document @@ query"
+)
+
+
+def is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def get_match_query(db: Session, query: str) -> str:
+    words = re.findall(r"\w+", query)
+    if is_postgres(db):
+        return " ".join(words)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def update_search_index(
+    db: Session, request_id: int, has_ids: list | None = None
+):
+    if is_postgres(db):
+        to_delete, to_index = POSTGRES_DELETE, POSTGRES_INDEX
+    else:
+        to_delete, to_index = SQLITE_DELETE, SQLITE_INDEX
+    db.execute(
+        to_delete, {"request_id": request_id, "has_ids": has_ids or []}
+    )
+    db.execute(to_index, {"request_id": request_id})
+
+
+def remove_from_search_index(db: Session, has_ids: list):
+    if has_ids:
+        db.execute(
+            POSTGRES_DELETE_ROWS if is_postgres(db) else SQLITE_DELETE_ROWS,
+            {"has_ids": has_ids},
+        )
+
+
+def index_new_requests(db: Session, request_ids: list):
+    db.execute(
+        POSTGRES_INDEX if is_postgres(db) else SQLITE_INDEX,
+        [{"request_id": request_id} for request_id in request_ids],
+    )
+
+
+def rebuild_search_index(db: Session):
+    db.execute(text("DELETE FROM request_search"))
+    db.execute(POSTGRES_REBUILD if is_postgres(db) else SQLITE_REBUILD)
+    db.commit()
+
+
+def search_requests(
+    db: Session, query: str, limit: int, offset: int
+) -> tuple[list, int]:
+    match_query = get_match_query(db, query)
+    if not match_query:
+        return [], 0
+
+    if is_postgres(db):
+        to_search, to_count = POSTGRES_SEARCH, POSTGRES_COUNT
+    else:
+        to_search, to_count = SQLITE_SEARCH, SQLITE_COUNT
+    hits = db.execute(
+        to_search, {"query": match_query, "limit": limit, "offset": offset}
+    ).all()
+    total = db.execute(to_count, {"query": match_query}).scalar()
+    return hits, total
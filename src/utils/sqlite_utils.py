@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import threading
+from time import perf_counter
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "true").lower() == "true"
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "5"))
+WRITE_STATEMENTS = frozenset(("INSERT", "UPDATE", "DELETE", "REPLACE"))
+
+
+class WriterLock:
+    def __init__(self, timeout: float = SQLITE_BUSY_TIMEOUT / 1000):
+        self.lock = threading.Lock()
+        self.timeout = timeout
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, info: dict) -> bool:
+        if info.get("writer"):
+            return True
+        start = perf_counter()
+        locked = self.lock.acquire(timeout=self.timeout)
+        self.wait_seconds += perf_counter() - start
+        if not locked:
+            self.timeouts += 1
+            return False
+        self.acquired += 1
+        info["writer"] = True
+        return True
+
+    def release(self, info: dict):
+        if info.pop("writer", False):
+            self.lock.release()
+
+    def stats(self) -> dict:
+        return {
+            "held": self.lock.locked(),
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+writer_locks = {}
+
+
+def is_write(statement: str) -> bool:
+    words = statement.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in WRITE_STATEMENTS
+
+
+def set_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+    cursor.close()
+
+
+def create_sqlite_engine(url: str):
+    database = make_url(url).database
+    if not database or database == ":memory:":
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": SQLITE_BUSY_TIMEOUT / 1000,
+        },
+        poolclass=QueuePool,
+        pool_size=SQLITE_POOL_SIZE,
+    )
+    writer_lock = writer_locks.setdefault(
+        os.path.abspath(database), WriterLock()
+    )
+
+    def lock_writes(conn, cursor, statement, parameters, context, many):
+        if is_write(statement) and not writer_lock.acquire(conn.info):
+            raise OperationalError(
+                statement,
+                parameters,
+                sqlite3.OperationalError("database is locked"),
+            )
+
+    def unlock_writes(dbapi_connection, connection_record, *args):
+        writer_lock.release(connection_record.info)
+
+    event.listen(engine, "connect", set_pragmas)
+    event.listen(engine, "before_cursor_execute", lock_writes)
+    event.listen(engine, "checkin", unlock_writes)
+    event.listen(engine, "invalidate", unlock_writes)
+    return engine
+
+
+def create_database_engine(url: str, sqlite_profile: bool = SQLITE_PROFILE):
+    if sqlite_profile and url.startswith("sqlite"):
+        return create_sqlite_engine(url)
+    return create_engine(url)
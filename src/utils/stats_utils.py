@@ -0,0 +1,85 @@
+from collections import Counter
+
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from models import Request, has, request_stats
+from utils.archive_utils import get_ticket_rows
+from utils.db_utils import apply_counter_diff
+
+STATS_KEYS = ("request_status", "priority", "category_id", "city_id")
+
+
+def get_request_snapshot(
+    db: Session, request_id: int, has_ids: list | None = None
+) -> list:
+    condition = has.c.request_id == request_id
+    if has_ids:
+        condition = or_(condition, has.c.id.in_(has_ids))
+    return get_snapshot(db, condition)
+
+
+def get_snapshot(db: Session, condition) -> list:
+    return db.execute(
+        select(
+            has.c.id,
+            has.c.request_id,
+            has.c.problem_id,
+            has.c.request_status,
+            has.c.priority,
+            has.c.category_id,
+            has.c.is_event,
+            has.c.event_date,
+            Request.city_id,
+            Request.created_at,
+        )
+        .join(Request, Request.id == has.c.request_id)
+        .where(condition)
+    ).all()
+
+
+def count_stats_keys(snapshot: list) -> Counter:
+    return Counter(
+        tuple(getattr(row, key) for key in STATS_KEYS) for row in snapshot
+    )
+
+
+def update_request_stats(db: Session, before: list, after: list):
+    apply_counter_diff(
+        db,
+        request_stats,
+        STATS_KEYS,
+        count_stats_keys(before),
+        count_stats_keys(after),
+    )
+
+
+def rebuild_request_stats(db: Session):
+    tickets = get_ticket_rows(
+        has.c.request_status,
+        has.c.priority,
+        has.c.category_id,
+        Request.city_id,
+    )
+    columns = [tickets.c[key] for key in STATS_KEYS]
+    db.execute(request_stats.delete())
+    db.execute(
+        insert(request_stats).from_select(
+            [*STATS_KEYS, "total"],
+            select(*columns, func.count()).group_by(*columns),
+        )
+    )
+    db.commit()
+
+
+def get_request_stats(db: Session, group_by: list, filters: dict) -> list:
+    columns = [request_stats.c[key] for key in group_by]
+    query = select(*columns, func.sum(request_stats.c.total).label("total"))
+    for key, value in filters.items():
+        query = query.where(request_stats.c[key] == value)
+    query = (
+        query.where(request_stats.c.total > 0)
+        .group_by(*columns)
+        .order_by(*columns)
+    )
+    return [dict(row._mapping) for row in db.execute(query)]
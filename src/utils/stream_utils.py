@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import threading
+
+from fastapi.encoders import jsonable_encoder
+
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "100"))
+STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "500"))
+STREAM_KEEPALIVE = float(os.getenv("STREAM_KEEPALIVE", "15"))
+
+
+def get_running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.loop = get_running_loop()
+
+    def put(self, event: dict):
+        if self.loop is not None and get_running_loop() is not self.loop:
+            self.loop.call_soon_threadsafe(self.put_nowait, event)
+        else:
+            self.put_nowait(event)
+
+    def put_nowait(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+
+class ChangeHub:
+    def __init__(
+        self,
+        queue_size: int = STREAM_QUEUE_SIZE,
+        max_clients: int = STREAM_MAX_CLIENTS,
+    ):
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self.subscribers = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self) -> Subscriber | None:
+        with self.lock:
+            if len(self.subscribers) >= self.max_clients:
+                return None
+            subscriber = Subscriber(self.queue_size)
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, **data):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        if not subscribers:
+            return
+        event = jsonable_encoder({"type": event_type, **data})
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+
+change_hub = ChangeHub()
+
+
+def publish_request_changes(
+    request_id: int, before: list, after: list, event_type: str
+):
+    change_hub.publish(event_type, request_id=request_id)
+    publish_status_changes(before, after)
+
+
+def publish_status_changes(before: list, after: list):
+    old_status = {row.id: row.request_status for row in before}
+    for row in after:
+        if row.id in old_status and old_status[row.id] != row.request_status:
+            change_hub.publish(
+                "status_changed",
+                request_id=row.request_id,
+                has_id=row.id,
+                problem_id=row.problem_id,
+                request_status=row.request_status,
+            )
+
+
+def format_event(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def stream_events(request, subscriber: Subscriber):
+    try:
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=STREAM_KEEPALIVE
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        change_hub.unsubscribe(subscriber)
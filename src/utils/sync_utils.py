@@ -0,0 +1,50 @@
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+
+from models import Request, request_change
+from utils.row_utils import select_dicts
+
+
+def record_request_change(db: Session, *request_ids: int):
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE request_change IN EXCLUSIVE MODE"))
+    db.execute(
+        insert(request_change),
+        [{"request_id": request_id} for request_id in request_ids],
+    )
+
+
+def get_request_changes(db: Session, cursor: int, limit: int) -> tuple:
+    last_seq = func.max(request_change.c.seq).label("seq")
+    changes = db.execute(
+        select(request_change.c.request_id, last_seq)
+        .where(request_change.c.seq > cursor)
+        .group_by(request_change.c.request_id)
+        .order_by(last_seq)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if changes:
+        cursor = changes[-1].seq
+
+    request_ids = [change.request_id for change in changes]
+    existing = {
+        request["id"]: request
+        for request in select_dicts(
+            db, select(Request.__table__).where(Request.id.in_(request_ids))
+        )
+    }
+    changed = [existing[id] for id in request_ids if id in existing]
+    deleted = [id for id in request_ids if id not in existing]
+    return changed, deleted, cursor, has_more
+
+
+def compact_request_changes(db: Session):
+    latest = select(func.max(request_change.c.seq)).group_by(
+        request_change.c.request_id
+    )
+    db.execute(
+        request_change.delete().where(request_change.c.seq.not_in(latest))
+    )
+    db.commit()
@@ -8,6 +8,10 @@ done
 
 echo "Banco foi inicializado"
 
+echo "Recriando dados derivados ausentes"
+
+python manage.py rebuild-missing
+
 echo "inicializado Aplicação"
 
-uvicorn main:app --host  0.0.0.0 --proxy-headers --port $APP_PORT_DETALHADOR
+gunicorn main:app --config gunicorn.conf.py
@@ -11,8 +11,9 @@ try:
 except Exception:
     pass
 
+import database
 import models
-from database import get_db
+from database import get_db, get_read_db
 from main import app
 
 engine = create_engine(
@@ -46,6 +47,9 @@ def session():
         session.commit()
 
     yield session
+    session.close()
+    engine.dispose()
+    database.engine.dispose()
     os.remove("test.db")
 
 
@@ -60,4 +64,5 @@ def client(session):
 
     with TestClient(app) as client:
         app.dependency_overrides[get_db] = get_db_test
+        app.dependency_overrides[get_read_db] = get_db_test
         yield client
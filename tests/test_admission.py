@@ -0,0 +1,56 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from utils.admission_utils import RoleLimiter, admission
+from utils.auth_utils import ADMIN_HEADER
+
+
+def test_role_limiter_queues_and_sheds():
+    async def scenario():
+        limiter = RoleLimiter(1, 1, queue_timeout=1)
+        assert await limiter.acquire()
+
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.stats()["queued"] == 1
+        assert not await limiter.acquire()
+
+        limiter.release()
+        assert await queued
+        assert limiter.stats()["in_flight"] == 1
+        limiter.release()
+        return limiter.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["in_flight"] == 0
+    assert stats["admitted"] == 2
+    assert stats["shed"] == 1
+
+
+def test_role_limiter_queue_timeout():
+    async def scenario():
+        limiter = RoleLimiter(1, 1, queue_timeout=0.01)
+        await limiter.acquire()
+        admitted = await limiter.acquire()
+        limiter.release()
+        return admitted, limiter.stats()
+
+    admitted, stats = asyncio.run(scenario())
+    assert not admitted
+    assert stats["in_flight"] == 0
+    assert stats["queued"] == 0
+
+
+def test_overloaded_role_gets_503(client: TestClient, monkeypatch):
+    monkeypatch.setitem(admission.limiters, "public", RoleLimiter(0, 0))
+
+    response = client.get("/chamado")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+    response = client.get("/chamado?id=1", headers=ADMIN_HEADER)
+    assert response.status_code == 200
+
+    response = client.get("/metricas")
+    assert response.json()["data"]["admission"]["public"]["shed"] == 1
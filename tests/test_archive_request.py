@@ -0,0 +1,143 @@
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, text
+
+from models import Request, alert_date, has
+from utils.archive_utils import archive_requests
+from utils.auth_utils import ADMIN_HEADER
+from utils.search_utils import update_search_index
+
+
+def add_request(
+    session,
+    request_status: str,
+    attendant_name: str = "Arquivo",
+    created_at: datetime = datetime(1990, 1, 1),
+) -> int:
+    request = Request(
+        attendant_name=attendant_name,
+        applicant_name="Arquivo",
+        applicant_phone="999999999",
+        city_id=1,
+        workstation_id=1,
+        created_at=created_at,
+    )
+    session.add(request)
+    session.flush()
+    result = session.execute(
+        insert(has).values(
+            problem_id=1,
+            request_id=request.id,
+            category_id=1,
+            is_event=False,
+            request_status=request_status,
+            priority="normal",
+        )
+    )
+    session.execute(
+        insert(alert_date).values(
+            has_id=result.inserted_primary_key[0], alert_date=date(1990, 1, 2)
+        )
+    )
+    session.commit()
+    return request.id
+
+
+def test_archive_solved_requests(client: TestClient, session):
+    solved_id = add_request(session, "solved")
+    pending_id = add_request(session, "pending")
+    update_search_index(session, solved_id)
+    session.commit()
+
+    request_ids = archive_requests(session, days=365)
+    assert solved_id in request_ids
+    assert pending_id not in request_ids
+    assert not session.execute(
+        text("SELECT rowid FROM request_search WHERE request_id = :id"),
+        {"id": solved_id},
+    ).all()
+
+    response = client.get(f"/chamado?id={solved_id}", headers=ADMIN_HEADER)
+    assert response.json()["data"] == []
+
+    response = client.get(
+        f"/chamado?id={solved_id}&incluir_arquivados=true",
+        headers=ADMIN_HEADER,
+    )
+    data = response.json()["data"]
+    assert data[0]["archived"] is True
+    assert data[0]["problems"][0]["alert_dates"] == ["1990-01-02"]
+
+
+def test_get_archived_requests_with_filters(client: TestClient):
+    response = client.get(
+        "/chamado?request_status=solved&attendant_name=Arquivo",
+        headers=ADMIN_HEADER,
+    )
+    assert response.json()["data"] == []
+
+    response = client.get(
+        "/chamado?request_status=solved&attendant_name=Arquivo"
+        "&incluir_arquivados=true",
+        headers=ADMIN_HEADER,
+    )
+    data = response.json()["data"]
+    assert len(data) == 1
+    assert data[0]["archived"] is True
+    assert data[0]["problems"][0]["request_status"] == "solved"
+
+
+def test_get_archived_requests_pages_both_sources(client: TestClient, session):
+    request_ids = [
+        add_request(session, request_status, "Paginado", datetime(year, 1, 1))
+        for year, request_status in (
+            (1990, "solved"),
+            (1991, "pending"),
+            (1992, "solved"),
+            (1993, "pending"),
+        )
+    ]
+    archive_requests(session, days=365)
+
+    response = client.get(
+        "/chamado?attendant_name=Paginado&sort=-created_at"
+        "&incluir_arquivados=true",
+        headers=ADMIN_HEADER,
+    )
+    data = response.json()["data"]
+    assert [request["id"] for request in data] == request_ids[::-1]
+    assert [request.get("archived", False) for request in data] == [
+        False,
+        True,
+        False,
+        True,
+    ]
+
+    response = client.get(
+        "/chamado?attendant_name=Paginado&sort=created_at"
+        "&limit=2&offset=1&incluir_arquivados=true",
+        headers=ADMIN_HEADER,
+    )
+    data = response.json()["data"]
+    assert [request["id"] for request in data] == request_ids[1:3]
+
+
+def test_get_all_requests_with_archived(client: TestClient):
+    response = client.get("/chamado", headers=ADMIN_HEADER)
+    assert response.status_code == 200
+    live = response.json()["data"]
+    assert not any(request.get("archived") for request in live)
+
+    response = client.get(
+        "/chamado?incluir_arquivados=true", headers=ADMIN_HEADER
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    archived = data[len(live):]
+    assert data[: len(live)] == live
+    assert archived
+    assert all(request["archived"] for request in archived)
+    assert [request["id"] for request in archived] == sorted(
+        request["id"] for request in archived
+    )
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+import main
+from models import Request, has
+from utils.event_utils import event_calendar
+from utils.stats_utils import get_snapshot
+
+
+def add_events(session, *event_dates: datetime) -> int:
+    request = Request(
+        attendant_name="Fulano",
+        applicant_name="Calendario",
+        applicant_phone="1111111111",
+        city_id=1,
+        workstation_id=1,
+    )
+    session.add(request)
+    session.flush()
+    session.execute(
+        insert(has),
+        [
+            {
+                "problem_id": 1,
+                "request_id": request.id,
+                "category_id": 1,
+                "is_event": True,
+                "event_date": event_date,
+                "request_status": "pending",
+                "priority": "normal",
+            }
+            for event_date in event_dates
+        ],
+    )
+    session.commit()
+    event_calendar.build(session)
+    return request.id
+
+
+def get_days(client: TestClient) -> dict:
+    response = client.get("/evento/calendario?year=2031&month=7")
+    assert response.status_code == 200
+    return {day["day"]: day["total"] for day in response.json()["data"]}
+
+
+def test_event_calendar_counts_by_day(client: TestClient, session):
+    add_events(session, datetime(2031, 7, 12, 9), datetime(2031, 7, 10, 14))
+
+    days = get_days(client)
+    assert len(days) == 31
+    assert days["2031-07-10"] == 1
+    assert days["2031-07-12"] == 1
+    assert sum(days.values()) == 2
+
+
+def test_event_calendar_window(client: TestClient):
+    response = client.get(
+        "/evento?start_date=2031-07-01&end_date=2031-07-31"
+    )
+    events = response.json()["data"]
+    assert [event["problems"]["event_date"] for event in events] == [
+        "2031-07-10T14:00:00",
+        "2031-07-12T09:00:00",
+    ]
+
+    response = client.get("/evento?start_date=2031-07-12")
+    assert len(response.json()["data"]) == 1
+
+
+def test_event_calendar_next_events(client: TestClient):
+    response = client.get("/evento?next_events=1000")
+    event_dates = [
+        event["problems"]["event_date"] for event in response.json()["data"]
+    ]
+    assert event_dates == sorted(event_dates)
+    assert "2031-07-10T14:00:00" in event_dates
+
+    response = client.get("/evento?next_events=1")
+    assert len(response.json()["data"]) <= 1
+
+
+def test_event_calendar_applies_changes(client: TestClient, session):
+    request_id = add_events(session, datetime(2031, 7, 5, 8))
+    condition = has.c.request_id == request_id
+    before = get_snapshot(session, condition)
+    session.execute(
+        has.update()
+        .where(condition)
+        .values(event_date=datetime(2031, 7, 20, 10))
+    )
+    session.commit()
+
+    event_calendar.apply_changes(before, get_snapshot(session, condition))
+    days = get_days(client)
+    assert days["2031-07-05"] == 0
+    assert days["2031-07-20"] == 1
+
+
+def test_event_calendar_startup_failure_is_logged(monkeypatch, caplog):
+    def fail():
+        raise RuntimeError("banco indisponivel")
+
+    monkeypatch.setattr(main, "rebuild_event_calendar", fail)
+    asyncio.run(main.build_event_calendar())
+    assert "Falha ao montar o calendario de eventos" in caplog.text
+    assert "banco indisponivel" in caplog.text
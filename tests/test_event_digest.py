@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from models import has
+from utils.auth_utils import ADMIN_HEADER
+from utils.event_utils import event_digest
+
+
+def test_event_digest_serves_upcoming_events(client: TestClient, session):
+    event_date = datetime.now() + timedelta(days=1, hours=1)
+    session.execute(
+        insert(has).values(
+            problem_id=1,
+            request_id=2,
+            category_id=1,
+            is_event=True,
+            event_date=event_date,
+            request_status="pending",
+            priority="normal",
+        )
+    )
+    session.commit()
+    event_digest.invalidate()
+
+    response = client.get("/evento?days_to_event=2")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert [event["id"] for event in data] == [2]
+    assert data[0]["problems"]["event_date"] == event_date.isoformat()
+
+    response = client.get("/evento?days_to_event=1")
+    assert response.json()["data"] == []
+
+
+def test_event_digest_invalidated_by_solved_event(client: TestClient):
+    client.get("/evento?days_to_event=2")
+    assert not event_digest.is_stale()
+
+    response = client.delete(
+        "/chamado?request_id=2&problem_id=1", headers=ADMIN_HEADER
+    )
+    assert response.status_code == 200
+    assert event_digest.is_stale()
+
+    response = client.get("/evento?days_to_event=2")
+    problems = response.json()["data"][0]["problems"]
+    assert problems["request_status"] == "solved"
@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+
+
+def test_get_request_expands_everything_by_default(client: TestClient):
+    response = client.get("/chamado?id=1")
+    assert response.status_code == 200
+    problem = response.json()["data"][0]["problems"][0]
+    assert {"problem", "category", "alert_dates"} <= set(problem)
+
+
+def test_get_request_expand_problem_only(client: TestClient):
+    response = client.get("/chamado?id=1&expand=problem")
+    assert response.status_code == 200
+    data = response.json()["data"][0]
+    assert "partial" not in data
+    problem = data["problems"][0]
+    assert problem["problem"]["id"] == problem["problem_id"]
+    assert "category" not in problem
+    assert "alert_dates" not in problem
+
+
+def test_get_request_filtered_expand(client: TestClient):
+    response = client.get("/chamado?city_id=3&expand=category,alert_dates")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data
+    for request in data:
+        assert request["city_id"] == 3
+        problem = request["problems"][0]
+        assert problem["category"]["id"] == problem["category_id"]
+        assert problem["alert_dates"] == []
+        assert "problem" not in problem
+
+
+def test_get_request_expand_nothing(client: TestClient):
+    response = client.get("/chamado?id=1&expand=")
+    assert response.status_code == 200
+    problem = response.json()["data"][0]["problems"][0]
+    assert "problem" not in problem
+
+
+def test_get_request_invalid_expand(client: TestClient):
+    response = client.get("/chamado?id=1&expand=applicant")
+    assert response.status_code == 400
+    assert response.json()["message"] == "Expansao invalida: applicant"
+
+
+def test_get_event_expand(client: TestClient):
+    response = client.get("/evento?days_to_event=2&expand=problem")
+    assert response.status_code == 200
+    for event in response.json()["data"]:
+        assert "problem" in event["problems"]
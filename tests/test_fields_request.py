@@ -0,0 +1,71 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+def test_get_request_fields(client: TestClient):
+    url = (
+        "/chamado?id=1&expand="
+        "&fields=applicant_name,problems.request_status"
+    )
+    response = client.get(url)
+    assert response.status_code == 200
+    data = response.json()["data"][0]
+    assert set(data) == {"id", "applicant_name", "problems"}
+    assert set(data["problems"][0]) == {"id", "request_status"}
+
+
+def test_get_request_fields_keep_expansions(client: TestClient):
+    url = "/chamado?city_id=3&expand=category&fields=applicant_name"
+    response = client.get(url)
+    assert response.status_code == 200
+    for request in response.json()["data"]:
+        assert set(request) == {"id", "applicant_name", "problems"}
+        problem = request["problems"][0]
+        assert set(problem) == {"id", "category"}
+        assert problem["category"]["id"] == 1
+
+
+def test_get_all_requests_fields(client: TestClient):
+    response = client.get("/chamado?expand=&fields=city_id")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data
+    for request in data:
+        assert set(request) == {"id", "city_id", "problems"}
+
+
+def test_get_request_invalid_fields(client: TestClient):
+    response = client.get("/chamado?fields=password,problems.secret")
+    assert response.status_code == 400
+    assert (
+        response.json()["message"]
+        == "Campo invalido: password, problems.secret"
+    )
+
+
+def test_get_request_fields_project_in_sql(client: TestClient, session):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        for url in (
+            "/chamado?id=1&expand=&fields=applicant_name",
+            "/chamado?expand=&fields=applicant_name",
+        ):
+            response = client.get(url)
+            assert response.status_code == 200
+            assert set(response.json()["data"][0]) == {
+                "id",
+                "applicant_name",
+                "problems",
+            }
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements
+    assert not any("request_document" in sql for sql in statements)
+    assert not any("applicant_phone" in sql for sql in statements)
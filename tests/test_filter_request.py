@@ -0,0 +1,113 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from models import Request, has
+from utils.auth_utils import ADMIN_HEADER
+
+CITY_ID = 7701
+
+
+@pytest.fixture(scope="module")
+def seeded(session) -> dict:
+    ids = {}
+    for name, month, workstation_id, priority in (
+        ("A", 1, 1, "high"),
+        ("B", 2, 2, "low"),
+        ("C", 3, 2, "high"),
+    ):
+        request = Request(
+            attendant_name="Filtro",
+            applicant_name=name,
+            applicant_phone="1111111111",
+            city_id=CITY_ID,
+            workstation_id=workstation_id,
+            created_at=datetime(2021, month, 1),
+        )
+        session.add(request)
+        session.flush()
+        session.execute(
+            insert(has).values(
+                problem_id=1,
+                request_id=request.id,
+                category_id=1,
+                request_status="pending",
+                priority=priority,
+            )
+        )
+        ids[name] = request.id
+    session.commit()
+    return ids
+
+
+def get_names(client: TestClient, seeded: dict, query: str) -> list:
+    response = client.get(
+        f"/chamado?city_id={CITY_ID}&{query}", headers=ADMIN_HEADER
+    )
+    assert response.status_code == 200
+    names = {request_id: name for name, request_id in seeded.items()}
+    return [names[request["id"]] for request in response.json()["data"]]
+
+
+def test_filter_request_without_matches(client: TestClient):
+    url = "/chamado?city_id=999&priority=urgent&sort=-created_at"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+
+def test_filter_request_by_created_range_without_matches(client: TestClient):
+    url = (
+        "/chamado?created_after=2000-01-01T00:00:00"
+        "&created_before=2000-12-31T00:00:00"
+    )
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+
+
+def test_filter_request_invalid_sort(client: TestClient):
+    response = client.get("/chamado?city_id=1&sort=applicant_phone")
+    assert response.status_code == 400
+    assert response.json()["message"] == "Ordenacao invalida: applicant_phone"
+
+
+def test_filter_request_invalid_priority(client: TestClient):
+    response = client.get("/chamado?priority=maxima")
+    assert response.status_code == 422
+
+
+def test_filter_request_returns_only_matches(client: TestClient, seeded):
+    assert sorted(get_names(client, seeded, "priority=high")) == ["A", "C"]
+    assert get_names(client, seeded, "priority=low") == ["B"]
+
+
+def test_filter_request_combines_filters(client: TestClient, seeded):
+    assert get_names(client, seeded, "priority=high&workstation_id=2") == [
+        "C"
+    ]
+    assert sorted(
+        get_names(client, seeded, "created_after=2021-01-15T00:00:00")
+    ) == ["B", "C"]
+
+
+def test_filter_request_sorts(client: TestClient, seeded):
+    assert get_names(client, seeded, "sort=-created_at") == ["C", "B", "A"]
+    assert get_names(client, seeded, "sort=created_at") == ["A", "B", "C"]
+    assert get_names(client, seeded, "sort=priority&sort=-created_at") == [
+        "B",
+        "C",
+        "A",
+    ]
+
+
+def test_filter_request_paginates(client: TestClient, seeded):
+    assert get_names(client, seeded, "sort=-created_at&limit=2") == [
+        "C",
+        "B",
+    ]
+    assert get_names(
+        client, seeded, "sort=-created_at&limit=2&offset=2"
+    ) == ["A"]
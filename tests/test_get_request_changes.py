@@ -0,0 +1,135 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, insert, select
+
+from models import request_change
+from utils.auth_utils import ADMIN_HEADER
+
+request = {
+    "attendant_name": "Fulano",
+    "applicant_name": "Ciclano",
+    "applicant_phone": "1111111111",
+    "city_id": 1,
+    "workstation_id": 1,
+    "problems": [{"category_id": 1, "problem_id": 4}],
+}
+
+
+def get_last_change(session):
+    return session.execute(
+        select(request_change).order_by(request_change.c.seq.desc())
+    ).first()
+
+
+def test_post_request_records_change(client: TestClient, session):
+    response = client.post("/chamado", json=request)
+    request_id = response.json()["data"]["id"]
+    assert get_last_change(session).request_id == request_id
+
+
+def test_get_request_changes_tombstone(client: TestClient, session):
+    cursor = session.execute(select(func.max(request_change.c.seq))).scalar()
+    session.execute(insert(request_change).values(request_id=99999))
+    session.commit()
+
+    response = client.get(f"/chamado/alteracoes?desde={cursor}")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["changed"] == []
+    assert data["deleted"] == [99999]
+    assert data["cursor"] == get_last_change(session).seq
+    assert not data["has_more"]
+
+
+def test_get_request_changes_up_to_date(client: TestClient, session):
+    cursor = get_last_change(session).seq
+    response = client.get(f"/chamado/alteracoes?desde={cursor}")
+    assert response.status_code == 200
+    assert response.json()["data"] == {
+        "cursor": cursor,
+        "has_more": False,
+        "changed": [],
+        "deleted": [],
+    }
+
+
+def test_get_request_changes_invalid_cursor(client: TestClient):
+    response = client.get("/chamado/alteracoes?desde=-1")
+    assert response.status_code == 422
+
+
+def test_get_request_changes_pages_changed_requests(
+    client: TestClient, session
+):
+    cursor = get_last_change(session).seq
+    request_ids = [
+        client.post("/chamado", json=request).json()["data"]["id"]
+        for _ in range(3)
+    ]
+
+    response = client.get(f"/chamado/alteracoes?desde={cursor}&limit=2")
+    data = response.json()["data"]
+    assert data["has_more"]
+    assert [change["id"] for change in data["changed"]] == request_ids[:2]
+    assert data["changed"][0]["problems"][0]["problem_id"] == 4
+    assert data["deleted"] == []
+
+    response = client.get(
+        f"/chamado/alteracoes?desde={data['cursor']}&limit=2"
+    )
+    data = response.json()["data"]
+    assert not data["has_more"]
+    assert [change["id"] for change in data["changed"]] == request_ids[2:]
+    assert data["cursor"] == get_last_change(session).seq
+
+
+def test_change_is_the_last_write_before_commit(client: TestClient, session):
+    statements = []
+    committed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def record_commit(conn):
+        if statements:
+            committed.append(statements[-1])
+        statements.clear()
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    event.listen(engine, "commit", record_commit)
+    try:
+        response = client.post(
+            "/chamado",
+            json=request,
+            headers={**ADMIN_HEADER, "Idempotency-Key": "ultima"},
+        )
+        request_id = response.json()["data"]["id"]
+        response = client.put(
+            f"/chamado/{request_id}",
+            json={**request, "applicant_name": "Beltrano", "problems": []},
+            headers=ADMIN_HEADER,
+        )
+        assert response.status_code == 200
+        response = client.put(
+            "/chamado/lote/status",
+            json={
+                "request_status": "in_progress",
+                "items": [{"request_id": request_id, "problem_id": 4}],
+            },
+            headers=ADMIN_HEADER,
+        )
+        assert response.status_code == 200
+        response = client.delete(
+            "/chamado",
+            params={"request_id": request_id, "problem_id": 4},
+            headers=ADMIN_HEADER,
+        )
+        assert response.status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+        event.remove(engine, "commit", record_commit)
+
+    assert len(committed) == 4
+    assert all(
+        sql.startswith("INSERT INTO request_change") for sql in committed
+    )
@@ -0,0 +1,199 @@
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+from models import has, status_history
+from utils.auth_utils import ADMIN_HEADER
+from utils.history_utils import get_percentile, record_status_changes
+
+CITY_ID = 9901
+OPENED_AT = datetime(2022, 3, 1, 8)
+
+
+def add_history(session, has_id: int, transitions: list):
+    previous = None
+    rows = []
+    for to_status, hours in transitions:
+        rows.append(
+            {
+                "has_id": has_id,
+                "request_id": has_id,
+                "from_status": previous,
+                "to_status": to_status,
+                "priority": "high",
+                "category_id": 1,
+                "city_id": CITY_ID,
+                "created_at": OPENED_AT,
+                "changed_at": OPENED_AT + timedelta(hours=hours),
+            }
+        )
+        previous = to_status
+    session.execute(insert(status_history), rows)
+    session.commit()
+
+
+def get_city(response) -> dict:
+    assert response.status_code == 200
+    return next(
+        row for row in response.json()["data"] if row["city_id"] == CITY_ID
+    )
+
+
+def test_get_percentile_interpolates():
+    values = dict(enumerate([10.0, 20.0, 30.0, 40.0, 50.0]))
+    assert get_percentile(values, 5, 50) == 30.0
+    assert get_percentile(values, 5, 90) == 46.0
+    assert get_percentile(values, 5, 100) == 50.0
+
+
+def test_get_resolution_percentiles(client: TestClient, session):
+    for number in range(1, 6):
+        add_history(
+            session, 90000 + number, [("pending", 0), ("solved", number)]
+        )
+    add_history(
+        session,
+        90010,
+        [("pending", 0), ("in_progress", 1), ("outsourced", 2), ("solved", 6)],
+    )
+
+    response = client.get(
+        "/chamado/resolucao?group_by=city_id&percentiles=50&percentiles=90",
+        headers=ADMIN_HEADER,
+    )
+    city = get_city(response)
+    assert city["total"] == 6
+    assert city["percentiles"]["p50"] == 3.5 * 3600
+    assert city["percentiles"]["p90"] == 5.5 * 3600
+
+    response = client.get(
+        "/chamado/resolucao?group_by=city_id&request_status=outsourced",
+        headers=ADMIN_HEADER,
+    )
+    city = get_city(response)
+    assert city["total"] == 1
+    assert city["mean"] == 4 * 3600
+
+
+def test_status_change_is_recorded(client: TestClient, session):
+    has_row = session.execute(
+        select(has).where(has.c.request_status == "pending")
+    ).first()
+
+    client.delete(
+        "/chamado",
+        params={
+            "request_id": has_row.request_id,
+            "problem_id": has_row.problem_id,
+        },
+        headers=ADMIN_HEADER,
+    )
+    history = session.execute(
+        select(status_history).where(status_history.c.has_id == has_row.id)
+    ).all()
+    assert history[-1].from_status.value == "pending"
+    assert history[-1].to_status.value == "solved"
+
+
+def test_get_resolution_with_invalid_percentile(client: TestClient):
+    response = client.get(
+        "/chamado/resolucao?percentiles=120", headers=ADMIN_HEADER
+    )
+    assert response.status_code == 400
+
+
+def test_status_change_without_created_at_keeps_opening_time(session):
+    add_history(session, 90200, [("pending", 0)])
+
+    def get_row(has_id: int, request_status: str):
+        return SimpleNamespace(
+            id=has_id,
+            request_id=has_id,
+            request_status=request_status,
+            priority="high",
+            category_id=1,
+            city_id=CITY_ID,
+            created_at=None,
+        )
+
+    record_status_changes(
+        session,
+        [get_row(90200, "pending"), get_row(90201, "pending")],
+        [get_row(90200, "solved"), get_row(90201, "solved")],
+    )
+    session.commit()
+
+    history = session.execute(
+        select(status_history)
+        .where(status_history.c.has_id.in_([90200, 90201]))
+        .order_by(status_history.c.id)
+    ).all()
+    assert [row.has_id for row in history] == [90200, 90200]
+    assert history[-1].created_at == OPENED_AT
+    assert history[-1].changed_at > OPENED_AT
+
+
+def test_resolution_uses_one_clock(monkeypatch, client: TestClient):
+    monkeypatch.setenv("TZ", "America/Sao_Paulo")
+    time.tzset()
+    try:
+        response = client.post(
+            "/chamado",
+            json={
+                "attendant_name": "Fulano",
+                "applicant_name": "Relogio",
+                "applicant_phone": "1111111111",
+                "city_id": 9902,
+                "workstation_id": 1,
+                "problems": [{"category_id": 1, "problem_id": 1}],
+            },
+            headers=ADMIN_HEADER,
+        )
+        request_id = response.json()["data"]["id"]
+        request = client.get(f"/chamado?id={request_id}", headers=ADMIN_HEADER)
+        problem = request.json()["data"][0]["problems"][0]
+
+        response = client.put(
+            f"/chamado/{request_id}",
+            json={
+                "attendant_name": "Fulano",
+                "applicant_name": "Relogio",
+                "applicant_phone": "1111111111",
+                "city_id": 9902,
+                "workstation_id": 1,
+                "problems": [
+                    {
+                        "id": problem["id"],
+                        "category_id": 1,
+                        "problem_id": 1,
+                        "request_status": "in_progress",
+                        "alert_dates": [],
+                    }
+                ],
+            },
+            headers=ADMIN_HEADER,
+        )
+        assert response.status_code == 200
+        response = client.delete(
+            "/chamado",
+            params={"request_id": request_id, "problem_id": 1},
+            headers=ADMIN_HEADER,
+        )
+        assert response.status_code == 200
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    for query in ("", "&request_status=in_progress"):
+        response = client.get(
+            f"/chamado/resolucao?group_by=city_id{query}",
+            headers=ADMIN_HEADER,
+        )
+        city = next(
+            row for row in response.json()["data"] if row["city_id"] == 9902
+        )
+        assert city["total"] == 1
+        assert 0 <= city["mean"] < 60
@@ -0,0 +1,63 @@
+from fastapi.testclient import TestClient
+
+from utils.auth_utils import ADMIN_HEADER
+
+request = {
+    "attendant_name": "Fulano",
+    "applicant_name": "Ciclano",
+    "applicant_phone": "1111111111",
+    "city_id": 42,
+    "workstation_id": 1,
+    "problems": [
+        {
+            "category_id": 7,
+            "problem_id": 1,
+            "request_status": "pending",
+            "priority": "urgent",
+        },
+        {
+            "category_id": 7,
+            "problem_id": 2,
+            "request_status": "pending",
+            "priority": "urgent",
+        },
+    ],
+}
+
+
+def get_total(client: TestClient, url: str) -> int:
+    response = client.get(url)
+    assert response.status_code == 200
+    return sum(group["total"] for group in response.json()["data"])
+
+
+def test_get_statistics(client: TestClient):
+    response = client.get("/chamado/estatisticas")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Dados buscados com sucesso"
+
+
+def test_get_statistics_after_post(client: TestClient):
+    url = "/chamado/estatisticas?city_id=42&group_by=request_status"
+    before = get_total(client, url)
+    response = client.post("/chamado", json=request)
+    assert response.status_code == 201
+    assert get_total(client, url) == before + 2
+
+
+def test_get_statistics_after_delete(client: TestClient):
+    response = client.post("/chamado", json=request)
+    request_id = response.json()["data"]["id"]
+    url = "/chamado/estatisticas?city_id=42&request_status=solved"
+    before = get_total(client, url)
+    response = client.delete(
+        f"/chamado?request_id={request_id}&problem_id=1",
+        headers=ADMIN_HEADER,
+    )
+    assert response.status_code == 200
+    assert get_total(client, url) == before + 1
+
+
+def test_get_statistics_invalid_group_by(client: TestClient):
+    response = client.get("/chamado/estatisticas?group_by=description")
+    assert response.status_code == 400
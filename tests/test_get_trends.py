@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+
+request = {
+    "attendant_name": "Fulano",
+    "applicant_name": "Ciclano",
+    "applicant_phone": "1111111111",
+    "city_id": 43,
+    "workstation_id": 1,
+    "problems": [
+        {"category_id": 8, "problem_id": 1},
+        {"category_id": 9, "problem_id": 2},
+    ],
+}
+
+
+def get_total(client: TestClient, url: str) -> int:
+    response = client.get(url)
+    assert response.status_code == 200
+    return sum(bucket["total"] for bucket in response.json()["data"])
+
+
+def test_get_trends(client: TestClient):
+    response = client.get("/chamado/tendencias")
+    assert response.status_code == 200
+    assert response.json()["message"] == "Dados buscados com sucesso"
+
+
+def test_get_trends_after_post(client: TestClient):
+    url = "/chamado/tendencias?city_id=43&group_by=city_id"
+    before = get_total(client, url)
+    response = client.post("/chamado", json=request)
+    assert response.status_code == 201
+    assert get_total(client, url) == before + 2
+
+
+def test_get_trends_by_month(client: TestClient):
+    client.post("/chamado", json=request)
+    url = "/chamado/tendencias?city_id=43&granularity=month&group_by=city_id"
+    response = client.get(url)
+    assert response.status_code == 200
+    periods = [bucket["period"] for bucket in response.json()["data"]]
+    assert periods
+    assert all(period.endswith("-01") for period in periods)
+
+
+def test_get_trends_invalid_granularity(client: TestClient):
+    response = client.get("/chamado/tendencias?granularity=year")
+    assert response.status_code == 422
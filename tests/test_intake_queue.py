@@ -0,0 +1,66 @@
+import asyncio
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import has
+from routers.request import RequestModel, write_request_batch
+from utils.bulk_utils import insert_with_ids
+from utils.intake_utils import IntakeQueue
+
+ticket = {
+    "attendant_name": "Fulano",
+    "applicant_name": "Lote",
+    "applicant_phone": "1111111111",
+    "city_id": 1,
+    "workstation_id": 1,
+    "problems": [{"category_id": 1, "problem_id": 1}],
+}
+
+
+def test_intake_queue_groups_items_into_batches():
+    batches = []
+
+    def write_batch(batch):
+        batches.append(batch)
+        return [
+            ValueError(item) if item == "erro" else item * 2 for item in batch
+        ]
+
+    async def scenario():
+        queue = IntakeQueue(batch_size=3, batch_wait=0.05, queue_size=10)
+        writer = asyncio.create_task(queue.run(write_batch))
+        await asyncio.sleep(0)
+        results = await asyncio.gather(
+            *(queue.submit(item) for item in ("a", "b", "erro", "c")),
+            return_exceptions=True,
+        )
+        await queue.close()
+        await writer
+        return results, queue
+
+    results, queue = asyncio.run(scenario())
+    assert batches == [["a", "b", "erro"], ["c"]]
+    assert results[:2] == ["aa", "bb"]
+    assert isinstance(results[2], ValueError)
+    assert results[3] == "cc"
+    assert not queue.is_running()
+    assert queue.stats()["items"] == 4
+
+
+def test_write_request_batch_isolates_failures(session):
+    good = RequestModel(**ticket)
+    bad = RequestModel(**ticket, created_at="data invalida")
+
+    results = write_request_batch([good, bad, good])
+    assert isinstance(results[1], Exception)
+    first, second = results[0][0], results[2][0]
+    assert second["id"] > first["id"]
+    assert first["applicant_name"] == "Lote"
+
+
+def test_batch_insert_overrides_identity_on_postgres():
+    statement = insert_with_ids(has).values(id=1, request_id=1)
+    assert "OVERRIDING SYSTEM VALUE VALUES" in str(
+        statement.compile(dialect=postgresql.dialect())
+    )
+    assert "OVERRIDING" not in str(statement.compile(dialect=sqlite.dialect()))
@@ -0,0 +1,89 @@
+import requests as r
+from fastapi.testclient import TestClient
+
+from utils import localities_utils
+from utils.localities_utils import (CircuitBreaker, LatencyBudget,
+                                    add_localities, get_locality)
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, data=None):
+        self.status_code = status_code
+        self.data = data
+
+    def json(self):
+        return {"data": self.data}
+
+
+def test_get_request_without_localities_is_partial(client: TestClient):
+    response = client.get("/chamado?id=1")
+    assert response.status_code == 200
+    data = response.json()["data"][0]
+    assert data["partial"]
+    assert "city" not in data
+
+
+def test_add_localities(monkeypatch):
+    monkeypatch.setattr(
+        localities_utils, "GERENCIADOR_DE_LOCALIDADES_URL", "http://local"
+    )
+    monkeypatch.setattr(
+        localities_utils, "localities_breaker", CircuitBreaker()
+    )
+    monkeypatch.setattr(
+        r, "get", lambda url, timeout: FakeResponse(200, {"url": url})
+    )
+    request_dict = add_localities(
+        {"city_id": 1, "workstation_id": 2}, LatencyBudget()
+    )
+    assert request_dict["city"] == {"url": "http://local/city?city_id=1"}
+    assert request_dict["workstation"] == {
+        "url": "http://local/workstation?id=2"
+    }
+    assert "partial" not in request_dict
+
+
+def test_circuit_breaker_opens_after_failures(monkeypatch):
+    calls = []
+
+    def timeout(url, timeout):
+        calls.append(url)
+        raise r.Timeout()
+
+    monkeypatch.setattr(
+        localities_utils, "GERENCIADOR_DE_LOCALIDADES_URL", "http://local"
+    )
+    monkeypatch.setattr(
+        localities_utils,
+        "localities_breaker",
+        CircuitBreaker(failure_threshold=2),
+    )
+    monkeypatch.setattr(r, "get", timeout)
+
+    for _ in range(4):
+        assert get_locality("/city?city_id=1", LatencyBudget()) == (
+            False, None
+        )
+    assert len(calls) == 2
+    assert localities_utils.localities_breaker.state == "open"
+
+
+def test_circuit_breaker_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_expired_budget_skips_call(monkeypatch):
+    monkeypatch.setattr(
+        localities_utils, "GERENCIADOR_DE_LOCALIDADES_URL", "http://local"
+    )
+    monkeypatch.setattr(r, "get", None)
+    request_dict = add_localities(
+        {"city_id": 1, "workstation_id": 2}, LatencyBudget(0)
+    )
+    assert request_dict["partial"]
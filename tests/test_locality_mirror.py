@@ -0,0 +1,167 @@
+import requests as r
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from models import Request, city_mirror, has, workstation_mirror
+from utils import mirror_utils
+from utils.auth_utils import ADMIN_HEADER
+from utils.mirror_utils import get_mirror_status, sync_localities
+
+CITIES = [
+    {"id": 8801, "name": "Cidade Espelho"},
+    {"id": 8802, "name": "Outra Cidade"},
+]
+WORKSTATIONS = [
+    {"id": 8811, "name": "Posto Espelho", "city_id": 8801},
+    {"id": 8812, "name": "Posto Antigo", "city_id": 8802},
+]
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, data=None):
+        self.status_code = status_code
+        self.data = data
+
+    def json(self):
+        return {"data": self.data}
+
+
+def serve_catalogs(monkeypatch, cities: list, workstations: list):
+    catalogs = {"/city": cities, "/workstation": workstations}
+    monkeypatch.setattr(
+        mirror_utils, "GERENCIADOR_DE_LOCALIDADES_URL", "http://local"
+    )
+    monkeypatch.setattr(
+        r,
+        "get",
+        lambda url, timeout: FakeResponse(
+            200, catalogs[url.removeprefix("http://local")]
+        ),
+    )
+
+
+def add_request(session, city_id: int, workstation_id: int) -> int:
+    request = Request(
+        attendant_name="Fulano",
+        applicant_name="Espelho",
+        applicant_phone="1111111111",
+        city_id=city_id,
+        workstation_id=workstation_id,
+    )
+    session.add(request)
+    session.flush()
+    session.execute(
+        has.insert().values(
+            problem_id=1,
+            request_id=request.id,
+            category_id=1,
+            request_status="pending",
+            priority="normal",
+        )
+    )
+    session.commit()
+    return request.id
+
+
+def test_sync_localities_is_incremental(monkeypatch, session):
+    serve_catalogs(monkeypatch, CITIES, WORKSTATIONS)
+    results = sync_localities(session)
+    assert [result["created"] for result in results] == [2, 2]
+
+    serve_catalogs(
+        monkeypatch,
+        [CITIES[0], {"id": 8802, "name": "Cidade Renomeada"}],
+        WORKSTATIONS[:1],
+    )
+    city, workstation = sync_localities(session)
+    assert (city["created"], city["updated"], city["removed"]) == (0, 1, 0)
+    assert workstation["removed"] == 1
+    assert session.execute(
+        select(city_mirror.c.name).where(city_mirror.c.id == 8802)
+    ).scalar() == "Cidade Renomeada"
+    assert session.execute(
+        select(workstation_mirror.c.city_id).where(
+            workstation_mirror.c.id == 8811
+        )
+    ).scalar() == 8801
+
+    status = get_mirror_status(session)
+    assert status["city"]["total"] == 2
+    assert not status["workstation"]["stale"]
+
+
+def test_sync_failure_keeps_mirror(monkeypatch, session):
+    synced_at = get_mirror_status(session)["city"]["synced_at"]
+
+    def timeout(url, timeout):
+        raise r.Timeout("tempo esgotado")
+
+    monkeypatch.setattr(
+        mirror_utils, "GERENCIADOR_DE_LOCALIDADES_URL", "http://local"
+    )
+    monkeypatch.setattr(r, "get", timeout)
+    results = sync_localities(session)
+    assert all(result["error"] for result in results)
+
+    status = get_mirror_status(session)
+    assert status["city"]["synced_at"] == synced_at
+    assert status["city"]["error"] == "tempo esgotado"
+    assert session.execute(
+        select(city_mirror.c.id).where(city_mirror.c.id == 8801)
+    ).scalar()
+
+
+def test_get_request_reads_localities_from_mirror(
+    monkeypatch, client: TestClient, session
+):
+    request_id = add_request(session, 8801, 8811)
+    monkeypatch.setattr(mirror_utils, "LOCALITIES_MIRROR", True)
+    monkeypatch.setattr(r, "get", None)
+
+    response = client.get(f"/chamado?id={request_id}", headers=ADMIN_HEADER)
+    data = response.json()["data"][0]
+    assert data["city"] == CITIES[0]
+    assert data["workstation"] == WORKSTATIONS[0]
+    assert "partial" not in data
+
+    missing_id = add_request(session, 8899, 8811)
+    response = client.get(
+        "/chamado?city_id=8899&expand=city", headers=ADMIN_HEADER
+    )
+    data = response.json()["data"][0]
+    assert data["id"] == missing_id
+    assert data["partial"]
+
+
+def test_filter_and_sort_by_mirror_names(client: TestClient, session):
+    other_id = add_request(session, 8802, 8811)
+
+    response = client.get(
+        "/chamado?city_name=Cidade Espelho&expand=problem",
+        headers=ADMIN_HEADER,
+    )
+    data = response.json()["data"]
+    assert data
+    assert {request["city_id"] for request in data} == {8801}
+
+    response = client.get(
+        "/chamado?workstation_city_id=8801&sort=-city_name",
+        headers=ADMIN_HEADER,
+    )
+    ids = [request["id"] for request in response.json()["data"]]
+    assert ids[0] == other_id
+    assert all(
+        request["workstation_id"] == 8811
+        for request in response.json()["data"]
+    )
+
+
+def test_sync_is_claimed_by_one_worker(monkeypatch, session):
+    serve_catalogs(monkeypatch, CITIES, WORKSTATIONS)
+    assert not any(
+        result.get("skipped") for result in sync_localities(session)
+    )
+
+    monkeypatch.setattr(r, "get", None)
+    results = sync_localities(session, min_interval=3600)
+    assert all(result["skipped"] for result in results)
@@ -0,0 +1,21 @@
+from sqlalchemy import func, select
+
+from manage import rebuild_missing_data
+from models import request_document, request_stats
+
+
+def test_rebuild_missing_data(session):
+    session.execute(request_stats.delete())
+    session.execute(request_document.delete())
+    session.commit()
+
+    assert rebuild_missing_data(session) == [
+        "request_stats",
+        "request_document",
+    ]
+    assert session.execute(select(func.sum(request_stats.c.total))).scalar()
+    assert session.execute(
+        select(func.count()).select_from(request_document)
+    ).scalar()
+
+    assert rebuild_missing_data(session) == []
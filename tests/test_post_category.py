@@ -49,3 +49,51 @@ def test_post_category_as_public(client: TestClient):
     )
     assert response.status_code == 401
     assert response.json()["message"] == "Acesso negado"
+
+
+def test_post_categories_as_admin(client: TestClient):
+    response = client.post(
+        "/categoria/lote",
+        json={"items": [category, {"name": "lote", "description": "lote"}]},
+        headers=ADMIN_HEADER
+    )
+    assert response.status_code == 201
+    created = response.json()["data"]["created"]
+    assert len(created) == 2
+
+    response = client.post(
+        "/categoria/lote",
+        json={
+            "items": [
+                {"id": created[1], "name": "lote 2", "description": "lote"}
+            ]
+        },
+        headers=ADMIN_HEADER
+    )
+    assert response.status_code == 201
+    assert response.json()["data"] == {"created": [], "updated": [created[1]]}
+
+    response = client.get(
+        f"/categoria?category_id={created[1]}", headers=ADMIN_HEADER
+    )
+    assert response.json()["data"]["name"] == "lote 2"
+
+
+def test_post_categories_with_invalid_id_as_admin(client: TestClient):
+    response = client.post(
+        "/categoria/lote",
+        json={"items": [{"id": 99, "name": "test", "description": "test"}]},
+        headers=ADMIN_HEADER
+    )
+    assert response.status_code == 400
+    assert response.json()["message"] == "Categoria não encontrada"
+    assert response.json()["data"] == [99]
+
+
+def test_post_categories_as_basic(client: TestClient):
+    response = client.post(
+        "/categoria/lote",
+        json={"items": [category]},
+        headers=BASIC_HEADER
+    )
+    assert response.status_code == 401
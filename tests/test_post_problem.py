@@ -64,3 +64,50 @@ def test_post_problem_as_public(client: TestClient):
     )
     assert response.status_code == 401
     assert response.json()["message"] == "Acesso negado"
+
+
+def test_post_problems_as_admin(client: TestClient):
+    items = [
+        {"name": "lote", "description": "lote", "category_id": 1},
+        {"name": "lote", "description": "lote", "category_id": 2},
+    ]
+    response = client.post(
+        "/problema/lote", json={"items": items}, headers=ADMIN_HEADER
+    )
+    assert response.status_code == 201
+    created = response.json()["data"]["created"]
+    assert len(created) == 2
+
+    items = [{**items[0], "id": created[0], "name": "lote 2"}]
+    response = client.post(
+        "/problema/lote", json={"items": items}, headers=ADMIN_HEADER
+    )
+    assert response.status_code == 201
+    assert response.json()["data"]["updated"] == [created[0]]
+
+    response = client.get(
+        f"/problema?problem_id={created[0]}", headers=ADMIN_HEADER
+    )
+    assert response.json()["data"]["name"] == "lote 2"
+
+
+def test_post_problems_invalid_category_as_admin(client: TestClient):
+    items = [
+        {"name": "lote", "description": "lote", "category_id": 1},
+        {"name": "lote", "description": "lote", "category_id": 90},
+    ]
+    response = client.post(
+        "/problema/lote", json={"items": items}, headers=ADMIN_HEADER
+    )
+    assert response.status_code == 400
+    assert response.json()["message"] == "Categoria de problema invalida."
+    assert response.json()["data"] == [90]
+
+
+def test_post_problems_as_basic(client: TestClient):
+    response = client.post(
+        "/problema/lote",
+        json={"items": [{"name": "a", "description": "a", "category_id": 1}]},
+        headers=BASIC_HEADER
+    )
+    assert response.status_code == 401
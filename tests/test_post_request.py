@@ -56,3 +56,71 @@ def test_post_request_invalid(client):
         },
     )
     assert response.status_code == 422
+
+
+idempotent_request = {
+    "attendant_name": "Fulano",
+    "applicant_name": "Idempotente",
+    "applicant_phone": "1111111111",
+    "city_id": 1,
+    "workstation_id": 1,
+    "problems": [{"category_id": 1, "problem_id": 1}],
+}
+
+
+def test_post_request_with_idempotency_key(client):
+    headers = {"Idempotency-Key": "chave-1"}
+    first = client.post("/chamado", json=idempotent_request, headers=headers)
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    second = client.post("/chamado", json=idempotent_request, headers=headers)
+    assert second.status_code == 201
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+
+    response = client.get("/chamado?attendant_name=Fulano&city_id=1")
+    names = [request["applicant_name"] for request in response.json()["data"]]
+    assert names.count("Idempotente") == 1
+
+
+def test_post_request_reusing_idempotency_key(client):
+    response = client.post(
+        "/chamado",
+        json={**idempotent_request, "applicant_name": "Outro"},
+        headers={"Idempotency-Key": "chave-1"},
+    )
+    assert response.status_code == 422
+
+
+def test_post_request_concurrent_duplicate(client, session, monkeypatch):
+    from routers import request
+    from utils.idempotency_utils import get_request_hash, store_response
+
+    payload = {**idempotent_request, "applicant_name": "Concorrente"}
+    request_hash = get_request_hash(request.RequestModel(**payload).dict())
+    store_response(
+        session, "chave-2", request_hash, 201, {"data": {"id": 999}}
+    )
+    session.commit()
+
+    lookups = []
+
+    def get_stored_response(db, key, request_hash):
+        lookups.append(key)
+        if len(lookups) == 1:
+            return None
+        return real_get_stored_response(db, key, request_hash)
+
+    real_get_stored_response = request.get_stored_response
+    monkeypatch.setattr(request, "get_stored_response", get_stored_response)
+
+    response = client.post(
+        "/chamado", json=payload, headers={"Idempotency-Key": "chave-2"}
+    )
+    assert response.status_code == 201
+    assert response.json() == {"data": {"id": 999}}
+
+    response = client.get("/chamado?attendant_name=Fulano&city_id=1")
+    names = [request["applicant_name"] for request in response.json()["data"]]
+    assert "Concorrente" not in names
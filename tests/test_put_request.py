@@ -1,3 +1,5 @@
+from utils.auth_utils import ADMIN_HEADER
+
 # def test_put_request(client):
 #     response = client.put(
 #         "/chamado/4",
@@ -68,3 +70,49 @@
 #     assert response.status_code == 200
 #     assert response.json()["message"] == "Dados atualizados com sucesso"
 #     assert response.json()["data"][0]["applicant_name"] == "Ciclano"
+
+
+def test_put_request_keeps_created_at_and_rollups(client):
+    response = client.post(
+        "/chamado",
+        json={
+            "attendant_name": "Fulano",
+            "applicant_name": "Rollup",
+            "applicant_phone": "1111111111",
+            "city_id": 4401,
+            "workstation_id": 1,
+            "problems": [{"category_id": 1, "problem_id": 1}],
+        },
+        headers=ADMIN_HEADER,
+    )
+    request_id = response.json()["data"]["id"]
+    request = client.get(f"/chamado?id={request_id}", headers=ADMIN_HEADER)
+    request = request.json()["data"][0]
+    trends_url = "/chamado/tendencias?city_id=4401&group_by=city_id"
+    trends = client.get(trends_url).json()["data"]
+    assert trends
+
+    response = client.put(
+        f"/chamado/{request_id}",
+        json={
+            "attendant_name": "Fulano",
+            "applicant_name": "Rollup Editado",
+            "applicant_phone": "1111111111",
+            "city_id": 4401,
+            "workstation_id": 1,
+            "problems": [
+                {
+                    "id": request["problems"][0]["id"],
+                    "category_id": 1,
+                    "problem_id": 1,
+                    "alert_dates": [],
+                }
+            ],
+        },
+        headers=ADMIN_HEADER,
+    )
+    assert response.status_code == 200
+    data = response.json()["data"][0]
+    assert data["applicant_name"] == "Rollup Editado"
+    assert data["created_at"] == request["created_at"]
+    assert client.get(trends_url).json()["data"] == trends
@@ -0,0 +1,96 @@
+from fastapi.testclient import TestClient
+
+from utils.auth_utils import ADMIN_HEADER, BASIC_HEADER, MANAGER_HEADER
+
+
+def test_put_request_status_as_manager(client: TestClient):
+    response = client.put(
+        "/chamado/lote/status",
+        json={
+            "request_status": "in_progress",
+            "items": [
+                {"request_id": 8, "problem_id": 10},
+                {"id": 13},
+                {"request_id": 99, "problem_id": 99},
+            ],
+        },
+        headers=MANAGER_HEADER,
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["updated"] == 2
+    assert [item["outcome"] for item in data["items"]] == [
+        "updated",
+        "updated",
+        "not_found",
+    ]
+
+    response = client.get("/chamado?id=9", headers=ADMIN_HEADER)
+    problems = response.json()["data"][0]["problems"]
+    assert problems[0]["request_status"] == "in_progress"
+
+
+def test_put_request_status_unchanged(client: TestClient):
+    response = client.put(
+        "/chamado/lote/status",
+        json={"request_status": "in_progress", "items": [{"id": 13}]},
+        headers=ADMIN_HEADER,
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["updated"] == 0
+    assert response.json()["data"]["items"][0]["outcome"] == "unchanged"
+
+
+def test_put_request_status_updates_statistics(client: TestClient):
+    response = client.put(
+        "/chamado/lote/status",
+        json={
+            "request_status": "pending",
+            "items": [{"id": 12}, {"id": 13}],
+        },
+        headers=ADMIN_HEADER,
+    )
+    assert response.json()["data"]["updated"] == 2
+
+    response = client.get(
+        "/chamado/estatisticas?group_by=request_status&request_status=in_progress",  # noqa 501
+        headers=ADMIN_HEADER,
+    )
+    assert response.json()["data"] == []
+
+
+def test_put_request_status_with_invalid_item(client: TestClient):
+    response = client.put(
+        "/chamado/lote/status",
+        json={"request_status": "solved", "items": [{"request_id": 1}]},
+        headers=ADMIN_HEADER,
+    )
+    assert response.status_code == 422
+
+
+def test_put_request_status_with_invalid_status(client: TestClient):
+    response = client.put(
+        "/chamado/lote/status",
+        json={"request_status": "closed", "items": [{"id": 1}]},
+        headers=ADMIN_HEADER,
+    )
+    assert response.status_code == 422
+
+
+def test_put_request_status_without_items(client: TestClient):
+    response = client.put(
+        "/chamado/lote/status",
+        json={"request_status": "solved", "items": []},
+        headers=ADMIN_HEADER,
+    )
+    assert response.status_code == 422
+
+
+def test_put_request_status_as_basic(client: TestClient):
+    response = client.put(
+        "/chamado/lote/status",
+        json={"request_status": "solved", "items": [{"id": 1}]},
+        headers=BASIC_HEADER,
+    )
+    assert response.status_code == 401
+    assert response.json()["message"] == "Acesso negado"
@@ -0,0 +1,105 @@
+from datetime import datetime
+from time import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from starlette.responses import Response
+
+import database
+from database import (PRIMARY_COOKIE, ReplicaRouter, get_read_db, is_replica,
+                      reads_from_primary, set_read_your_writes)
+from utils import document_utils
+from utils.auth_utils import ADMIN_HEADER
+from utils.cache_utils import ticket_cache
+from utils.event_utils import EventCalendar
+
+
+def make_request(method: str = "GET", cookie: str | None = None) -> Request:
+    headers = []
+    if cookie is not None:
+        headers.append((b"cookie", f"{PRIMARY_COOKIE}={cookie}".encode()))
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+def test_replica_router_round_robin(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path}/primary.db")
+    replicas = [
+        create_engine(f"sqlite:///{tmp_path}/replica_{i}.db") for i in (1, 2)
+    ]
+    router = ReplicaRouter(primary, replicas)
+    assert [router.get_engine() for _ in range(4)] == replicas * 2
+
+
+def test_replica_router_skips_unhealthy_replica(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path}/primary.db")
+    healthy = create_engine(f"sqlite:///{tmp_path}/replica.db")
+    broken = create_engine(f"sqlite:///{tmp_path}/missing/replica.db")
+    router = ReplicaRouter(primary, [broken, healthy])
+    assert router.get_engine() is healthy
+    assert router.get_engine() is healthy
+    assert router.healthy[broken] is False
+
+    router = ReplicaRouter(primary, [broken])
+    assert router.get_engine() is primary
+
+
+def test_read_your_writes_cookie(monkeypatch, tmp_path):
+    replica = create_engine(f"sqlite:///{tmp_path}/replica.db")
+    monkeypatch.setattr(
+        database,
+        "replica_router",
+        ReplicaRouter(database.engine, [replica]),
+    )
+
+    response = Response()
+    set_read_your_writes(make_request("POST"), response)
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(PRIMARY_COOKIE)
+
+    response = Response()
+    set_read_your_writes(make_request("GET"), response)
+    assert "set-cookie" not in response.headers
+
+    request = make_request(cookie=str(time() + 5))
+    assert reads_from_primary(request)
+    db = next(get_read_db(request))
+    assert db.get_bind() is database.engine
+    assert not is_replica(db)
+
+    request = make_request(cookie=str(time() - 5))
+    assert not reads_from_primary(request)
+    db = next(get_read_db(request))
+    assert db.get_bind() is replica
+    assert is_replica(db)
+
+
+def test_replica_read_does_not_fill_ticket_cache(
+    monkeypatch, client: TestClient, session
+):
+    monkeypatch.setattr(
+        document_utils,
+        "add_locality_data",
+        lambda db, documents, expand: documents,
+    )
+    ticket_cache.invalidate(2)
+    session.info["replica"] = True
+    try:
+        response = client.get("/chamado?id=2", headers=ADMIN_HEADER)
+    finally:
+        del session.info["replica"]
+    assert response.json()["data"]
+    assert ticket_cache.get(2) is None
+
+    client.get("/chamado?id=2", headers=ADMIN_HEADER)
+    assert ticket_cache.get(2) is not None
+    ticket_cache.invalidate(2)
+
+
+def test_event_calendar_builds_from_primary(tmp_path):
+    replica = create_engine(f"sqlite:///{tmp_path}/replica.db")
+    calendar = EventCalendar()
+    with Session(replica, info={"replica": True}) as db:
+        calendar.get_window(db, datetime.min, datetime.max)
+    assert calendar.stats()["built"]
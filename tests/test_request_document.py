@@ -0,0 +1,74 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from models import request_document
+from utils.auth_utils import ADMIN_HEADER
+from utils.document_utils import rebuild_request_documents
+
+ticket = {
+    "attendant_name": "Fulano",
+    "applicant_name": "Documento",
+    "applicant_phone": "1111111111",
+    "city_id": 1,
+    "workstation_id": 1,
+    "problems": [{"category_id": 1, "problem_id": 1}],
+}
+
+
+def get_document(session, request_id: int):
+    return session.execute(
+        select(request_document.c.document).where(
+            request_document.c.request_id == request_id
+        )
+    ).scalar()
+
+
+def test_post_request_stores_document(client: TestClient, session):
+    response = client.post("/chamado", json=ticket)
+    request_id = response.json()["data"]["id"]
+
+    document = get_document(session, request_id)
+    assert document["applicant_name"] == "Documento"
+    assert document["problems"][0]["problem"]["id"] == 1
+    assert document["problems"][0]["category"]["id"] == 1
+
+    response = client.get(f"/chamado?id={request_id}", headers=ADMIN_HEADER)
+    data = response.json()["data"][0]
+    assert data["problems"] == document["problems"]
+
+
+def test_status_change_refreshes_document(client: TestClient, session):
+    response = client.post("/chamado", json=ticket)
+    request_id = response.json()["data"]["id"]
+
+    client.put(
+        "/chamado/lote/status",
+        json={
+            "request_status": "in_progress",
+            "items": [{"request_id": request_id, "problem_id": 1}],
+        },
+        headers=ADMIN_HEADER,
+    )
+    session.expire_all()
+    document = get_document(session, request_id)
+    assert document["problems"][0]["request_status"] == "in_progress"
+
+
+def test_missing_document_is_assembled(client: TestClient, session):
+    response = client.post("/chamado", json=ticket)
+    request_id = response.json()["data"]["id"]
+    session.execute(
+        request_document.delete().where(
+            request_document.c.request_id == request_id
+        )
+    )
+    session.commit()
+
+    response = client.get(
+        f"/chamado?id={request_id}&fields=applicant_name",
+        headers=ADMIN_HEADER,
+    )
+    assert response.json()["data"][0]["applicant_name"] == "Documento"
+
+    rebuild_request_documents(session)
+    assert get_document(session, request_id)["applicant_name"] == "Documento"
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+
+from models import EnumStatus, Problem, has
+from utils.row_utils import (encode_value, get_record_class, select_dict,
+                             select_dicts, select_records)
+
+
+def test_encode_value_matches_jsonable_encoder():
+    for value in (
+        1,
+        "texto",
+        None,
+        True,
+        EnumStatus.pending,
+        date(2022, 5, 1),
+        datetime(2022, 5, 1, 10, 30),
+    ):
+        assert encode_value(value) == jsonable_encoder(value)
+
+
+def test_record_class_uses_slots():
+    record_class = get_record_class(("id", "name"))
+    assert record_class is get_record_class(("id", "name"))
+
+    record = record_class((1, "Rede"))
+    assert not hasattr(record, "__dict__")
+    assert record.id == 1
+    assert record.as_dict() == {"id": 1, "name": "Rede"}
+
+
+def test_select_dicts_matches_orm_entities(session):
+    expected = [
+        jsonable_encoder(problem)
+        for problem in session.query(Problem).order_by(Problem.id)
+    ]
+    session.expunge_all()
+
+    problems = select_dicts(
+        session, select(Problem.__table__).order_by(Problem.id)
+    )
+    assert problems == expected
+    assert not session.identity_map
+    assert select_dict(
+        session, select(Problem.__table__).where(Problem.id == 1)
+    ) == expected[0]
+
+
+def test_select_records_keep_raw_values(session):
+    records = select_records(
+        session, select(has).where(has.c.request_status.is_not(None))
+    )
+    assert records
+    assert isinstance(records[0].request_status, EnumStatus)
+    assert records[0].as_dict()["request_status"] == (
+        records[0].request_status.value
+    )
@@ -0,0 +1,89 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from models import has
+from utils.search_utils import update_search_index
+
+request = {
+    "attendant_name": "Beltrano",
+    "applicant_name": "Anastácia",
+    "applicant_phone": "1111111111",
+    "city_id": 1,
+    "workstation_id": 1,
+    "problems": [
+        {
+            "category_id": 1,
+            "problem_id": 1,
+            "description": "Impressora sem toner na recepção.",
+        },
+        {
+            "category_id": 1,
+            "problem_id": 2,
+            "description": "Computador não liga.",
+        },
+    ],
+}
+
+
+def test_search_request_by_description(client: TestClient):
+    response = client.post("/chamado", json=request)
+    assert response.status_code == 201
+    response = client.get("/chamado/busca?q=impressora toner")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total"] == 1
+    result = data["results"][0]
+    assert result["applicant_name"] == "Anastácia"
+    assert result["problems"][0]["problem_id"] == 1
+
+
+def test_search_request_by_applicant_without_accent(client: TestClient):
+    response = client.get("/chamado/busca?q=anastacia")
+    assert response.status_code == 200
+    assert response.json()["data"]["total"] >= 2
+
+
+def test_search_request_pagination(client: TestClient):
+    response = client.get("/chamado/busca?q=anastacia&page_size=1&page=2")
+    assert response.status_code == 200
+    assert len(response.json()["data"]["results"]) == 1
+
+
+def test_search_request_not_found(client: TestClient):
+    response = client.get("/chamado/busca?q=inexistente")
+    assert response.status_code == 200
+    assert response.json()["data"]["results"] == []
+
+
+def test_search_request_without_query(client: TestClient):
+    response = client.get("/chamado/busca")
+    assert response.status_code == 422
+
+
+def test_search_index_follows_updates(client: TestClient, session):
+    response = client.post(
+        "/chamado",
+        json={
+            **request,
+            "problems": [
+                {
+                    "category_id": 1,
+                    "problem_id": 1,
+                    "description": "Teclado quebrado.",
+                }
+            ],
+        },
+    )
+    request_id = response.json()["data"]["id"]
+    session.execute(
+        update(has)
+        .where(has.c.request_id == request_id)
+        .values(description="Monitor piscando.")
+    )
+    update_search_index(session, request_id)
+    session.commit()
+
+    response = client.get("/chamado/busca?q=teclado")
+    assert response.json()["data"]["total"] == 0
+    response = client.get("/chamado/busca?q=monitor piscando")
+    assert response.json()["data"]["total"] == 1
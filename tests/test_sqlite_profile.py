@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from utils.sqlite_utils import WriterLock, create_database_engine, writer_locks
+
+
+@pytest.fixture
+def profiled_engine(tmp_path):
+    database = tmp_path / "perfil.db"
+    writer_locks[str(database)] = WriterLock(timeout=0.1)
+    engine = create_database_engine(f"sqlite:///{database}", True)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER)"))
+    yield engine
+    engine.dispose()
+    del writer_locks[str(database)]
+
+
+def test_sqlite_profile_applies_pragmas(profiled_engine):
+    with profiled_engine.connect() as connection:
+        pragma = connection.exec_driver_sql
+        assert pragma("PRAGMA journal_mode").scalar() == "wal"
+        assert pragma("PRAGMA synchronous").scalar() == 1
+        assert pragma("PRAGMA busy_timeout").scalar() == 5000
+        assert pragma("PRAGMA mmap_size").scalar() > 0
+
+
+def test_sqlite_profile_serializes_writers(profiled_engine):
+    writer_lock = writer_locks[profiled_engine.url.database]
+    first = profiled_engine.connect()
+    first.begin()
+    first.execute(text("INSERT INTO item VALUES (1)"))
+    assert writer_lock.stats()["held"]
+
+    errors = []
+
+    def write():
+        try:
+            with profiled_engine.begin() as connection:
+                connection.execute(text("INSERT INTO item VALUES (2)"))
+        except OperationalError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+    assert writer_lock.stats()["timeouts"] == 1
+
+    first.close()
+    assert not writer_lock.stats()["held"]
+    write()
+    with profiled_engine.connect() as connection:
+        count = connection.execute(text("SELECT count(*) FROM item"))
+        assert count.scalar() == 1
+
+
+def test_sqlite_profile_reads_while_writing(profiled_engine):
+    with profiled_engine.connect() as writer, writer.begin():
+        writer.execute(text("INSERT INTO item VALUES (1)"))
+        with profiled_engine.connect() as reader:
+            count = reader.execute(text("SELECT count(*) FROM item"))
+            assert count.scalar() == 0
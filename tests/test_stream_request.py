@@ -0,0 +1,75 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+from starlette.concurrency import run_in_threadpool
+
+from utils.auth_utils import ADMIN_HEADER
+from utils.stream_utils import ChangeHub, change_hub, format_event
+
+request = {
+    "attendant_name": "Fulano",
+    "applicant_name": "Ciclano",
+    "applicant_phone": "1111111111",
+    "city_id": 1,
+    "workstation_id": 1,
+    "problems": [{"category_id": 1, "problem_id": 3}],
+}
+
+
+def test_stream_publishes_created_and_solved(client: TestClient):
+    subscriber = change_hub.subscribe()
+    try:
+        response = client.post("/chamado", json=request)
+        request_id = response.json()["data"]["id"]
+        client.delete(
+            f"/chamado?request_id={request_id}&problem_id=3",
+            headers=ADMIN_HEADER,
+        )
+
+        created = subscriber.queue.get_nowait()
+        solved = subscriber.queue.get_nowait()
+    finally:
+        change_hub.unsubscribe(subscriber)
+
+    assert created == {"type": "created", "request_id": request_id}
+    assert solved == {
+        "type": "solved",
+        "request_id": request_id,
+        "problem_id": 3,
+    }
+
+
+def test_stream_slow_client_gets_resync():
+    hub = ChangeHub(queue_size=2)
+    subscriber = hub.subscribe()
+    for request_id in range(3):
+        hub.publish("created", request_id=request_id)
+
+    assert subscriber.queue.qsize() == 1
+    assert subscriber.queue.get_nowait() == {"type": "resync"}
+
+
+def test_stream_max_clients():
+    hub = ChangeHub(max_clients=1)
+    assert hub.subscribe() is not None
+    assert hub.subscribe() is None
+
+
+def test_stream_format_event():
+    event = {"type": "created", "request_id": 1}
+    assert format_event(event) == (
+        'event: created\ndata: {"type": "created", "request_id": 1}\n\n'
+    )
+
+
+def test_stream_receives_events_published_from_threadpool():
+    hub = ChangeHub()
+
+    async def receive():
+        subscriber = hub.subscribe()
+        event = asyncio.create_task(subscriber.queue.get())
+        await asyncio.sleep(0)
+        await run_in_threadpool(hub.publish, "created", request_id=1)
+        return await asyncio.wait_for(event, timeout=1)
+
+    assert asyncio.run(receive()) == {"type": "created", "request_id": 1}
@@ -0,0 +1,105 @@
+from fastapi.testclient import TestClient
+
+from utils import document_utils
+from utils.auth_utils import ADMIN_HEADER, MANAGER_HEADER
+from utils.cache_utils import TicketCache, ticket_cache
+
+document = {
+    "id": 5,
+    "applicant_name": "Jose",
+    "problems": [{"id": 9, "problem_id": 9, "category_id": 4}],
+}
+
+
+def test_get_request_by_id_from_cache(client: TestClient):
+    ticket_cache.put(5, document)
+    hits = ticket_cache.stats()["hits"]
+
+    response = client.get("/chamado?id=5")
+    assert response.status_code == 200
+    assert response.json()["data"] == [document]
+    assert ticket_cache.stats()["hits"] == hits + 1
+
+
+def test_put_problem_invalidates_cache(client: TestClient):
+    ticket_cache.put(5, document)
+    response = client.put(
+        "/problema/9",
+        json={"name": "Problema 9", "description": "descrição 9",
+              "category_id": 4},
+        headers=MANAGER_HEADER,
+    )
+    assert response.status_code == 200
+    assert ticket_cache.get(5) is None
+
+
+def test_get_cache_stats(client: TestClient):
+    response = client.get("/chamado/cache")
+    assert response.status_code == 200
+    assert set(response.json()["data"]) == {
+        "entries", "max_entries", "bytes", "hits", "misses", "hit_rate"
+    }
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TicketCache(max_entries=2)
+    cache.put(1, {"id": 1})
+    cache.put(2, {"id": 2})
+    cache.get(1)
+    cache.put(3, {"id": 3})
+    assert cache.get(2) is None
+    assert cache.get(1) == {"id": 1}
+    assert cache.stats()["entries"] == 2
+
+
+def test_cache_invalidates_by_category():
+    cache = TicketCache()
+    cache.put(1, document)
+    cache.put(2, {"id": 2, "problems": [{"problem_id": 1, "category_id": 1}]})
+    cache.invalidate_category(4)
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    assert cache.stats()["bytes"] > 0
+    cache.clear()
+    assert cache.stats()["bytes"] == 0
+
+
+def test_cache_expires_entries():
+    cache = TicketCache(ttl=-1)
+    cache.put(1, document)
+    assert cache.get(1) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_skips_put_after_concurrent_invalidation():
+    cache = TicketCache()
+    generation = cache.generation
+    cache.invalidate(1)
+    cache.put(1, document, generation)
+    assert cache.get(1) is None
+
+    cache.put(1, document, cache.generation)
+    assert cache.get(1) == document
+
+
+def test_get_request_does_not_cache_data_read_before_a_write(
+    monkeypatch, client: TestClient
+):
+    def write_during_read(db, documents, expand):
+        ticket_cache.invalidate(2)
+        return documents
+
+    monkeypatch.setattr(document_utils, "add_locality_data", write_during_read)
+    ticket_cache.invalidate(2)
+    response = client.get("/chamado?id=2", headers=ADMIN_HEADER)
+    assert response.json()["data"]
+    assert ticket_cache.get(2) is None
+
+    monkeypatch.setattr(
+        document_utils,
+        "add_locality_data",
+        lambda db, documents, expand: documents,
+    )
+    client.get("/chamado?id=2", headers=ADMIN_HEADER)
+    assert ticket_cache.get(2) is not None
+    ticket_cache.invalidate(2)